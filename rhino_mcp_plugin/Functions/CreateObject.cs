@@ -146,6 +146,11 @@ public partial class RhinoMCPFunctions
                 rhinoObject.Attributes.ColorSource = ObjectColorSource.ColorFromObject;
                 rhinoObject.Attributes.ObjectColor = Color.FromArgb(color[0], color[1], color[2]);
             }
+            if (parameters["attributes"] is JObject userAttributes)
+            {
+                foreach (var attribute in userAttributes.Properties())
+                    rhinoObject.Attributes.SetUserString(attribute.Name, attribute.Value.ToString());
+            }
             doc.Objects.ModifyAttributes(rhinoObject, rhinoObject.Attributes, true);
 
             var geometry = rhinoObject.Geometry;
@@ -1,5 +1,7 @@
 using System;
+using System.Collections.Generic;
 using System.Drawing;
+using System.Linq;
 using Newtonsoft.Json.Linq;
 using Rhino;
 using Rhino.DocObjects;
@@ -14,30 +16,46 @@ public partial class RhinoMCPFunctions
         {
             var doc = RhinoDoc.ActiveDoc;
             var results = new JObject();
+
+            // The server sends {"objects": [...]}, older clients send the objects keyed by name
+            var entries = parameters["objects"] is JArray objectList
+                ? objectList.Select((token, index) => new KeyValuePair<string, JToken>(index.ToString(), token))
+                : parameters.Properties().Select(property => new KeyValuePair<string, JToken>(property.Name, property.Value));
             
+            // CreateObject redraws after every object, redraw once at the end instead
+            bool redrawEnabled = doc.Views.RedrawEnabled;
+            doc.Views.RedrawEnabled = false;
+
             // Process each object in the parameters
-            foreach (var property in parameters.Properties())
+            try
             {
-                try
-                {
-                    // Get the object parameters
-                    JObject objectParams = (JObject)property.Value;
-                    
-                    // Create the object using the existing CreateObject method
-                    JObject result = CreateObject(objectParams);
-                    
-                    // Add the result to our results collection
-                    results[property.Name] = result;
-                }
-                catch (Exception ex)
+                foreach (var entry in entries)
                 {
-                    // If there's an error creating this object, add the error to the results
-                    results[property.Name] = new JObject
+                    try
                     {
-                        ["error"] = ex.Message
-                    };
+                        // Get the object parameters
+                        JObject objectParams = (JObject)entry.Value;
+                        
+                        // Create the object using the existing CreateObject method
+                        JObject result = CreateObject(objectParams);
+                        
+                        // Add the result to our results collection
+                        results[entry.Key] = result;
+                    }
+                    catch (Exception ex)
+                    {
+                        // If there's an error creating this object, add the error to the results
+                        results[entry.Key] = new JObject
+                        {
+                            ["error"] = ex.Message
+                        };
+                    }
                 }
             }
+            finally
+            {
+                doc.Views.RedrawEnabled = redrawEnabled;
+            }
             
             // Update views
             doc.Views.Redraw();
@@ -21,6 +21,20 @@ public partial class RhinoMCPFunctions
                 ["deleted"] = true,
             };
         }
+
+        if (parameters["ids"] is JArray ids)
+        {
+            int deletedCount = 0;
+            foreach (var id in ids)
+            {
+                if (doc.Objects.Delete(castToGuid(id), true)) deletedCount++;
+            }
+            doc.Views.Redraw();
+            return new JObject()
+            {
+                ["deleted"] = deletedCount,
+            };
+        }
         
         
         var obj = getObjectByIdOrName(parameters);
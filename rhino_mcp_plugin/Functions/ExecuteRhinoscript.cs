@@ -7,6 +7,7 @@ using Rhino.Geometry;
 using rhinomcp.Serializers;
 using Rhino.Runtime;
 using System.Text;
+using System.Diagnostics;
 
 namespace RhinoMCPPlugin.Functions;
 
@@ -16,48 +17,137 @@ public partial class RhinoMCPFunctions
     {
         var doc = RhinoDoc.ActiveDoc;
         string code = parameters["code"]?.ToString();
+        // Templates are sent with their code once, later only by the hash of the code and their parameters
+        string scriptHash = parameters["script_hash"]?.ToString();
+        // Scripts in a session share their variables, functions and imports with the ones before
+        string sessionId = parameters["session_id"]?.ToString();
+        bool sessionCreated = false;
         if (string.IsNullOrEmpty(code))
         {
-            throw new Exception("Code is required");
+            if (string.IsNullOrEmpty(scriptHash))
+                throw new Exception("Code is required");
+            if (getScriptTemplate(scriptHash) == null)
+            {
+                return new JObject
+                {
+                    ["success"] = false,
+                    ["template_missing"] = true,
+                    ["message"] = $"Script template {scriptHash} is not registered"
+                };
+            }
         }
 
+        // The request can be cancelled while it waits for the UI thread
+        string requestId = CurrentRequestId;
+        throwIfCancelled(requestId);
+
+        // Send print output while the script runs instead of returning it all at the end
+        bool streamOutput = castToBool(parameters.SelectToken("stream_output")) && requestId != null;
+        var pendingOutput = new StringBuilder();
+        var lastOutputSent = Stopwatch.StartNew();
+        Action flushOutput = () =>
+        {
+            if (pendingOutput.Length == 0) return;
+            sendOutput(requestId, pendingOutput.ToString());
+            pendingOutput.Clear();
+            lastOutputSent.Restart();
+        };
+
+        // Scripts calling redrawing functions in a loop run with redraws off and redraw once at the end
+        bool suppressRedraw = castToBool(parameters.SelectToken("suppress_redraw")) && doc != null;
+        bool redrawEnabled = doc == null || doc.Views.RedrawEnabled;
+        if (suppressRedraw) doc.Views.RedrawEnabled = false;
+
         // register undo
         var undoRecordSerialNumber = doc.BeginUndoRecord("ExecuteRhinoScript");
 
         JObject result = new JObject();
+        PythonScript pythonScript = null;
+        Action<string> onOutput = null;
 
         try
         {
             var output = new StringBuilder();
-            // Create a new Python script instance
-            PythonScript pythonScript = PythonScript.Create();
+            // Create a new Python script instance, or continue in the one of the session
+            pythonScript = string.IsNullOrEmpty(sessionId)
+                ? PythonScript.Create()
+                : getScriptSession(sessionId, out sessionCreated);
 
-            pythonScript.Output += (message) =>
+            onOutput = (message) =>
             {
-                output.Append(message);
+                if (streamOutput)
+                {
+                    // Batch small prints so a loop of prints does not become a message per line
+                    pendingOutput.Append(message);
+                    if (pendingOutput.Length >= 4096 || lastOutputSent.ElapsedMilliseconds >= 200) flushOutput();
+                }
+                else
+                {
+                    output.Append(message);
+                }
+                throwIfCancelled(requestId);
             };
+            pythonScript.Output += onOutput;
+
+            // Lets long running scripts report progress, which is also where they can be cancelled
+            pythonScript.SetVariable("report_progress", new Action<double, string>((progress, message) =>
+            {
+                throwIfCancelled(requestId);
+                sendProgress(requestId, progress, message);
+            }));
 
             // Setup the script context with the current document
             if (doc != null)
                 pythonScript.SetupScriptContext(doc);
 
             // Execute the Python code
-            pythonScript.ExecuteScript(code);
+            if (string.IsNullOrEmpty(scriptHash))
+            {
+                pythonScript.ExecuteScript(code);
+            }
+            else
+            {
+                PythonCompiledCode compiled = string.IsNullOrEmpty(code)
+                    ? getScriptTemplate(scriptHash)
+                    : addScriptTemplate(scriptHash, pythonScript, code);
+                setTemplateParams(pythonScript, parameters["template_params"] as JObject);
+                compiled.Execute(pythonScript);
+            }
 
 
             result["success"] = true;
-            result["result"] = $"Script successfully executed! Print output: {output}";
+            result["result"] = streamOutput
+                ? "Script successfully executed! Print output was streamed."
+                : $"Script successfully executed! Print output: {output}";
         }
         catch (Exception ex)
         {
 
             result["success"] = false;
             result["message"] = $"Error executing rhinoscript: {ex}";
+            // The script raises wherever it was when the cancel arrived, IronPython may wrap the exception
+            if (IsCancelled(requestId)) result["cancelled"] = true;
         }
         finally
         {
+            if (streamOutput) flushOutput();
+
+            // A session script outlives this execution
+            if (pythonScript != null && onOutput != null) pythonScript.Output -= onOutput;
+
             // undo
             doc.EndUndoRecord(undoRecordSerialNumber);
+
+            if (suppressRedraw)
+            {
+                doc.Views.RedrawEnabled = redrawEnabled;
+                doc.Views.Redraw();
+            }
+        }
+
+        if (!string.IsNullOrEmpty(sessionId))
+        {
+            result["session"] = new JObject { ["id"] = sessionId, ["created"] = sessionCreated };
         }
 
         // if the script failed, undo the changes
@@ -0,0 +1,34 @@
+using Newtonsoft.Json.Linq;
+using Rhino;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject GetLayers(JObject parameters)
+    {
+        var doc = RhinoDoc.ActiveDoc;
+        int currentIndex = doc.Layers.CurrentLayerIndex;
+
+        // All layers, unlike get_document_info which only lists the first ones
+        var layers = new JArray();
+        foreach (var layer in doc.Layers)
+        {
+            if (layer.IsDeleted) continue;
+
+            JObject layerData = Serializer.SerializeLayer(layer);
+            layerData["full_path"] = layer.FullPath;
+            layerData["visible"] = layer.IsVisible;
+            layerData["locked"] = layer.IsLocked;
+            layerData["current"] = layer.Index == currentIndex;
+            layers.Add(layerData);
+        }
+
+        return new JObject
+        {
+            ["layer_count"] = layers.Count,
+            ["layers"] = layers
+        };
+    }
+}
@@ -0,0 +1,35 @@
+using System;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject GetSceneObjects(JObject parameters)
+    {
+        string scene = castToString(parameters.SelectToken("scene")) ?? "default";
+        var doc = RhinoDoc.ActiveDoc;
+
+        // Only the id, name and user strings are needed to diff a scene, so skip the full serialization
+        var objects = new JArray();
+        foreach (var obj in doc.Objects)
+        {
+            if (obj.Attributes.GetUserString("rhinomcp_scene") != scene) continue;
+
+            objects.Add(new JObject
+            {
+                ["id"] = obj.Id.ToString(),
+                ["name"] = obj.Name,
+                ["attributes"] = Serializer.RhinoObjectAttributes(obj)
+            });
+        }
+
+        return new JObject
+        {
+            ["scene"] = scene,
+            ["objects"] = objects
+        };
+    }
+}
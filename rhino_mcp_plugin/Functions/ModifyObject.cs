@@ -38,6 +38,14 @@ public partial class RhinoMCPFunctions
             attributesModified = true;
         }
 
+        // Set custom user attributes if provided
+        if (parameters["attributes"] is JObject userAttributes)
+        {
+            foreach (var attribute in userAttributes.Properties())
+                obj.Attributes.SetUserString(attribute.Name, attribute.Value.ToString());
+            attributesModified = true;
+        }
+
         // Change translation if provided
         if (parameters["translation"] != null)
         {
@@ -33,15 +33,26 @@ public partial class RhinoMCPFunctions
             }
         }
 
+        // ModifyObject redraws after every object, redraw once at the end instead
+        bool redrawEnabled = doc.Views.RedrawEnabled;
+        doc.Views.RedrawEnabled = false;
+
         var i = 0;
-        foreach (JObject parameter in objectParameters)
+        try
         {
-            if (parameter.ContainsKey("id"))
+            foreach (JObject parameter in objectParameters)
             {
-                ModifyObject(parameter);
-                i++;
+                if (parameter.ContainsKey("id"))
+                {
+                    ModifyObject(parameter);
+                    i++;
+                }
             }
         }
+        finally
+        {
+            doc.Views.RedrawEnabled = redrawEnabled;
+        }
         doc.Views.Redraw();
         return new JObject() { ["modified"] = i };
     }
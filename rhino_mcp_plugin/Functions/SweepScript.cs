@@ -0,0 +1,136 @@
+using System;
+using System.Diagnostics;
+using Newtonsoft.Json.Linq;
+using Rhino;
+using Rhino.DocObjects;
+using Rhino.DocObjects.Tables;
+using Rhino.Runtime;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    public JObject SweepScript(JObject parameters)
+    {
+        var doc = RhinoDoc.ActiveDoc;
+        string code = parameters["code"]?.ToString();
+        if (string.IsNullOrEmpty(code))
+        {
+            throw new Exception("Code is required");
+        }
+        JArray paramSets = parameters["param_sets"] as JArray ?? new JArray();
+        string resultVariable = castToString(parameters["result_variable"]) ?? "result";
+        bool keepObjects = castToBool(parameters.SelectToken("keep_objects"));
+
+        string requestId = CurrentRequestId;
+        throwIfCancelled(requestId);
+
+        var results = new JArray();
+        var errors = new JArray();
+        var lastProgressSent = Stopwatch.StartNew();
+
+        // Every set creates and deletes objects, the views are only redrawn once at the end
+        bool redrawEnabled = doc.Views.RedrawEnabled;
+        doc.Views.RedrawEnabled = false;
+        var documentChanges = new DocumentChangeCounter();
+        try
+        {
+            // The code is compiled once and executed in a fresh scope for every set
+            PythonCompiledCode compiled = PythonScript.Create().Compile(code);
+
+            for (int i = 0; i < paramSets.Count; i++)
+            {
+                throwIfCancelled(requestId);
+
+                // Each set runs in its own undo record, undone afterwards so every set starts from the same document
+                var undoRecord = doc.BeginUndoRecord($"Sweep script set {i}");
+                int changesBefore = documentChanges.Count;
+                bool failed = false;
+                bool cancelled = false;
+                try
+                {
+                    PythonScript pythonScript = PythonScript.Create();
+                    pythonScript.SetupScriptContext(doc);
+                    setTemplateParams(pythonScript, paramSets[i] as JObject);
+                    compiled.Execute(pythonScript);
+                    results.Add(serializeScriptValue(pythonScript.GetVariable(resultVariable)));
+                }
+                catch (OperationCanceledException)
+                {
+                    failed = cancelled = true;
+                }
+                catch (Exception ex)
+                {
+                    failed = true;
+                    results.Add(JValue.CreateNull());
+                    errors.Add(new JObject { ["index"] = i, ["message"] = ex.Message });
+                }
+                finally
+                {
+                    doc.EndUndoRecord(undoRecord);
+                }
+                // A set that only measured leaves an empty undo record, which Rhino drops, and Undo would
+                // revert the edit before the sweep instead
+                bool changed = documentChanges.Count != changesBefore;
+                if (changed && (failed || !keepObjects)) doc.Undo();
+                throwIfCancelled(cancelled ? requestId : null);
+
+                // Fast sets would otherwise become a message each
+                if (lastProgressSent.ElapsedMilliseconds >= 200 || i == paramSets.Count - 1)
+                {
+                    sendProgress(requestId, (double)(i + 1) / paramSets.Count, $"{i + 1} of {paramSets.Count} sets");
+                    lastProgressSent.Restart();
+                }
+            }
+        }
+        finally
+        {
+            documentChanges.Dispose();
+            doc.Views.RedrawEnabled = redrawEnabled;
+            doc.Views.Redraw();
+        }
+
+        return new JObject
+        {
+            ["results"] = results,
+            ["errors"] = errors
+        };
+    }
+
+    // Counts the changes of the document that are recorded for undo while it is alive
+    private sealed class DocumentChangeCounter : IDisposable
+    {
+        public int Count { get; private set; }
+
+        public DocumentChangeCounter()
+        {
+            RhinoDoc.AddRhinoObject += onObject;
+            RhinoDoc.DeleteRhinoObject += onObject;
+            RhinoDoc.UndeleteRhinoObject += onObject;
+            RhinoDoc.ReplaceRhinoObject += onReplace;
+            RhinoDoc.ModifyObjectAttributes += onAttributes;
+            RhinoDoc.LayerTableEvent += onLayer;
+            RhinoDoc.GroupTableEvent += onGroup;
+            RhinoDoc.MaterialTableEvent += onMaterial;
+        }
+
+        private void onObject(object sender, RhinoObjectEventArgs e) => Count++;
+        private void onReplace(object sender, RhinoReplaceObjectEventArgs e) => Count++;
+        private void onAttributes(object sender, RhinoModifyObjectAttributesEventArgs e) => Count++;
+        private void onLayer(object sender, LayerTableEventArgs e) => Count++;
+        private void onGroup(object sender, GroupTableEventArgs e) => Count++;
+        private void onMaterial(object sender, MaterialTableEventArgs e) => Count++;
+
+        public void Dispose()
+        {
+            RhinoDoc.AddRhinoObject -= onObject;
+            RhinoDoc.DeleteRhinoObject -= onObject;
+            RhinoDoc.UndeleteRhinoObject -= onObject;
+            RhinoDoc.ReplaceRhinoObject -= onReplace;
+            RhinoDoc.ModifyObjectAttributes -= onAttributes;
+            RhinoDoc.LayerTableEvent -= onLayer;
+            RhinoDoc.GroupTableEvent -= onGroup;
+            RhinoDoc.MaterialTableEvent -= onMaterial;
+        }
+    }
+}
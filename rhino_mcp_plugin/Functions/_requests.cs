@@ -0,0 +1,89 @@
+using System;
+using System.Collections.Generic;
+using Newtonsoft.Json.Linq;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    // Requests received and not yet completed, only these can be cancelled
+    private readonly HashSet<string> openRequests = new HashSet<string>();
+    private readonly HashSet<string> cancelledRequests = new HashSet<string>();
+    private readonly object cancelLock = new object();
+
+    // Request id of the command currently executing on the UI thread
+    public string CurrentRequestId { get; set; }
+
+    // Sends an intermediate message (progress, output) to the client while a command is executing
+    public Action<JObject> SendMessage { get; set; }
+
+    // Called from the client thread when a request is received, before it waits for the UI thread
+    public void OpenRequest(string requestId)
+    {
+        lock (cancelLock)
+        {
+            openRequests.Add(requestId);
+        }
+    }
+
+    // Called from the client thread, the UI thread is busy with the request or has not picked it up yet.
+    // Returns false when the request already completed or is unknown, nothing is left to cancel
+    public bool CancelRequest(string requestId)
+    {
+        lock (cancelLock)
+        {
+            if (!openRequests.Contains(requestId)) return false;
+            cancelledRequests.Add(requestId);
+            return true;
+        }
+    }
+
+    public void CompleteRequest(string requestId)
+    {
+        lock (cancelLock)
+        {
+            openRequests.Remove(requestId);
+            cancelledRequests.Remove(requestId);
+        }
+    }
+
+    public bool IsCancelled(string requestId)
+    {
+        if (requestId == null) return false;
+        lock (cancelLock)
+        {
+            return cancelledRequests.Contains(requestId);
+        }
+    }
+
+    private void throwIfCancelled(string requestId)
+    {
+        if (IsCancelled(requestId))
+            throw new OperationCanceledException($"Request {requestId} was cancelled");
+    }
+
+    private void sendOutput(string requestId, string text)
+    {
+        if (requestId == null || SendMessage == null) return;
+
+        SendMessage(new JObject
+        {
+            ["type"] = "output",
+            ["request_id"] = requestId,
+            ["text"] = text
+        });
+    }
+
+    private void sendProgress(string requestId, double progress, string message)
+    {
+        if (requestId == null || SendMessage == null) return;
+
+        SendMessage(new JObject
+        {
+            ["type"] = "progress",
+            ["request_id"] = requestId,
+            ["progress"] = progress,
+            ["message"] = message
+        });
+    }
+}
@@ -0,0 +1,156 @@
+using System;
+using System.Collections;
+using System.Collections.Generic;
+using System.Linq;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
+using Rhino.Geometry;
+using Rhino.Runtime;
+using rhinomcp.Serializers;
+
+namespace RhinoMCPPlugin.Functions;
+
+public partial class RhinoMCPFunctions
+{
+    // Compiled script templates by the hash of their code, the least recently used are dropped first
+    private const int MaxScriptTemplates = 64;
+    private readonly Dictionary<string, LinkedListNode<KeyValuePair<string, PythonCompiledCode>>> scriptTemplates =
+        new Dictionary<string, LinkedListNode<KeyValuePair<string, PythonCompiledCode>>>();
+    private readonly LinkedList<KeyValuePair<string, PythonCompiledCode>> scriptTemplateOrder =
+        new LinkedList<KeyValuePair<string, PythonCompiledCode>>();
+
+    // Defines the template parameters as global variables of the script
+    private const string TemplateParamsPrelude =
+        "import json as __json\nglobals().update(__json.loads(__template_params__))\ndel __json, __template_params__\n";
+
+    // Interpreter scopes kept between executions by session id, until they are idle for too long or
+    // more sessions are opened, then the least recently used are dropped first
+    private const int MaxScriptSessions = 8;
+    private static readonly TimeSpan ScriptSessionIdleTime = TimeSpan.FromMinutes(30);
+    private readonly Dictionary<string, ScriptSession> scriptSessions = new Dictionary<string, ScriptSession>();
+    private readonly object sessionLock = new object();
+
+    private class ScriptSession
+    {
+        public PythonScript Script;
+        public DateTime LastUsed;
+    }
+
+    private PythonCompiledCode getScriptTemplate(string scriptHash)
+    {
+        if (!scriptTemplates.TryGetValue(scriptHash, out var node)) return null;
+        scriptTemplateOrder.Remove(node);
+        scriptTemplateOrder.AddFirst(node);
+        return node.Value.Value;
+    }
+
+    private PythonCompiledCode addScriptTemplate(string scriptHash, PythonScript pythonScript, string code)
+    {
+        if (scriptTemplates.TryGetValue(scriptHash, out var existing))
+            scriptTemplateOrder.Remove(existing);
+
+        PythonCompiledCode compiled = pythonScript.Compile(code);
+        var node = scriptTemplateOrder.AddFirst(new KeyValuePair<string, PythonCompiledCode>(scriptHash, compiled));
+        scriptTemplates[scriptHash] = node;
+
+        while (scriptTemplateOrder.Count > MaxScriptTemplates)
+        {
+            scriptTemplates.Remove(scriptTemplateOrder.Last.Value.Key);
+            scriptTemplateOrder.RemoveLast();
+        }
+        return compiled;
+    }
+
+    private void setTemplateParams(PythonScript pythonScript, JObject templateParams)
+    {
+        if (templateParams == null || !templateParams.HasValues) return;
+        // Passed as JSON so lists and numbers arrive as python lists and numbers
+        pythonScript.SetVariable("__template_params__", templateParams.ToString(Formatting.None));
+        pythonScript.ExecuteScript(TemplateParamsPrelude);
+    }
+
+    private PythonScript getScriptSession(string sessionId, out bool created)
+    {
+        lock (sessionLock)
+        {
+            var now = DateTime.UtcNow;
+            foreach (var expired in scriptSessions.Where(pair => now - pair.Value.LastUsed > ScriptSessionIdleTime).ToList())
+                scriptSessions.Remove(expired.Key);
+
+            created = !scriptSessions.TryGetValue(sessionId, out var session);
+            if (created)
+            {
+                session = new ScriptSession { Script = PythonScript.Create() };
+                scriptSessions[sessionId] = session;
+                while (scriptSessions.Count > MaxScriptSessions)
+                    scriptSessions.Remove(scriptSessions.OrderBy(pair => pair.Value.LastUsed).First().Key);
+            }
+            session.LastUsed = now;
+            return session.Script;
+        }
+    }
+
+    // Called when the client disconnects, the sessions belong to it
+    public int ClearScriptSessions()
+    {
+        lock (sessionLock)
+        {
+            int count = scriptSessions.Count;
+            scriptSessions.Clear();
+            return count;
+        }
+    }
+
+    public JObject CloseScriptSession(JObject parameters)
+    {
+        if (castToBool(parameters.SelectToken("all")))
+            return new JObject { ["closed"] = ClearScriptSessions() };
+
+        string sessionId = parameters["session_id"]?.ToString();
+        if (string.IsNullOrEmpty(sessionId))
+            throw new Exception("session_id is required");
+
+        lock (sessionLock)
+        {
+            return new JObject { ["closed"] = scriptSessions.Remove(sessionId) ? 1 : 0 };
+        }
+    }
+
+    // Converts a python value read from a script to JSON, unknown objects are returned as text
+    private JToken serializeScriptValue(object value)
+    {
+        switch (value)
+        {
+            case null:
+                return JValue.CreateNull();
+            case string text:
+                return text;
+            case bool flag:
+                return flag;
+            case int or long:
+                return Convert.ToInt64(value);
+            case double or float or decimal:
+                return Convert.ToDouble(value);
+            case System.Numerics.BigInteger big:
+                return (double)big;
+            case Guid id:
+                return id.ToString();
+            case Point3d point:
+                return Serializer.SerializePoint(point);
+            case Vector3d vector:
+                return new JArray { vector.X, vector.Y, vector.Z };
+            case IDictionary dictionary:
+                var obj = new JObject();
+                foreach (DictionaryEntry entry in dictionary)
+                    obj[entry.Key.ToString()] = serializeScriptValue(entry.Value);
+                return obj;
+            case IEnumerable items:
+                var array = new JArray();
+                foreach (var item in items)
+                    array.Add(serializeScriptValue(item));
+                return array;
+            default:
+                return value.ToString();
+        }
+    }
+}
@@ -32,6 +32,8 @@ namespace RhinoMCPPlugin
         private TcpListener listener;
         private Thread serverThread;
         private readonly object lockObject = new object();
+        // Responses, events and progress messages are written from different threads
+        private readonly object writeLock = new object();
         private RhinoMCPFunctions handler;
         private TcpClient client;
 
@@ -73,6 +75,15 @@ namespace RhinoMCPPlugin
 
                 RhinoDoc.AddRhinoObject += OnRhinoObjectAdded;
                 RhinoDoc.DeleteRhinoObject += OnRhinoObjectDeleted;
+                RhinoDoc.UndeleteRhinoObject += OnRhinoObjectUndeleted;
+                RhinoDoc.ReplaceRhinoObject += OnRhinoObjectReplaced;
+                RhinoDoc.ModifyObjectAttributes += OnObjectAttributesModified;
+                RhinoDoc.SelectObjects += OnObjectsSelected;
+                RhinoDoc.DeselectObjects += OnObjectsSelected;
+                RhinoDoc.DeselectAllObjects += OnAllObjectsDeselected;
+                RhinoDoc.LayerTableEvent += OnLayerTableChanged;
+                RhinoDoc.EndOpenDocument += OnDocumentOpened;
+                RhinoDoc.NewDocument += OnDocumentCreated;
 
                 RhinoApp.WriteLine($"RhinoMCP server started on {host}:{port}");
             }
@@ -120,6 +131,15 @@ namespace RhinoMCPPlugin
 
             RhinoDoc.AddRhinoObject -= OnRhinoObjectAdded;
             RhinoDoc.DeleteRhinoObject -= OnRhinoObjectDeleted;
+            RhinoDoc.UndeleteRhinoObject -= OnRhinoObjectUndeleted;
+            RhinoDoc.ReplaceRhinoObject -= OnRhinoObjectReplaced;
+            RhinoDoc.ModifyObjectAttributes -= OnObjectAttributesModified;
+            RhinoDoc.SelectObjects -= OnObjectsSelected;
+            RhinoDoc.DeselectObjects -= OnObjectsSelected;
+            RhinoDoc.DeselectAllObjects -= OnAllObjectsDeselected;
+            RhinoDoc.LayerTableEvent -= OnLayerTableChanged;
+            RhinoDoc.EndOpenDocument -= OnDocumentOpened;
+            RhinoDoc.NewDocument -= OnDocumentCreated;
 
             RhinoApp.WriteLine("RhinoMCP server stopped");
         }
@@ -145,9 +165,7 @@ namespace RhinoMCPPlugin
 
                 try
                 {
-                    var stream = client.GetStream();
-                    var responseBytes = Encoding.UTF8.GetBytes(message.ToString(Formatting.None));
-                    stream.Write(responseBytes, 0, responseBytes.Length);
+                    WriteMessage(client.GetStream(), message);
                 }
                 catch (Exception ex)
                 {
@@ -178,9 +196,7 @@ namespace RhinoMCPPlugin
 
             try
             {
-                var stream = client.GetStream();
-                var responseBytes = Encoding.UTF8.GetBytes(message.ToString(Formatting.None));
-                stream.Write(responseBytes, 0, responseBytes.Length);
+                WriteMessage(client.GetStream(), message);
             }
             catch (Exception ex)
             {
@@ -188,6 +204,87 @@ namespace RhinoMCPPlugin
             }
         }
 
+        // The server caches what it read from the document until one of these events tells it the document changed
+        private void SendEvent(string eventName, JObject data)
+        {
+            if (client == null || !client.Connected) return;
+
+            var message = new JObject
+            {
+                ["type"] = "event",
+                ["event"] = eventName,
+                ["data"] = data
+            };
+
+            try
+            {
+                WriteMessage(client.GetStream(), message);
+            }
+            catch (Exception ex)
+            {
+                RhinoApp.WriteLine($"Failed to send {eventName} event: {ex.Message}");
+            }
+        }
+
+        private static JObject ObjectReference(RhinoObject rhinoObject)
+        {
+            return new JObject
+            {
+                ["id"] = rhinoObject.Id.ToString(),
+                ["name"] = rhinoObject.Name
+            };
+        }
+
+        private void OnRhinoObjectUndeleted(object sender, RhinoObjectEventArgs e)
+        {
+            SendEvent("object_undeleted", ObjectReference(e.TheObject));
+        }
+
+        private void OnRhinoObjectReplaced(object sender, RhinoReplaceObjectEventArgs e)
+        {
+            // Geometry changes (move, scale, edits) replace the object under the same id
+            SendEvent("object_replaced", new JObject { ["id"] = e.ObjectId.ToString() });
+        }
+
+        private void OnObjectAttributesModified(object sender, RhinoModifyObjectAttributesEventArgs e)
+        {
+            SendEvent("object_modified", ObjectReference(e.RhinoObject));
+        }
+
+        private void OnObjectsSelected(object sender, RhinoObjectSelectionEventArgs e)
+        {
+            SendEvent("selection_changed", new JObject
+            {
+                ["selected"] = e.Selected,
+                ["ids"] = new JArray(e.RhinoObjects.Select(rhinoObject => rhinoObject.Id.ToString()))
+            });
+        }
+
+        private void OnAllObjectsDeselected(object sender, RhinoDeselectAllObjectsEventArgs e)
+        {
+            SendEvent("selection_changed", new JObject { ["selected"] = false, ["all"] = true });
+        }
+
+        private void OnLayerTableChanged(object sender, Rhino.DocObjects.Tables.LayerTableEventArgs e)
+        {
+            SendEvent("layer_changed", new JObject
+            {
+                ["change"] = e.EventType.ToString(),
+                ["index"] = e.LayerIndex,
+                ["name"] = e.NewState?.FullPath
+            });
+        }
+
+        private void OnDocumentOpened(object sender, DocumentOpenEventArgs e)
+        {
+            SendEvent("document_changed", new JObject { ["path"] = e.FileName });
+        }
+
+        private void OnDocumentCreated(object sender, DocumentEventArgs e)
+        {
+            SendEvent("document_changed", new JObject());
+        }
+
         private void ServerLoop()
         {
             RhinoApp.WriteLine("Server thread started");
@@ -245,6 +342,9 @@ namespace RhinoMCPPlugin
 
             byte[] buffer = new byte[8192];
             string incompleteData = string.Empty;
+            // Keeps multi-byte characters intact when they are split between two reads
+            Decoder utf8Decoder = Encoding.UTF8.GetDecoder();
+            char[] chars = new char[Encoding.UTF8.GetMaxCharCount(buffer.Length)];
 
             try
             {
@@ -264,57 +364,24 @@ namespace RhinoMCPPlugin
                                 break;
                             }
 
-                            string data = Encoding.UTF8.GetString(buffer, 0, bytesRead);
-                            incompleteData += data;
+                            int charCount = utf8Decoder.GetChars(buffer, 0, bytesRead, chars, 0);
+                            incompleteData += new string(chars, 0, charCount);
 
-                            try
+                            // The client can send several commands without waiting for the responses
+                            foreach (string message in ExtractMessages(ref incompleteData))
                             {
-                                // Try to parse as JSON
-                                JObject command = JObject.Parse(incompleteData);
-                                incompleteData = string.Empty;
-
-                                // Execute command on Rhino's main thread
-                                RhinoApp.InvokeOnUiThread(new Action(() =>
+                                JObject command;
+                                try
                                 {
-                                    try
-                                    {
-                                        JObject response = ExecuteCommand(command);
-                                        string responseJson = JsonConvert.SerializeObject(response);
-
-                                        try
-                                        {
-                                            byte[] responseBytes = Encoding.UTF8.GetBytes(responseJson);
-                                            stream.Write(responseBytes, 0, responseBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            RhinoApp.WriteLine("Failed to send response - client disconnected");
-                                        }
-                                    }
-                                    catch (Exception e)
-                                    {
-                                        RhinoApp.WriteLine($"Error executing command: {e.Message}");
-                                        try
-                                        {
-                                            JObject errorResponse = new JObject
-                                            {
-                                                ["status"] = "error",
-                                                ["message"] = e.Message
-                                            };
-
-                                            byte[] errorBytes = Encoding.UTF8.GetBytes(errorResponse.ToString());
-                                            stream.Write(errorBytes, 0, errorBytes.Length);
-                                        }
-                                        catch
-                                        {
-                                            // Ignore send errors
-                                        }
-                                    }
-                                }));
-                            }
-                            catch (JsonException)
-                            {
-                                // Incomplete JSON data, wait for more
+                                    command = JObject.Parse(message);
+                                }
+                                catch (JsonException e)
+                                {
+                                    RhinoApp.WriteLine($"Ignoring invalid command: {e.Message}");
+                                    continue;
+                                }
+
+                                DispatchCommand(command, stream);
                             }
                         }
                         else
@@ -344,10 +411,142 @@ namespace RhinoMCPPlugin
                 {
                     // Ignore errors on close
                 }
+                // Script sessions belong to the client that opened them
+                int closedSessions = this.handler.ClearScriptSessions();
+                if (closedSessions > 0) RhinoApp.WriteLine($"Closed {closedSessions} script session(s)");
                 RhinoApp.WriteLine("Client handler stopped");
             }
         }
 
+        private void WriteMessage(NetworkStream stream, JObject message)
+        {
+            byte[] messageBytes = Encoding.UTF8.GetBytes(message.ToString(Formatting.None));
+            lock (writeLock)
+            {
+                stream.Write(messageBytes, 0, messageBytes.Length);
+            }
+        }
+
+        private void DispatchCommand(JObject command, NetworkStream stream)
+        {
+            // Cancellation has to be handled right away, the UI thread is busy with the request being cancelled
+            if (command["type"]?.ToString() == "cancel_request")
+            {
+                string cancelledId = command["params"]?["request_id"]?.ToString();
+                bool cancelling = cancelledId != null && this.handler.CancelRequest(cancelledId);
+                try
+                {
+                    WriteMessage(stream, new JObject
+                    {
+                        ["status"] = "success",
+                        ["result"] = new JObject { ["cancelled"] = cancelledId, ["running"] = cancelling },
+                        ["request_id"] = command["request_id"]
+                    });
+                }
+                catch
+                {
+                    RhinoApp.WriteLine("Failed to send response - client disconnected");
+                }
+                return;
+            }
+
+            // The request can be cancelled from here on, while it waits for the UI thread
+            string requestId = command["request_id"]?.ToString();
+            if (requestId != null) this.handler.OpenRequest(requestId);
+
+            // Execute command on Rhino's main thread
+            RhinoApp.InvokeOnUiThread(new Action(() =>
+            {
+                try
+                {
+                    this.handler.SendMessage = message =>
+                    {
+                        try
+                        {
+                            WriteMessage(stream, message);
+                        }
+                        catch
+                        {
+                            RhinoApp.WriteLine("Failed to send message - client disconnected");
+                        }
+                    };
+
+                    JObject response = ExecuteCommand(command);
+
+                    try
+                    {
+                        WriteMessage(stream, response);
+                    }
+                    catch
+                    {
+                        RhinoApp.WriteLine("Failed to send response - client disconnected");
+                    }
+                }
+                catch (Exception e)
+                {
+                    RhinoApp.WriteLine($"Error executing command: {e.Message}");
+                    try
+                    {
+                        WriteMessage(stream, new JObject
+                        {
+                            ["status"] = "error",
+                            ["message"] = e.Message,
+                            ["request_id"] = command["request_id"]
+                        });
+                    }
+                    catch
+                    {
+                        // Ignore send errors
+                    }
+                }
+            }));
+        }
+
+        // Split the received text into complete top level JSON objects, the incomplete rest stays in the buffer
+        private static List<string> ExtractMessages(ref string data)
+        {
+            var messages = new List<string>();
+            int depth = 0;
+            int start = -1;
+            int consumed = 0;
+            bool inString = false;
+            bool escaped = false;
+
+            for (int i = 0; i < data.Length; i++)
+            {
+                char c = data[i];
+                if (inString)
+                {
+                    if (escaped) escaped = false;
+                    else if (c == '\\') escaped = true;
+                    else if (c == '"') inString = false;
+                    continue;
+                }
+
+                if (c == '"')
+                {
+                    inString = true;
+                }
+                else if (c == '{')
+                {
+                    if (depth == 0) start = i;
+                    depth++;
+                }
+                else if (c == '}' && depth > 0)
+                {
+                    depth--;
+                    if (depth == 0)
+                    {
+                        messages.Add(data.Substring(start, i - start + 1));
+                        consumed = i + 1;
+                    }
+                }
+            }
+
+            data = data.Substring(consumed);
+            return messages;
+        }
+
         private JObject ExecuteCommand(JObject command)
         {
             try
@@ -358,7 +557,28 @@ namespace RhinoMCPPlugin
 
                 RhinoApp.WriteLine($"Executing command: {cmdType}");
 
-                JObject result = ExecuteCommandInternal(cmdType, parameters);
+                this.handler.CurrentRequestId = requestId;
+                JObject result;
+                bool cancelled;
+                try
+                {
+                    // Cancelled while it waited for the UI thread, it is not started at all
+                    result = requestId != null && this.handler.IsCancelled(requestId)
+                        ? new JObject { ["status"] = "error", ["message"] = $"Request {requestId} was cancelled" }
+                        : ExecuteCommandInternal(cmdType, parameters);
+                }
+                finally
+                {
+                    cancelled = requestId != null && this.handler.IsCancelled(requestId);
+                    this.handler.CurrentRequestId = null;
+                    if (requestId != null) this.handler.CompleteRequest(requestId);
+                }
+
+                // Lets the client tell a cancelled request from a failed one
+                if (cancelled && result["status"]?.ToString() == "error")
+                {
+                    result["cancelled"] = true;
+                }
 
                 if (requestId != null)
                 {
@@ -397,7 +617,11 @@ namespace RhinoMCPPlugin
                 ["select_objects"] = this.handler.SelectObjects,
                 ["create_layer"] = this.handler.CreateLayer,
                 ["get_or_set_current_layer"] = this.handler.GetOrSetCurrentLayer,
-                ["delete_layer"] = this.handler.DeleteLayer
+                ["delete_layer"] = this.handler.DeleteLayer,
+                ["get_scene_objects"] = this.handler.GetSceneObjects,
+                ["get_layers"] = this.handler.GetLayers,
+                ["close_script_session"] = this.handler.CloseScriptSession,
+                ["sweep_script"] = this.handler.SweepScript
                 // Add more handlers as needed
             };
 
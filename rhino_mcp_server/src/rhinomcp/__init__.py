@@ -2,12 +2,25 @@
 
 __version__ = "0.1.0"
 
+
+def __getattr__(name):
+    # The rhinoscriptsyntax reference is large, only load it when it is asked for
+    if name == "rhinoscriptsyntax_json":
+        from .reference import get_reference
+        return get_reference()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Expose key classes and functions for easier imports
-from .static.rhinoscriptsyntax import rhinoscriptsyntax_json
 from .server import RhinoConnection, get_rhino_connection, mcp, logger
 
 from .prompts.assert_general_strategy import asset_general_strategy
 
+from .resources.script_output import get_script_output
+from .resources.tool_description import get_tool_description
+from .resources.rhinoscript_reference import get_rhinoscript_modules, get_rhinoscript_module, get_rhinoscript_function
+from .resources.document import get_document, get_layers, get_selection, get_object
+
 from .tools.create_object import create_object
 from .tools.create_objects import create_objects
 from .tools.delete_object import delete_object
@@ -17,9 +30,22 @@ from .tools.get_selected_objects_info import get_selected_objects_info
 from .tools.modify_object import modify_object
 from .tools.modify_objects import modify_objects
 from .tools.execute_rhinoscript_python_code import execute_rhinoscript_python_code
+from .tools.close_script_session import close_script_session
+from .tools.sweep_script import sweep_script
 from .tools.get_rhinoscript_python_function_names import get_rhinoscript_python_function_names
 from .tools.get_rhinoscript_python_code_guide import get_rhinoscript_python_code_guide
+from .tools.get_rhinoscript_python_code_guides import get_rhinoscript_python_code_guides
+from .tools.search_rhinoscript_functions import search_rhinoscript_functions
+from .tools.get_related_rhinoscript_functions import get_related_rhinoscript_functions
 from .tools.select_objects import select_objects
 from .tools.create_layer import create_layer
 from .tools.get_or_set_current_layer import get_or_set_current_layer
-from .tools.delete_layer import delete_layer
\ No newline at end of file
+from .tools.delete_layer import delete_layer
+from .tools.apply_scene import apply_scene
+from .tools.run_pipeline import run_pipeline
+from .tools.submit_rhinoscript_job import submit_rhinoscript_job
+from .tools.get_job_status import get_job_status
+from .tools.get_job_result import get_job_result
+from .tools.cancel_job import cancel_job
+from .tools.get_changes import get_changes
+from .tools.describe_tool import describe_tool
@@ -0,0 +1 @@
+"""Static analysis of rhinoscript python code before it is sent to Rhino."""
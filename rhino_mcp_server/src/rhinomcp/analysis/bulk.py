@@ -0,0 +1,175 @@
+"""Rewriting of loops that call a rhinoscriptsyntax function once per item into one call of its bulk form."""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+import ast
+import re
+
+from rhinomcp.analysis.calls import rhinoscript_aliases
+from rhinomcp.reference import get_details, get_store
+
+_WORD = re.compile(r"[A-Z][a-z0-9]*|[A-Z]+(?![a-z])")
+
+# Nodes that make an argument differ between iterations or have side effects
+_VARYING = (ast.Call, ast.Await, ast.Yield, ast.YieldFrom, ast.NamedExpr, ast.Lambda)
+
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+@lru_cache(maxsize=None)
+def bulk_table() -> Dict[str, Dict[str, Any]]:
+    """
+    Functions with a bulk form, derived from the signatures of the reference.
+    - MoveObject(object_id, translation) has MoveObjects(object_ids, translation): the plural name takes a
+      list as its first parameter and the same other parameters.
+    - ObjectColor(object_ids, color=None), like the other Object* attribute functions taking object_ids,
+      takes the list itself when it is used as a setter.
+    """
+    store = get_store()
+    functions = {store.name(i): get_details(i)["Parameters"] for i in range(store.record_count)}
+    table: Dict[str, Dict[str, Any]] = {}
+    for name, parameters in functions.items():
+        if not parameters or "kind" in parameters[0]:
+            continue
+        words = _WORD.findall(name)
+        for i in range(len(words)):
+            plural = "".join(words[:i] + [words[i] + "s"] + words[i + 1:])
+            plural_parameters = functions.get(plural)
+            if plural_parameters and plural_parameters[0]["name"] == parameters[0]["name"] + "s":
+                table[name] = {"bulk": plural, "parameters": parameters, "bulk_parameters": plural_parameters}
+                break
+        else:
+            if (name.startswith("Object") and parameters[0]["name"] == "object_ids" and len(parameters) > 1
+                    and parameters[1].get("default") == "None"):
+                table[name] = {"bulk": name, "parameters": parameters, "bulk_parameters": parameters, "setter": True}
+    return table
+
+
+def _is_invariant(node: ast.AST, loop_variables: Set[str]) -> bool:
+    for child in ast.walk(node):
+        if isinstance(child, _VARYING):
+            return False
+        if isinstance(child, ast.Name) and child.id in loop_variables:
+            return False
+    return True
+
+
+def _arguments_fit(entry: Dict[str, Any], call: ast.Call) -> bool:
+    """The arguments after the first one mean the same for the bulk form"""
+    parameters, bulk_parameters = entry["parameters"], entry["bulk_parameters"]
+    if len(call.args) > len(parameters):
+        return False
+    for i in range(1, len(call.args)):
+        if i >= len(bulk_parameters) or bulk_parameters[i]["name"] != parameters[i]["name"]:
+            return False
+    bulk_names = {parameter["name"] for parameter in bulk_parameters[1:]}
+    if any(keyword.arg not in bulk_names for keyword in call.keywords):
+        return False
+    # A setter called with only the object is a getter
+    return not entry.get("setter") or len(call.args) + len(call.keywords) > 1
+
+
+def _binds(targets: List[ast.AST], name: str) -> bool:
+    return any(isinstance(node, ast.Name) and node.id == name for target in targets for node in ast.walk(target))
+
+
+def _used_after(tree: ast.AST, loop: ast.For, name: str) -> bool:
+    """Whether the loop variable is read outside of the loop, where it would hold the last item"""
+    # Reads inside other loops or comprehensions binding the same name are of their own variable
+    ignored = {id(node) for node in ast.walk(loop)}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.For, ast.AsyncFor)) and _binds([node.target], name):
+            ignored.update(id(child) for child in ast.walk(node))
+        elif isinstance(node, _COMPREHENSIONS) and _binds([g.target for g in node.generators], name):
+            ignored.update(id(child) for child in ast.walk(node))
+    return any(
+        isinstance(node, ast.Name) and node.id == name and isinstance(node.ctx, ast.Load) and id(node) not in ignored
+        for node in ast.walk(tree)
+    )
+
+
+def _bulk_call(loop: ast.For, modules: Set[str], tree: ast.AST) -> Optional[Tuple[str, ast.Call]]:
+    """The bulk call replacing a loop, if the loop only calls one function on each item"""
+    if loop.orelse or len(loop.body) != 1:
+        return None
+    statement = loop.body[0]
+    if not isinstance(statement, ast.Expr) or not isinstance(statement.value, ast.Call):
+        return None
+    call = statement.value
+    func = call.func
+    if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in modules):
+        return None
+    entry = bulk_table().get(func.attr)
+    if entry is None or not call.args:
+        return None
+    if any(isinstance(arg, ast.Starred) for arg in call.args) or any(keyword.arg is None for keyword in call.keywords):
+        return None
+    variables = {node.id for node in ast.walk(loop.target) if isinstance(node, ast.Name)}
+    if not all(_is_invariant(arg, variables) for arg in call.args[1:]):
+        return None
+    if not all(_is_invariant(keyword.value, variables) for keyword in call.keywords):
+        return None
+    if not _arguments_fit(entry, call) or any(_used_after(tree, loop, variable) for variable in variables):
+        return None
+
+    item = call.args[0]
+    if isinstance(loop.target, ast.Name) and isinstance(item, ast.Name) and item.id == loop.target.id:
+        items = loop.iter if isinstance(loop.iter, ast.List) else ast.Call(ast.Name("list", ast.Load()), [loop.iter], [])
+    elif not any(isinstance(node, _VARYING) for node in ast.walk(item)):
+        # "for i in range(3): rs.AddPoint((i, 0, 0))" collects the items first
+        items = ast.ListComp(item, [ast.comprehension(loop.target, loop.iter, [], 0)])
+    else:
+        return None
+    bulk = ast.Call(
+        ast.Attribute(ast.Name(func.value.id, ast.Load()), entry["bulk"], ast.Load()),
+        [items] + call.args[1:],
+        call.keywords,
+    )
+    return func.attr, bulk
+
+
+def rewrite_loops(code: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Replace loops like "for p in points: rs.AddPoint(p)" by "rs.AddPoints(list(points))".
+    Only loops whose whole body is the call, with the other arguments the same in every iteration and
+    the result unused, are rewritten. Returns the new code and what was rewritten.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, []
+    modules, _ = rhinoscript_aliases(tree)
+    if not modules:
+        return code, []
+
+    lines = code.splitlines(keepends=True)
+    replacements = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.For):
+            continue
+        found = _bulk_call(node, modules, tree)
+        if found is None:
+            continue
+        first, last = lines[node.lineno - 1], lines[node.end_lineno - 1]
+        indent = first[:node.col_offset]
+        rest = last[node.end_col_offset:]
+        # Only whole lines are replaced
+        if indent.strip() or (rest.strip() and not rest.strip().startswith("#")):
+            continue
+        name, bulk = found
+        rewritten = indent + ast.unparse(bulk)
+        ending = last[len(last.rstrip("\r\n")):]
+        replacements.append((node.lineno, node.end_lineno, rewritten + ending, name, bulk.func.attr))
+
+    rewrites: List[Dict[str, Any]] = []
+    for start, end, text, name, bulk_name in sorted(replacements, reverse=True):
+        original = "".join(lines[start - 1:end])
+        lines[start - 1:end] = [text]
+        rewrites.append({
+            "line": start,
+            "function": name,
+            "bulk_function": bulk_name,
+            "original": original.strip(),
+            "rewritten": text.strip(),
+        })
+    rewrites.reverse()
+    return "".join(lines), rewrites
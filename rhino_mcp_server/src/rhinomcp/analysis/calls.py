@@ -0,0 +1,61 @@
+"""Discovery of the rhinoscriptsyntax calls in a script."""
+from dataclasses import dataclass, field
+from typing import Dict, List, Set, Tuple
+import ast
+
+RHINOSCRIPT_MODULES = ("rhinoscriptsyntax", "rhinoscript")
+
+
+@dataclass
+class RhinoscriptCall:
+    # Function name as written in the script
+    name: str
+    node: ast.Call
+    # Loops and comprehensions around the call, outermost first
+    loops: List[ast.AST] = field(default_factory=list)
+
+
+def rhinoscript_aliases(tree: ast.AST) -> Tuple[Set[str], Dict[str, str]]:
+    """
+    Names the script binds to the rhinoscriptsyntax module ("rs" for "import rhinoscriptsyntax as rs"),
+    and names bound to its functions by "from rhinoscriptsyntax import ..."
+    """
+    modules: Set[str] = set()
+    functions: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in RHINOSCRIPT_MODULES:
+                    modules.add(alias.asname or alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.module in RHINOSCRIPT_MODULES:
+            for alias in node.names:
+                if alias.name != "*":
+                    functions[alias.asname or alias.name] = alias.name
+    return modules, functions
+
+
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def find_rhinoscript_calls(tree: ast.AST) -> List[RhinoscriptCall]:
+    """All calls of rhinoscriptsyntax functions with the loops around them, in source order"""
+    modules, functions = rhinoscript_aliases(tree)
+    calls: List[RhinoscriptCall] = []
+
+    def visit(node: ast.AST, loops: List[ast.AST]):
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in modules:
+                calls.append(RhinoscriptCall(func.attr, node, loops))
+            elif isinstance(func, ast.Name) and func.id in functions:
+                calls.append(RhinoscriptCall(functions[func.id], node, loops))
+        for child in ast.iter_child_nodes(node):
+            # The iterable of a for loop is evaluated once, outside of the loop
+            inside = loops
+            if isinstance(node, LOOP_NODES) and not (isinstance(node, (ast.For, ast.AsyncFor)) and child is node.iter):
+                inside = loops + [node]
+            visit(child, inside)
+
+    visit(tree, [])
+    calls.sort(key=lambda call: (call.node.lineno, call.node.col_offset))
+    return calls
@@ -0,0 +1,132 @@
+"""Classification of scripts that only read the document, whose results can be reused until it changes."""
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set
+import ast
+import re
+
+from rhinomcp.analysis.calls import RHINOSCRIPT_MODULES, rhinoscript_aliases
+from rhinomcp.analysis.redraw import redrawing_functions
+from rhinomcp.reference import get_details, get_store
+
+# Modules a read-only script may import, they give the same result every time
+PURE_MODULES = {
+    "rhinoscriptsyntax", "rhinoscript", "math", "itertools", "functools", "collections", "operator",
+    "statistics", "string", "json", "re",
+}
+
+# Calls that ask the user for input or reach into the application
+INTERACTIVE_ROOTS = ("Rhino.Input.", "Rhino.UI.", "Rhino.RhinoApp.", "System.Windows.", "Eto.")
+
+# Functions named like this change something, whatever their implementation shows
+_WRITE_NAME = re.compile(
+    r"^(Add|Delete|Copy|Move|Rotate|Scale|Mirror|Shear|Transform|Orient|Select|Unselect|Invert|Hide|Show|Lock|"
+    r"Unlock|Rename|Purge|Set|Enable|Explode|Join|Split|Trim|Extend|Offset|Fillet|Boolean|Command|Insert|Make|"
+    r"Match|Change|Flip|Reverse|Rebuild|Close|Remove|Purge|Zoom|Redraw)"
+)
+
+# Builtins that run code or reach functions by a name the analysis cannot see
+_BUILTINS = {
+    "open", "exec", "eval", "compile", "input", "__import__", "globals", "locals", "vars", "getattr", "setattr",
+    "delattr", "__builtins__",
+}
+
+
+@lru_cache(maxsize=None)
+def document_writers() -> FrozenSet[str]:
+    """Names of the functions that can change the document or interact with the user, directly or through others"""
+    store = get_store()
+    details = [get_details(index) for index in range(store.record_count)]
+    names = [store.name(index) for index in range(store.record_count)]
+    writers = {
+        name for name, detail in zip(names, details)
+        if detail["Writes"] or any(call.startswith(INTERACTIVE_ROOTS) for call in detail["Calls"])
+        or _WRITE_NAME.match(name)
+    }
+    writers |= redrawing_functions()
+    changed = True
+    while changed:
+        changed = False
+        for name, detail in zip(names, details):
+            if name not in writers and writers.intersection(detail["Uses"]):
+                writers.add(name)
+                changed = True
+    return frozenset(writers)
+
+
+@lru_cache(maxsize=None)
+def getters() -> Dict[str, List[str]]:
+    """
+    Writing functions that only read when called without some of their optional parameters, like ObjectColor(id),
+    with the names of their parameters in order
+    """
+    store = get_store()
+    details = {store.name(index): get_details(index) for index in range(store.record_count)}
+    writers = document_writers()
+    result: Dict[str, List[str]] = {}
+    for name, detail in details.items():
+        if name not in writers or _WRITE_NAME.match(name) or not detail["WriteGuards"]:
+            continue
+        if writers.intersection(detail["Uses"]) or any(call.startswith(INTERACTIVE_ROOTS) for call in detail["Calls"]):
+            continue
+        result[name] = [parameter["name"] for parameter in detail["Parameters"]]
+    return result
+
+
+def _reads_only(name: str, call: Optional[ast.Call]) -> bool:
+    if name not in document_writers():
+        return True
+    parameters = getters().get(name)
+    if parameters is None or call is None:
+        return False
+    if any(isinstance(arg, ast.Starred) for arg in call.args) or any(keyword.arg is None for keyword in call.keywords):
+        return False
+    given = set(parameters[:len(call.args)]) | {keyword.arg for keyword in call.keywords}
+    return not given.intersection(get_details(get_store().find(name))["WriteGuards"])
+
+
+def is_read_only(code: str) -> bool:
+    """
+    Whether a script only reads the document: it calls no rhinoscriptsyntax function that changes the document
+    or asks for input, setters only as getters, imports no module but rhinoscriptsyntax and pure standard modules,
+    and does not use Rhino, scriptcontext or .NET directly.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+    modules, functions = rhinoscript_aliases(tree)
+
+    calls: Dict[int, ast.Call] = {}
+    attribute_values: Set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            calls[id(node.func)] = node
+        elif isinstance(node, ast.Attribute):
+            attribute_values.add(id(node.value))
+        elif isinstance(node, ast.Import):
+            if any(alias.name.split(".")[0] not in PURE_MODULES for alias in node.names):
+                return False
+        elif isinstance(node, ast.ImportFrom):
+            if (node.module or "").split(".")[0] not in PURE_MODULES or node.level:
+                return False
+            # The functions a star import binds are not known by name
+            if node.module in RHINOSCRIPT_MODULES and any(alias.name == "*" for alias in node.names):
+                return False
+
+    for node in ast.walk(tree):
+        # rs.__dict__["DeleteObjects"] and the like reach any function
+        if isinstance(node, ast.Attribute) and node.attr.startswith("__"):
+            return False
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in modules:
+            # A function passed on without being called, like map(rs.DeleteObject, ids), counts as called with anything
+            if not _reads_only(node.attr, calls.get(id(node))):
+                return False
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            if node.id in functions and not _reads_only(functions[node.id], calls.get(id(node))):
+                return False
+            if node.id in _BUILTINS:
+                return False
+            # The module itself passed on or assigned, like getattr(rs, name) or f(rs), is used out of sight
+            if node.id in modules and id(node) not in attribute_values:
+                return False
+    return True
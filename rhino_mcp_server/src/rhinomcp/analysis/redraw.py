@@ -0,0 +1,117 @@
+"""Estimate of the viewport redraws a script triggers through rhinoscriptsyntax calls."""
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional
+import ast
+
+from rhinomcp.analysis.calls import RhinoscriptCall, find_rhinoscript_calls
+from rhinomcp.reference import get_details, get_store
+
+REDRAW_CALL = "scriptcontext.doc.Views.Redraw"
+
+# Iterations assumed for loops whose length cannot be read from the code
+UNKNOWN_ITERATIONS = 10
+
+# Redraws from which suppressing them is worth it
+MIN_REDRAWS = 2
+
+
+@lru_cache(maxsize=None)
+def redrawing_functions() -> FrozenSet[str]:
+    """Names of the rhinoscriptsyntax functions that redraw the views, directly or through functions they use"""
+    store = get_store()
+    details = [get_details(index) for index in range(store.record_count)]
+    names = [store.name(index) for index in range(store.record_count)]
+    redrawing = {name for name, detail in zip(names, details) if REDRAW_CALL in detail["Calls"]}
+    changed = True
+    while changed:
+        changed = False
+        for name, detail in zip(names, details):
+            if name not in redrawing and redrawing.intersection(detail["Uses"]):
+                redrawing.add(name)
+                changed = True
+    return frozenset(redrawing)
+
+
+def _constant_int(node: ast.AST) -> Optional[int]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _constant_int(node.operand)
+        return -value if value is not None else None
+    return None
+
+
+def iteration_count(iterable: ast.AST) -> Optional[int]:
+    """Length of a literal sequence or of range() with constant arguments"""
+    if isinstance(iterable, (ast.List, ast.Tuple, ast.Set)):
+        return len(iterable.elts)
+    if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and iterable.func.id == "range":
+        arguments = [_constant_int(argument) for argument in iterable.args]
+        if not arguments or None in arguments or iterable.keywords:
+            return None
+        start, stop, step = (0, arguments[0], 1) if len(arguments) == 1 else (arguments + [1])[:3]
+        return len(range(start, stop, step)) if step else None
+    return None
+
+
+def _iterations(loop: ast.AST) -> Optional[int]:
+    if isinstance(loop, (ast.For, ast.AsyncFor)):
+        return iteration_count(loop.iter)
+    if isinstance(loop, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+        total = 1
+        for generator in loop.generators:
+            count = iteration_count(generator.iter)
+            if count is None:
+                return None
+            total *= count
+        return total
+    return None
+
+
+def estimate_redraws(code: str) -> Dict[str, Any]:
+    """
+    Count the redraws of a script, a redrawing call inside loops counts once per iteration.
+    Returns the estimate, whether loops of unknown length were guessed, and whether the script
+    manages redraws itself with rs.EnableRedraw.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return {"redraws": 0, "exact": True, "manages_redraw": False}
+
+    redrawing = redrawing_functions()
+    calls: List[RhinoscriptCall] = find_rhinoscript_calls(tree)
+    redraws = 0
+    exact = True
+    for call in calls:
+        if call.name not in redrawing or call.name == "EnableRedraw":
+            continue
+        count = 1
+        for loop in call.loops:
+            iterations = _iterations(loop)
+            if iterations is None:
+                exact = False
+                iterations = UNKNOWN_ITERATIONS
+            count *= iterations
+        redraws += count
+    return {
+        "redraws": redraws,
+        "exact": exact,
+        "manages_redraw": any(call.name == "EnableRedraw" for call in calls),
+    }
+
+
+def plan_redraw(code: str, suppress_redraw: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Decide whether to run a script with redraws turned off, by default when it would redraw
+    at least MIN_REDRAWS times and does not turn redraws off itself.
+    """
+    estimate = estimate_redraws(code)
+    if suppress_redraw is None:
+        suppress_redraw = estimate["redraws"] >= MIN_REDRAWS and not estimate["manages_redraw"]
+    plan: Dict[str, Any] = {"suppressed": suppress_redraw}
+    if suppress_redraw:
+        # All redraws but the one after the script are saved
+        plan["estimated_redraws_saved"] = max(0, estimate["redraws"] - 1)
+        plan["exact"] = estimate["exact"]
+    return plan
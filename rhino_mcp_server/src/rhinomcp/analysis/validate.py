@@ -0,0 +1,90 @@
+"""Checks of the rhinoscriptsyntax calls of a script against the signatures of the reference."""
+from typing import Any, Dict, List, Optional
+import ast
+
+from rhinomcp.analysis.calls import find_rhinoscript_calls
+from rhinomcp.reference import get_details, get_store, suggest_functions
+
+
+def _diagnostic(node: Optional[ast.AST], severity: str, message: str, **extra) -> Dict[str, Any]:
+    diagnostic: Dict[str, Any] = {"severity": severity, "message": message}
+    if node is not None:
+        diagnostic["line"] = node.lineno
+        diagnostic["column"] = node.col_offset + 1
+    diagnostic.update(extra)
+    return diagnostic
+
+
+def check_arguments(name: str, signature: str, parameters: List[Dict[str, Any]], call: ast.Call) -> List[str]:
+    """Problems with the arguments of one call, given the parameters of the function"""
+    positional = [p for p in parameters if "kind" not in p]
+    names = {p["name"] for p in parameters if p.get("kind") not in ("varargs", "kwargs")}
+    has_varargs = any(p.get("kind") == "varargs" for p in parameters)
+    has_kwargs = any(p.get("kind") == "kwargs" for p in parameters)
+    # Unpacked arguments can fill any parameter, only what is spelled out can be checked
+    unpacked_args = any(isinstance(arg, ast.Starred) for arg in call.args)
+    unpacked_kwargs = any(keyword.arg is None for keyword in call.keywords)
+
+    problems: List[str] = []
+    given = len(call.args)
+    if not unpacked_args and not has_varargs and given > len(positional):
+        problems.append(f"{name}() takes at most {len(positional)} positional arguments but {given} were given, expected {signature}")
+
+    filled = {p["name"] for p in positional[:given]}
+    for keyword in call.keywords:
+        if keyword.arg is None:
+            continue
+        if keyword.arg not in names and not has_kwargs:
+            problems.append(f"{name}() got an unexpected keyword argument '{keyword.arg}', expected {signature}")
+        elif keyword.arg in filled and not unpacked_args:
+            problems.append(f"{name}() got multiple values for argument '{keyword.arg}'")
+        filled.add(keyword.arg)
+
+    if not unpacked_args and not unpacked_kwargs:
+        missing = [p["name"] for p in parameters if "kind" not in p and "default" not in p and p["name"] not in filled]
+        if missing:
+            problems.append(f"{name}() is missing required arguments: {', '.join(missing)}, expected {signature}")
+    return problems
+
+
+def validate_code(code: str) -> List[Dict[str, Any]]:
+    """
+    Parse the code and check every rhinoscriptsyntax call for a known function and matching arguments.
+    Errors are calls that would fail in Rhino, warnings are calls the reference cannot check.
+    Rhino runs scripts with IronPython 2.7, code that is only valid python 2 (print statements,
+    "except Exception, e") cannot be parsed here and is let through with a warning.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        diagnostic = {
+            "severity": "warning",
+            "message": f"Not checked, the code is not valid python 3 ({e.msg}), it may still be valid in IronPython 2",
+        }
+        if e.lineno:
+            diagnostic["line"] = e.lineno
+            diagnostic["column"] = e.offset or 1
+        return [diagnostic]
+
+    store = get_store()
+    diagnostics: List[Dict[str, Any]] = []
+    for call in find_rhinoscript_calls(tree):
+        index = store.find(call.name)
+        record = store.record(index) if index is not None else None
+        if record is None or record["Name"] != call.name:
+            # Lower case helpers like coerce3dpoint are exported too but not documented
+            if record is None and not call.name[:1].isupper():
+                diagnostics.append(_diagnostic(call.node, "warning", f"rs.{call.name} is not in the reference, it cannot be checked"))
+                continue
+            suggestions = [suggestion["signature"] for suggestion in suggest_functions(call.name, 3)]
+            if record is not None:
+                suggestions = [record["Signature"]]
+            diagnostics.append(_diagnostic(
+                call.node, "error", f"rs.{call.name} does not exist", function=call.name, suggestions=suggestions,
+            ))
+            continue
+
+        parameters = get_details(index)["Parameters"]
+        for problem in check_arguments(call.name, record["Signature"], parameters, call.node):
+            diagnostics.append(_diagnostic(call.node, "error", problem, function=call.name))
+    return diagnostics
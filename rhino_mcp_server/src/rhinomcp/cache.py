@@ -0,0 +1,40 @@
+"""Results of commands and scripts that only read the document, kept until the document changes."""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional, Tuple
+import time
+
+
+@dataclass
+class ResultCache:
+    """
+    Most recently used results by key and the document version they were read at.
+    A result is only returned for the version it was read at, every change of the document makes it stale.
+    With a ttl results also go stale after that many seconds, for changes the version does not follow.
+    """
+    max_entries: int = 64
+    ttl: Optional[float] = None
+    entries: "OrderedDict[Tuple[Hashable, int], Tuple[float, Any]]" = field(default_factory=OrderedDict)
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        entry = self.entries.get((key, version))
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self.entries[(key, version)]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end((key, version))
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, version: int, result: Any):
+        self.entries[(key, version)] = (time.monotonic(), result)
+        self.entries.move_to_end((key, version))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
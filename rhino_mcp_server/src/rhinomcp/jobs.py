@@ -0,0 +1,139 @@
+"""Background jobs for rhinoscript code that runs longer than a tool call should block."""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+import asyncio
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Longest a status or result call is allowed to block
+MAX_WAIT_MS = 60000
+
+
+@dataclass
+class Job:
+    id: str
+    request_id: str
+    status: str = "running"  # running, cancelling, succeeded, failed, cancelled
+    progress: Optional[float] = None
+    message: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    # Set on every progress report so long polls can return early
+    updated: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled")
+
+    def describe(self) -> Dict[str, Any]:
+        """Status of the job without its result"""
+        end = self.finished_at or time.time()
+        status: Dict[str, Any] = {
+            "job_id": self.id,
+            "status": self.status,
+            "elapsed_seconds": round(end - self.created_at, 2),
+        }
+        if self.progress is not None:
+            status["progress"] = self.progress
+        if self.message:
+            status["message"] = self.message
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+@dataclass
+class JobManager:
+    # Finished jobs are kept until this many newer ones finished, least recently read first out
+    max_finished: int = 32
+    jobs: "OrderedDict[str, Job]" = field(default_factory=OrderedDict)
+
+    def submit(self, rhino, command_type: str, params: Dict[str, Any]) -> Job:
+        """Send a command to Rhino without a response timeout and track it as a job"""
+        job = Job(id=uuid.uuid4().hex[:12], request_id=str(uuid.uuid4()))
+        self.jobs[job.id] = job
+        rhino.message_listeners[job.request_id] = lambda message: self._on_message(job, message)
+        job.task = asyncio.create_task(self._run(rhino, job, command_type, params))
+        return job
+
+    async def _run(self, rhino, job: Job, command_type: str, params: Dict[str, Any]):
+        try:
+            result = await rhino.send_command(command_type, params, timeout=None, request_id=job.request_id)
+            job.result = result
+            if result.get("success", True):
+                job.status = "succeeded"
+            else:
+                job.status = "cancelled" if result.get("cancelled") else "failed"
+                job.error = result.get("message")
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            # Rhino marks the error of a request it stopped, also when it was cancelled before it started
+            if getattr(e, "cancelled", False):
+                job.status = "cancelled"
+            else:
+                logger.error(f"Job {job.id} failed: {str(e)}")
+                job.status = "failed"
+            job.error = str(e)
+        finally:
+            rhino.message_listeners.pop(job.request_id, None)
+            job.finished_at = time.time()
+            job.done.set()
+            job.updated.set()
+            self._evict()
+
+    def _on_message(self, job: Job, message: Dict[str, Any]):
+        """Apply a progress message Rhino sent for the job"""
+        if message.get("type") != "progress":
+            return
+        if message.get("progress") is not None:
+            job.progress = message["progress"]
+        if message.get("message"):
+            job.message = message["message"]
+        job.updated.set()
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        # Reading a job makes it the most recently used
+        self.jobs.move_to_end(job_id)
+        return job
+
+    async def wait(self, job_id: str, wait_ms: int = 0, until_done: bool = True) -> Job:
+        """Wait up to wait_ms for the job to finish, or for any progress if until_done is False"""
+        job = self.get(job_id)
+        if job.finished or wait_ms <= 0:
+            return job
+        if until_done:
+            event = job.done
+        else:
+            job.updated.clear()
+            event = job.updated
+        try:
+            await asyncio.wait_for(event.wait(), timeout=min(wait_ms, MAX_WAIT_MS) / 1000)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    async def cancel(self, rhino, job_id: str) -> Job:
+        """Ask Rhino to stop the script, it stops at its next print or progress report"""
+        job = self.get(job_id)
+        if job.finished:
+            return job
+        job.status = "cancelling"
+        await rhino.send_command("cancel_request", {"request_id": job.request_id})
+        return job
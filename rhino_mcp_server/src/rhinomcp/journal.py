@@ -0,0 +1,97 @@
+"""Journal of the document changes Rhino reported, read by cursor."""
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+import asyncio
+import time
+
+from rhinomcp.jobs import MAX_WAIT_MS
+
+# Object fields kept in the summary of a created object, the event carries the full serialization
+SUMMARY_FIELDS = ("name", "type", "layer", "color", "bounding_box")
+
+
+@dataclass
+class Change:
+    seq: int
+    event: str
+    data: Dict[str, Any]
+    # False when the change was made while one of our commands ran
+    user: bool
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class ChangeJournal:
+    """The latest events in a ring buffer, numbered from 1 so 0 is the cursor before everything"""
+    max_changes: int = 2000
+    changes: Deque[Change] = field(default_factory=deque)
+    last_seq: int = 0
+    # Set on every change so long polls can return early
+    updated: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def append(self, event: str, data: Dict[str, Any], user: bool = True):
+        self.last_seq += 1
+        self.changes.append(Change(self.last_seq, event, data or {}, user))
+        while len(self.changes) > self.max_changes:
+            self.changes.popleft()
+        self.updated.set()
+
+    def since(self, cursor: int) -> List[Change]:
+        return [change for change in self.changes if change.seq > cursor]
+
+    def missed(self, cursor: int) -> bool:
+        """Whether changes after the cursor were already dropped from the buffer"""
+        first = self.changes[0].seq if self.changes else self.last_seq + 1
+        return cursor < first - 1
+
+    async def wait(self, cursor: int, wait_ms: int = 0):
+        """Wait up to wait_ms for a change after the cursor"""
+        if cursor < self.last_seq or wait_ms <= 0:
+            return
+        self.updated.clear()
+        try:
+            await asyncio.wait_for(self.updated.wait(), timeout=min(wait_ms, MAX_WAIT_MS) / 1000)
+        except asyncio.TimeoutError:
+            pass
+
+
+def fold_changes(changes: List[Change]) -> Dict[str, Any]:
+    """
+    Net effect of a list of changes: an object created and deleted again is left out,
+    one deleted and added again (undo, replace) is modified.
+    """
+    created: Dict[str, Dict[str, Any]] = {}
+    deleted: Dict[str, Optional[str]] = {}
+    modified: Dict[str, None] = {}
+    result: Dict[str, Any] = {}
+    for change in changes:
+        object_id = change.data.get("id")
+        if change.event in ("object_created", "object_undeleted") and object_id:
+            if object_id in deleted:
+                del deleted[object_id]
+                modified[object_id] = None
+            else:
+                created[object_id] = {key: change.data[key] for key in SUMMARY_FIELDS if key in change.data}
+        elif change.event == "object_deleted" and object_id:
+            if object_id in created:
+                del created[object_id]
+            else:
+                modified.pop(object_id, None)
+                deleted[object_id] = change.data.get("name")
+        elif change.event in ("object_replaced", "object_modified") and object_id:
+            if object_id not in created:
+                modified[object_id] = None
+        elif change.event == "selection_changed":
+            result["selection_changed"] = True
+        elif change.event == "layer_changed":
+            result.setdefault("layers_changed", []).append(change.data)
+        else:
+            # Another document was opened, or events were lost while disconnected
+            result["rescan"] = True
+    result.update({
+        "created": [{"id": object_id, **summary} for object_id, summary in created.items()],
+        "deleted": list(deleted),
+        "modified": list(modified),
+    })
+    return result
@@ -0,0 +1,51 @@
+"""Collection of print output streamed from rhinoscript executions."""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional
+import uuid
+
+OUTPUT_URI = "rhinoscript://output/{output_id}"
+
+
+@dataclass
+class OutputStore:
+    """Keeps the full output of the most recent scripts whose output was too large to return"""
+    max_outputs: int = 16
+    outputs: "OrderedDict[str, str]" = field(default_factory=OrderedDict)
+
+    def add(self, text: str) -> str:
+        output_id = uuid.uuid4().hex[:12]
+        self.outputs[output_id] = text
+        while len(self.outputs) > self.max_outputs:
+            self.outputs.popitem(last=False)
+        return output_id
+
+    def get(self, output_id: str) -> Optional[str]:
+        return self.outputs.get(output_id)
+
+
+@dataclass
+class ScriptOutput:
+    """Output chunks of one script, in the order Rhino sent them"""
+    chunks: List[str] = field(default_factory=list)
+    size: int = 0
+
+    def append(self, text: str):
+        self.chunks.append(text)
+        self.size += len(text)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def summarize(self, max_output: int, store: OutputStore) -> tuple[str, Optional[str]]:
+        """Return the output cut to max_output characters, and the resource uri of the full output if it was cut"""
+        if self.size <= max_output:
+            return self.text, None
+        full = self.text
+        output_id = store.add(full)
+        # The end of the output usually matters most (results, errors), keep both ends
+        head = full[:max_output // 2]
+        tail = full[-(max_output - len(head)):] if max_output > len(head) else ""
+        cut = self.size - len(head) - len(tail)
+        return f"{head}\n... [{cut} characters cut] ...\n{tail}", OUTPUT_URI.format(output_id=output_id)
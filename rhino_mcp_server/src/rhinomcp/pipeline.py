@@ -0,0 +1,141 @@
+"""Execution of a DAG of Rhino commands where steps can reference the results of earlier steps."""
+from typing import Any, Dict, List, Set
+import asyncio
+import re
+
+# Rhino commands a pipeline step can run. The params go to Rhino as given, the tools of the same name take
+# mostly the same ones but add their own handling on the server
+PIPELINE_COMMANDS = {
+    "get_document_info",
+    "get_object_info",
+    "get_selected_objects_info",
+    "create_object",
+    "create_objects",
+    "modify_object",
+    "modify_objects",
+    "delete_object",
+    "select_objects",
+    "execute_rhinoscript_python_code",
+    "create_layer",
+    "get_or_set_current_layer",
+    "delete_layer",
+}
+
+# Commands that only read the document, their responses are shared with the read tools until it changes
+READ_COMMANDS = {"get_document_info", "get_object_info", "get_selected_objects_info"}
+
+# A whole string like "$step1.id" or "$boxes.0.name"
+REFERENCE_PATTERN = re.compile(r"^\$([A-Za-z_][\w-]*)((?:\.[\w-]+)*)$")
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline definition is invalid"""
+    pass
+
+
+def find_references(value: Any) -> Set[str]:
+    """Collect the ids of all steps referenced inside a parameter value"""
+    if isinstance(value, str):
+        match = REFERENCE_PATTERN.match(value)
+        return {match.group(1)} if match else set()
+    if isinstance(value, dict):
+        return set().union(*(find_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(find_references(v) for v in value)) if value else set()
+    return set()
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """Replace every reference inside a parameter value by the referenced result"""
+    if isinstance(value, str):
+        match = REFERENCE_PATTERN.match(value)
+        if not match:
+            return value
+        resolved = results[match.group(1)]
+        for key in filter(None, match.group(2).split(".")):
+            if isinstance(resolved, list):
+                resolved = resolved[int(key)]
+            elif isinstance(resolved, dict) and key in resolved:
+                resolved = resolved[key]
+            else:
+                raise PipelineError(f"Cannot resolve {value}: no '{key}' in result of step {match.group(1)}")
+        return resolved
+    if isinstance(value, dict):
+        return {k: resolve_references(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results) for v in value]
+    return value
+
+
+def build_dependencies(steps: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """Validate the steps and return the ids each step depends on"""
+    ids = [step.get("id") for step in steps]
+    if any(not step_id for step_id in ids):
+        raise PipelineError("Every step needs an id")
+    if len(set(ids)) != len(ids):
+        raise PipelineError("Step ids must be unique")
+
+    dependencies: Dict[str, Set[str]] = {}
+    for step in steps:
+        if step.get("tool") not in PIPELINE_COMMANDS:
+            raise PipelineError(f"Step {step['id']}: unsupported tool {step.get('tool')}")
+        depends_on = find_references(step.get("params") or {}) | set(step.get("depends_on") or [])
+        unknown = depends_on - set(ids)
+        if unknown:
+            raise PipelineError(f"Step {step['id']} references unknown steps: {', '.join(sorted(unknown))}")
+        dependencies[step["id"]] = depends_on
+
+    # Kahn's algorithm, anything left over is part of a cycle
+    remaining = {step_id: set(deps) for step_id, deps in dependencies.items()}
+    while True:
+        ready = [step_id for step_id, deps in remaining.items() if not deps]
+        if not ready:
+            break
+        for step_id in ready:
+            del remaining[step_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    if remaining:
+        raise PipelineError(f"Steps form a cycle: {', '.join(sorted(remaining))}")
+
+    return dependencies
+
+
+async def run_steps(rhino, steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run the steps, each one as soon as the steps it depends on are finished.
+    Independent steps are sent to Rhino without waiting for each other.
+    """
+    dependencies = build_dependencies(steps)
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    skipped: List[str] = []
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run_step(step: Dict[str, Any]) -> bool:
+        step_id = step["id"]
+        succeeded = await asyncio.gather(*(tasks[dep] for dep in dependencies[step_id]))
+        if not all(succeeded):
+            skipped.append(step_id)
+            return False
+        try:
+            params = resolve_references(step.get("params") or {}, results)
+            if step["tool"] in READ_COMMANDS:
+                results[step_id] = await rhino.send_read_command(step["tool"], params)
+            else:
+                results[step_id] = await rhino.send_command(step["tool"], params)
+            return True
+        except Exception as e:
+            errors[step_id] = str(e)
+            return False
+
+    for step in steps:
+        tasks[step["id"]] = asyncio.ensure_future(run_step(step))
+    await asyncio.gather(*tasks.values())
+
+    summary: Dict[str, Any] = {"results": {step["id"]: results[step["id"]] for step in steps if step["id"] in results}}
+    if errors:
+        summary["errors"] = errors
+    if skipped:
+        summary["skipped"] = skipped
+    return summary
@@ -0,0 +1,179 @@
+"""Folding and merging of queued document edits before they are sent to Rhino."""
+from typing import Any, Dict, List, Optional
+import copy
+
+# Modify parameters that can be folded into a pending create
+FOLDABLE_MODIFY_KEYS = {"name", "new_name", "new_color", "translation"}
+
+
+def _expand(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Split batch commands into single-object commands so they can be folded individually"""
+    expanded = []
+    for op in operations:
+        params = op.get("params") or {}
+        if op["type"] == "create_objects":
+            for obj in params.get("objects", []):
+                expanded.append({"type": "create_object", "params": copy.deepcopy(obj)})
+        elif op["type"] == "modify_objects" and not params.get("all"):
+            for obj in params.get("objects", []):
+                expanded.append({"type": "modify_object", "params": copy.deepcopy(obj)})
+        else:
+            expanded.append({"type": op["type"], "params": copy.deepcopy(params)})
+    return expanded
+
+
+def _is_barrier(op: Dict[str, Any]) -> bool:
+    """Operations that touch every object in the document cannot be reordered"""
+    return bool(op["params"].get("all"))
+
+
+def _target_name(op: Dict[str, Any]) -> Optional[str]:
+    """Name an operation addresses, if it addresses its object by name only"""
+    params = op["params"]
+    if params.get("id") is None and params.get("name") is not None:
+        return params["name"]
+    return None
+
+
+def _fold_modify(create: Dict[str, Any], modify: Dict[str, Any]) -> bool:
+    """Fold a modify into the create of the same object, returns False if it cannot be folded"""
+    params = {k: v for k, v in modify["params"].items() if v is not None}
+    if not set(params) <= FOLDABLE_MODIFY_KEYS:
+        return False
+
+    target = create["params"]
+    if "new_name" in params:
+        target["name"] = params["new_name"]
+    if "new_color" in params:
+        target["color"] = params["new_color"]
+    if "translation" in params:
+        # The plugin applies the create translation last, so a later move simply adds to it
+        current = target.get("translation") or [0, 0, 0]
+        target["translation"] = [a + b for a, b in zip(current, params["translation"])]
+    return True
+
+
+def _commutes(op: Dict[str, Any], create: Dict[str, Any]) -> bool:
+    """Check whether a create can be moved in front of an earlier operation"""
+    if _is_barrier(op):
+        return False
+    name = _target_name(op)
+    return name is None or name != create["params"].get("name")
+
+
+def plan_operations(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Optimize a list of queued edits while keeping their effect on the document.
+
+    - a create followed by modifies of the same object (by name) becomes one create
+    - a create followed by a delete of the same object (by name) is dropped entirely
+    - everything before a delete of all objects is dropped
+    - creates are merged into one create_objects command where the operations in between allow it
+    - consecutive modifies by id are merged into one modify_objects command
+    """
+    expanded = _expand(operations)
+
+    # Drop everything that a later "delete all" wipes out anyway
+    for i in range(len(expanded) - 1, -1, -1):
+        if expanded[i]["type"] == "delete_object" and expanded[i]["params"].get("all"):
+            expanded = expanded[i:]
+            break
+
+    planned: List[Optional[Dict[str, Any]]] = []
+    # name -> index in planned of the create that produces the object
+    pending_creates: Dict[str, int] = {}
+    # names whose create can no longer absorb modifies (an unfoldable modify sits in between)
+    sealed: set = set()
+
+    for op in expanded:
+        if _is_barrier(op):
+            pending_creates.clear()
+            sealed.clear()
+            planned.append(op)
+            continue
+
+        name = _target_name(op)
+        if op["type"] == "create_object":
+            created_name = op["params"].get("name")
+            planned.append(op)
+            if created_name in pending_creates:
+                # Two pending objects share the name, leave addressing it to Rhino
+                del pending_creates[created_name]
+            elif created_name:
+                pending_creates[created_name] = len(planned) - 1
+                sealed.discard(created_name)
+        elif name is not None and name in pending_creates and op["type"] == "modify_object":
+            index = pending_creates[name]
+            renamed_to = op["params"].get("new_name")
+            clashes = renamed_to is not None and renamed_to != name and renamed_to in pending_creates
+            if name not in sealed and not clashes and _fold_modify(planned[index], op):
+                new_name = planned[index]["params"].get("name")
+                if new_name != name:
+                    del pending_creates[name]
+                    pending_creates[new_name] = index
+            else:
+                planned.append(op)
+                if renamed_to is not None and renamed_to != name:
+                    # Rhino renames the object, the name no longer leads to the create
+                    del pending_creates[name]
+                    sealed.discard(name)
+                else:
+                    sealed.add(name)
+        elif name is not None and name in pending_creates and op["type"] == "delete_object":
+            # Cancel the create and everything addressed to the object since
+            index = pending_creates.pop(name)
+            sealed.discard(name)
+            planned[index] = None
+            for j in range(index + 1, len(planned)):
+                if planned[j] is not None and _target_name(planned[j]) == name:
+                    planned[j] = None
+        else:
+            planned.append(op)
+
+    return _merge([op for op in planned if op is not None])
+
+
+def _merge(operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group creates into create_objects and consecutive modifies by id into modify_objects"""
+    merged: List[Dict[str, Any]] = []
+    create_group: Optional[Dict[str, Any]] = None
+    # operations appended since the current create group, a create can only join the
+    # group if it commutes with all of them
+    since_group: List[Dict[str, Any]] = []
+
+    for op in operations:
+        if op["type"] == "create_object":
+            if create_group is not None and all(_commutes(other, op) for other in since_group):
+                create_group["params"]["objects"].append(op["params"])
+                continue
+            create_group = {"type": "create_objects", "params": {"objects": [op["params"]]}}
+            merged.append(create_group)
+            since_group = []
+            continue
+
+        if _is_barrier(op):
+            create_group = None
+            since_group = []
+
+        previous = merged[-1] if merged else None
+        if (
+            op["type"] == "modify_object"
+            and op["params"].get("id") is not None
+            and previous is not None
+            and previous["type"] == "modify_objects"
+            and not previous["params"].get("all")
+        ):
+            previous["params"]["objects"].append(op["params"])
+        elif op["type"] == "modify_object" and op["params"].get("id") is not None:
+            merged.append({"type": "modify_objects", "params": {"objects": [op["params"]]}})
+        else:
+            merged.append(op)
+        since_group.append(op)
+
+    # Single-element batches go out as their plain command
+    for i, op in enumerate(merged):
+        if op["type"] in ("create_objects", "modify_objects") and len(op["params"]["objects"]) == 1 and not op["params"].get("all"):
+            single = "create_object" if op["type"] == "create_objects" else "modify_object"
+            merged[i] = {"type": single, "params": op["params"]["objects"][0]}
+
+    return merged
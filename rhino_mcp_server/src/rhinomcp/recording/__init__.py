@@ -0,0 +1,133 @@
+"""
+Local execution of simple rhinoscripts against a recording stub of rhinoscriptsyntax.
+
+Scripts that only create objects and set their attributes are run in a separate python
+process (see sandbox.py) and the recorded objects are sent to Rhino as one create_objects
+and one modify_objects command, instead of running the script in Rhino.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import ast
+import asyncio
+import json
+import re
+import sys
+
+from rhinomcp.analysis.calls import find_rhinoscript_calls
+from rhinomcp.recording.sandbox import MODELLED
+from rhinomcp.reference import get_details, get_store
+
+SANDBOX_PATH = Path(__file__).parent / "sandbox.py"
+
+# Modules a script may import to be recorded, anything else needs Rhino. None of them gives access to os or sys
+# through a public name (random has random._os, statistics has statistics.sys), or looks up attributes by name
+# (operator.attrgetter, string.Formatter)
+IMPORTABLE = {"rhinoscriptsyntax", "rhinoscript", "math", "itertools", "functools", "collections", "colorsys"}
+
+# Names that reach objects or attributes the static checks below cannot follow
+BLOCKED_NAMES = {
+    "getattr", "setattr", "delattr", "hasattr", "type", "object", "vars", "globals", "locals", "dir", "super",
+    "eval", "exec", "compile", "open", "input", "breakpoint", "memoryview", "classmethod", "staticmethod", "property",
+}
+
+# Attributes of frames, generators, coroutines, tracebacks and code objects lead back to the globals of the sandbox
+_FRAME_ATTRIBUTE = re.compile(r"^(f|gi|cr|ag|tb|co)_")
+
+# A format string that reads an attribute or item of its argument, like "{0.x}" or "{0[x]}"
+_FORMAT_LOOKUP = re.compile(r"\{[^{}!:]*[.\[]")
+
+
+@lru_cache(maxsize=None)
+def _functions() -> Dict[str, List[Dict[str, Any]]]:
+    """Parameters of every rhinoscriptsyntax function, the stub takes the same arguments"""
+    store = get_store()
+    return {store.name(index): get_details(index)["Parameters"] for index in range(store.record_count)}
+
+
+def unsupported_reason(code: str) -> Optional[str]:
+    """Why a script cannot be recorded, as far as can be told without running it"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return f"syntax error: {e.msg}"
+    for node in ast.walk(tree):
+        # The stub runs on the server, scripts must not reach past the names they are given
+        if isinstance(node, ast.Attribute) and (node.attr.startswith("_") or _FRAME_ATTRIBUTE.match(node.attr)):
+            return f"access to .{node.attr} cannot be recorded"
+        if isinstance(node, ast.Name) and (node.id in BLOCKED_NAMES or node.id.startswith("__") and node.id != "__name__"):
+            return f"use of {node.id} cannot be recorded"
+        if isinstance(node, ast.alias) and (node.name in BLOCKED_NAMES or node.name.startswith("_")):
+            return f"import of {node.name} cannot be recorded"
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if "__" in node.value and node.value != "__main__" or _FORMAT_LOOKUP.search(node.value):
+                return "strings naming attributes cannot be recorded"
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            modules = [node.module or ""]
+        else:
+            continue
+        for module in modules:
+            if module.split(".")[0] not in IMPORTABLE:
+                return f"import of {module} cannot be recorded"
+    calls = find_rhinoscript_calls(tree)
+    if not calls:
+        return "no rhinoscriptsyntax calls to record"
+    for call in calls:
+        if call.name not in MODELLED:
+            return f"rs.{call.name} cannot be recorded"
+    return None
+
+
+async def record_script(code: str, timeout: float = 5.0) -> Dict[str, Any]:
+    """
+    Run a script against the recording stub.
+    Returns {"supported": False, "reason": ...} when it does something the stub cannot model,
+    else its print output and the recorded creations and modifications.
+    """
+    reason = unsupported_reason(code)
+    if reason:
+        return {"supported": False, "reason": reason}
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-I", "-S", str(SANDBOX_PATH),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    request = json.dumps({"code": code, "functions": _functions()}).encode("utf-8")
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(request), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return {"supported": False, "reason": f"recording took longer than {timeout} seconds"}
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", "replace").strip().splitlines()
+        return {"supported": False, "reason": f"recording failed: {message[-1] if message else process.returncode}"}
+    return json.loads(stdout)
+
+
+async def replay_recording(rhino, recording: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send a recording to Rhino as one create_objects and one modify_objects command.
+    The ids the script printed for the objects it created are replaced by the ids Rhino gave them.
+    """
+    output = recording["output"]
+    created: List[str] = []
+    failed: List[str] = []
+    if recording["creates"]:
+        results = await rhino.send_command("create_objects", {"objects": recording["creates"]})
+        for index, placeholder in enumerate(recording["placeholders"]):
+            result = results.get(str(index), {})
+            if "id" in result:
+                created.append(result["id"])
+                output = output.replace(placeholder, result["id"])
+            else:
+                failed.append(result.get("error", "not created"))
+    modified = 0
+    if recording["modifies"]:
+        result = await rhino.send_command("modify_objects", {"objects": recording["modifies"]})
+        modified = result.get("modified", 0)
+    return {"output": output, "created": created, "modified": modified, "failed": failed}
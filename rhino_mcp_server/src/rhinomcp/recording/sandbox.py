@@ -0,0 +1,322 @@
+"""
+Runs a rhinoscript locally against a recording stub of rhinoscriptsyntax.
+
+This file is executed as a separate python process with CPU and memory limits and
+only uses the standard library. It is not a security boundary on its own: scripts
+only get here after unsupported_reason rejected the imports, names and attributes
+that lead past the stub. It reads {"code", "functions"} as JSON from stdin
+and writes the recorded objects as JSON to stdout. Every rhinoscriptsyntax
+function that is not modelled here raises Unsupported, which ends the run so
+the script can be sent to Rhino instead.
+"""
+import ast
+import builtins
+import contextlib
+import inspect
+import io
+import json
+import math
+import sys
+import types
+import uuid
+
+# Modules a recorded script may import besides rhinoscriptsyntax
+ALLOWED_IMPORTS = {"math", "itertools", "functools", "collections", "colorsys"}
+
+# Builtins a script cannot use locally
+BLOCKED_BUILTINS = {
+    "open", "exec", "eval", "compile", "input", "breakpoint", "exit", "quit", "help", "globals", "vars", "locals",
+    "getattr", "setattr", "delattr", "hasattr", "type", "object", "dir", "super", "memoryview",
+}
+
+MAX_CALLS = 10000
+
+
+class Unsupported(Exception):
+    """The script does something the stub cannot record"""
+    pass
+
+
+def _number(value, what="number"):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise Unsupported(f"{what} must be a plain number")
+    return float(value)
+
+
+def _point(value):
+    if isinstance(value, (list, tuple)) and len(value) in (2, 3):
+        coordinates = [_number(coordinate, "point coordinate") for coordinate in value]
+        return coordinates + [0.0] * (3 - len(coordinates))
+    raise Unsupported("only points given as [x, y, z] can be recorded")
+
+
+def _points(value, minimum=1):
+    if not isinstance(value, (list, tuple)) or len(value) < minimum:
+        raise Unsupported(f"expected a list of at least {minimum} points")
+    return [_point(point) for point in value]
+
+
+def _color(value):
+    if isinstance(value, (list, tuple)) and len(value) == 3:
+        return [int(_number(channel, "color channel")) for channel in value]
+    raise Unsupported("only colors given as (r, g, b) can be recorded")
+
+
+def _vertical(base, height):
+    """Height of a cylinder or cone that points straight up from its base"""
+    top = _point(height)
+    if top[0] != base[0] or top[1] != base[1] or top[2] <= base[2]:
+        raise Unsupported("only upright cylinders and cones can be recorded")
+    return top[2] - base[2]
+
+
+class Recorder:
+    def __init__(self):
+        self.creates = []
+        self.placeholders = {}
+        self.modifies = {}
+        self.calls = 0
+
+    def create(self, type, params, translation=None):
+        placeholder = str(uuid.uuid4())
+        entry = {"type": type, "params": params}
+        if translation and any(translation):
+            entry["translation"] = translation
+        self.placeholders[placeholder] = len(self.creates)
+        self.creates.append(entry)
+        return placeholder
+
+    def _ids(self, object_ids):
+        return list(object_ids) if isinstance(object_ids, (list, tuple)) else [object_ids]
+
+    def _entry(self, object_id):
+        """The recorded create of an object, or the modification of an object already in the document"""
+        object_id = str(object_id)
+        if object_id in self.placeholders:
+            return self.creates[self.placeholders[object_id]], True
+        try:
+            uuid.UUID(object_id)
+        except ValueError:
+            raise Unsupported(f"{object_id} is not an object id")
+        return self.modifies.setdefault(object_id, {"id": object_id}), False
+
+    # Creation
+
+    def AddPoint(self, point, y=None, z=None):
+        if y is not None:
+            point = [point, y, z or 0]
+        x, y, z = _point(point)
+        return self.create("POINT", {"x": x, "y": y, "z": z})
+
+    def AddPoints(self, points):
+        return [self.AddPoint(point) for point in _points(points)]
+
+    def AddLine(self, start, end):
+        return self.create("LINE", {"start": _point(start), "end": _point(end)})
+
+    def AddPolyline(self, points, replace_id=None):
+        if replace_id is not None:
+            raise Unsupported("replace_id cannot be recorded")
+        return self.create("POLYLINE", {"points": _points(points, 2)})
+
+    def AddCurve(self, points, degree=3):
+        return self.create("CURVE", {"points": _points(points, 2), "degree": int(_number(degree))})
+
+    def AddCircle(self, plane_or_center, radius):
+        return self.create("CIRCLE", {"center": _point(plane_or_center), "radius": _number(radius)})
+
+    def AddSphere(self, center_or_plane, radius):
+        return self.create("SPHERE", {"radius": _number(radius)}, _point(center_or_plane))
+
+    def AddBox(self, corners):
+        points = _points(corners, 8)
+        low = [min(point[axis] for point in points) for axis in range(3)]
+        high = [max(point[axis] for point in points) for axis in range(3)]
+        expected = {(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])}
+        if len(points) != 8 or {tuple(point) for point in points} != expected or len(expected) != 8:
+            raise Unsupported("only axis aligned boxes can be recorded")
+        # Boxes are created with their base centered at the origin
+        translation = [(low[0] + high[0]) / 2, (low[1] + high[1]) / 2, low[2]]
+        size = {"width": high[0] - low[0], "length": high[1] - low[1], "height": high[2] - low[2]}
+        return self.create("BOX", size, translation)
+
+    def AddCylinder(self, base, height, radius, cap=True):
+        base = _point(base)
+        params = {"radius": _number(radius), "height": _vertical(base, height), "cap": bool(cap)}
+        return self.create("CYLINDER", params, base)
+
+    def AddCone(self, base, height, radius, cap=True):
+        base = _point(base)
+        params = {"radius": _number(radius), "height": _vertical(base, height), "cap": bool(cap)}
+        return self.create("CONE", params, base)
+
+    # Attributes and transformations
+
+    def ObjectColor(self, object_ids, color=None):
+        if color is None:
+            raise Unsupported("reading object colors cannot be recorded")
+        color = _color(color)
+        ids = self._ids(object_ids)
+        previous = None
+        for object_id in ids:
+            entry, created = self._entry(object_id)
+            previous = entry.get("color" if created else "new_color")
+            entry["color" if created else "new_color"] = color
+        return len(ids) if isinstance(object_ids, (list, tuple)) else (tuple(previous) if previous else (0, 0, 0))
+
+    def ObjectName(self, object_id, name=None):
+        ids = self._ids(object_id)
+        if name is None:
+            entries = [self._entry(i) for i in ids]
+            if not all(created for _, created in entries):
+                raise Unsupported("reading names of existing objects cannot be recorded")
+            names = [entry.get("name") for entry, _ in entries]
+            return names if isinstance(object_id, (list, tuple)) else names[0]
+        previous = None
+        for i in ids:
+            entry, created = self._entry(i)
+            previous = entry.get("name" if created else "new_name")
+            entry["name" if created else "new_name"] = str(name)
+        return len(ids) if isinstance(object_id, (list, tuple)) else previous
+
+    def MoveObjects(self, object_ids, translation):
+        vector = _point(translation)
+        ids = self._ids(object_ids)
+        for object_id in ids:
+            entry, _ = self._entry(object_id)
+            current = entry.get("translation", [0.0, 0.0, 0.0])
+            entry["translation"] = [a + b for a, b in zip(current, vector)]
+        return ids
+
+    def MoveObject(self, object_id, translation):
+        return self.MoveObjects([object_id], translation)[0]
+
+
+# The functions the stub can record, every other one ends the run
+MODELLED = frozenset(name for name in vars(Recorder) if name[0].isupper())
+
+
+def build_module(recorder, functions):
+    """A rhinoscriptsyntax module whose functions record or refuse"""
+    module = types.ModuleType("rhinoscriptsyntax")
+
+    def make(name, parameters):
+        signature = inspect.Signature([
+            inspect.Parameter(
+                parameter["name"],
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=None if "default" in parameter else inspect.Parameter.empty,
+            )
+            for parameter in parameters if "kind" not in parameter
+        ])
+
+        def function(*args, **kwargs):
+            recorder.calls += 1
+            if recorder.calls > MAX_CALLS:
+                raise Unsupported(f"more than {MAX_CALLS} calls")
+            if name not in MODELLED:
+                raise Unsupported(f"rs.{name} cannot be recorded")
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError as e:
+                raise Unsupported(f"rs.{name}: {e}")
+            return getattr(recorder, name)(*bound.args, **bound.kwargs)
+
+        function.__name__ = name
+        return function
+
+    for name, parameters in functions.items():
+        setattr(module, name, make(name, parameters))
+
+    def __getattr__(name):
+        raise Unsupported(f"rs.{name} cannot be recorded")
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def _py2_division(left, right):
+    """Division as in IronPython 2, where dividing two ints rounds down"""
+    if isinstance(left, int) and isinstance(right, int):
+        return left // right
+    return left / right
+
+
+def _py2_round(number, ndigits=0):
+    """round() as in IronPython 2: halves away from zero, and always a float"""
+    factor = 10.0 ** ndigits
+    return math.copysign(math.floor(abs(number) * factor + 0.5) / factor, number)
+
+
+class Python2Division(ast.NodeTransformer):
+    """Rewrites a / b and a /= b to _py2_division, so the script computes what it would in Rhino"""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Div):
+            return node
+        call = ast.Call(ast.Name("__py2_division__", ast.Load()), [node.left, node.right], [])
+        return ast.copy_location(call, node)
+
+    def visit_AugAssign(self, node):
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Div):
+            return node
+        if not isinstance(node.target, ast.Name):
+            raise Unsupported("/= on anything but a variable cannot be recorded")
+        call = ast.Call(
+            ast.Name("__py2_division__", ast.Load()), [ast.Name(node.target.id, ast.Load()), node.value], []
+        )
+        return ast.copy_location(ast.Assign([node.target], call), node)
+
+
+def run(code, functions):
+    recorder = Recorder()
+    module = build_module(recorder, functions)
+    real_import = builtins.__import__
+
+    def guarded_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if name in ("rhinoscriptsyntax", "rhinoscript"):
+            return module
+        if name.split(".")[0] not in ALLOWED_IMPORTS or level:
+            raise Unsupported(f"import of {name} cannot be recorded")
+        return real_import(name, globals, locals, fromlist, level)
+
+    safe_builtins = {key: value for key, value in vars(builtins).items() if key not in BLOCKED_BUILTINS}
+    safe_builtins["__import__"] = guarded_import
+    safe_builtins["__py2_division__"] = _py2_division
+    safe_builtins["round"] = _py2_round
+    output = io.StringIO()
+    result = {"supported": True}
+    try:
+        tree = ast.fix_missing_locations(Python2Division().visit(ast.parse(code)))
+        with contextlib.redirect_stdout(output):
+            exec(compile(tree, "<script>", "exec"), {"__builtins__": safe_builtins, "__name__": "__main__"})
+    except Unsupported as e:
+        result = {"supported": False, "reason": str(e)}
+    except BaseException as e:
+        # Errors are left to Rhino to report, in the context the script was written for
+        result = {"supported": False, "reason": f"script raised {type(e).__name__}: {e}"}
+    if result["supported"]:
+        result.update({
+            "output": output.getvalue(),
+            "creates": recorder.creates,
+            "placeholders": list(recorder.placeholders),
+            "modifies": list(recorder.modifies.values()),
+        })
+    return result
+
+
+def _limit_resources():
+    try:
+        import resource
+    except ImportError:
+        return
+    resource.setrlimit(resource.RLIMIT_CPU, (10, 10))
+    resource.setrlimit(resource.RLIMIT_AS, (1 << 30, 1 << 30))
+
+
+if __name__ == "__main__":
+    request = json.load(sys.stdin)
+    _limit_resources()
+    print(json.dumps(run(request["code"], request["functions"])))
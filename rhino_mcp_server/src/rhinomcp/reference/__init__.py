@@ -0,0 +1,44 @@
+"""RhinoScriptSyntax reference data, read from the prebuilt store on first use."""
+from functools import lru_cache
+from typing import Any, Dict, List
+import hashlib
+import pathlib
+
+from rhinomcp.reference.extract import DETAIL_FIELDS, DETAILS_SECTION
+from rhinomcp.reference.fuzzy import TRIGRAM_SECTION, suggest
+from rhinomcp.reference.store import ReferenceStore
+
+REFERENCE_PATH = pathlib.Path(__file__).parent.parent / "static" / "rhinoscriptsyntax.bin"
+
+
+@lru_cache(maxsize=None)
+def get_store() -> ReferenceStore:
+    """Return the memory-mapped reference store, opened on the first call"""
+    return ReferenceStore(REFERENCE_PATH)
+
+
+@lru_cache(maxsize=None)
+def reference_version() -> str:
+    """Hash of the reference store, changes whenever the reference is rebuilt with other content"""
+    return hashlib.sha256(REFERENCE_PATH.read_bytes()).hexdigest()[:16]
+
+
+def get_reference() -> List[Dict[str, Any]]:
+    """Return all rhinoscriptsyntax modules with their functions, decoded from the store"""
+    return get_store().to_json()
+
+
+def get_details(index: int) -> Dict[str, Any]:
+    """Parameters, See Also entries, Rhino calls and used functions of a record"""
+    details = get_store().json_section(DETAILS_SECTION)
+    return {field: details[field][index] for field in DETAIL_FIELDS}
+
+
+def suggest_functions(function_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Names and signatures of the functions whose name is closest to a name that was not found"""
+    store = get_store()
+    suggestions: List[Dict[str, Any]] = []
+    for index, score in suggest(store.json_section(TRIGRAM_SECTION), function_name, limit):
+        record = store.record(index)
+        suggestions.append({"name": record["Name"], "signature": record["Signature"], "score": round(score, 3)})
+    return suggestions
@@ -0,0 +1,116 @@
+"""
+Build the prebuilt reference artifact the server loads at runtime.
+
+The records are extracted from the rhinoscript sources in rhino_mcp_server/static.
+Extractions are cached per source file by content hash, so a rebuild only parses
+the files that changed. Run after changing the sources:
+
+    python -m rhinomcp.reference.build
+"""
+from typing import Any, Dict, List, Tuple
+import argparse
+import hashlib
+import json
+import pathlib
+
+from rhinomcp.reference import REFERENCE_PATH
+from rhinomcp.reference.extract import DETAIL_FIELDS, DETAILS_SECTION, EXTRACTOR_VERSION, extract_module
+from rhinomcp.reference.fuzzy import TRIGRAM_SECTION, build_trigram_index
+from rhinomcp.reference.graph import GRAPH_SECTION, build_see_also_graph
+from rhinomcp.reference.search import SEARCH_SECTION, build_search_index
+from rhinomcp.reference.store import RECORD_FIELDS, write_store
+
+PROJECT_PATH = pathlib.Path(__file__).parents[3]
+SOURCES_PATH = PROJECT_PATH / "static"
+CACHE_PATH = PROJECT_PATH / "build" / "reference_cache.json"
+
+
+def _load_cache(path: pathlib.Path) -> Dict[str, Any]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == EXTRACTOR_VERSION else {}
+
+
+def extract_sources(sources: pathlib.Path, cache_path: pathlib.Path) -> Tuple[List[Dict[str, Any]], List[str], str]:
+    """
+    Extract the modules from the source files, reusing cached extractions of unchanged files.
+    Returns the modules, the names of the files that were parsed, and a hash over all sources.
+    """
+    cache = _load_cache(cache_path)
+    cached_files = cache.get("files", {})
+    files: Dict[str, Any] = {}
+    parsed: List[str] = []
+    modules: List[Dict[str, Any]] = []
+    digest = hashlib.sha256(str(EXTRACTOR_VERSION).encode("ascii"))
+    for path in sorted(sources.glob("*.py")):
+        content = path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        digest.update(f"{path.name}:{sha256}".encode("utf-8"))
+        entry = cached_files.get(path.name)
+        if entry is None or entry["sha256"] != sha256:
+            entry = {"sha256": sha256, "functions": extract_module(content.decode("utf-8"), path.stem)}
+            parsed.append(path.name)
+        files[path.name] = entry
+        if entry["functions"]:
+            modules.append({"ModuleName": path.stem, "functions": entry["functions"]})
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"version": EXTRACTOR_VERSION, "files": files, "artifact": cache.get("artifact")}),
+        encoding="utf-8",
+    )
+    return modules, parsed, digest.hexdigest()
+
+
+def build_details(modules: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """The extracted fields beyond the fixed record fields, one list entry per record"""
+    functions = [function for module in modules for function in module["functions"]]
+    return {field: [function.get(field) for function in functions] for field in DETAIL_FIELDS}
+
+
+def write_reference(modules: List[Dict[str, Any]], path: pathlib.Path = REFERENCE_PATH):
+    """Write the records together with all indexes"""
+    records = [
+        {
+            "ModuleName": module["ModuleName"],
+            "functions": [
+                {key: function[key] for key in RECORD_FIELDS + ("Example",)} for function in module["functions"]
+            ],
+        }
+        for module in modules
+    ]
+    write_store(records, path, {
+        SEARCH_SECTION: build_search_index(modules),
+        TRIGRAM_SECTION: build_trigram_index(modules),
+        GRAPH_SECTION: build_see_also_graph(modules),
+        DETAILS_SECTION: build_details(modules),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the rhinoscriptsyntax reference")
+    parser.add_argument("--sources", type=pathlib.Path, default=SOURCES_PATH)
+    parser.add_argument("--cache", type=pathlib.Path, default=CACHE_PATH)
+    parser.add_argument("--output", type=pathlib.Path, default=REFERENCE_PATH)
+    parser.add_argument("--force", action="store_true", help="rebuild even if no source changed")
+    args = parser.parse_args()
+
+    if args.force and args.cache.exists():
+        args.cache.unlink()
+    modules, parsed, inputs = extract_sources(args.sources, args.cache)
+    cache = _load_cache(args.cache)
+    if not parsed and cache.get("artifact") == inputs and args.output.exists():
+        print(f"{args.output} is up to date")
+        return
+
+    write_reference(modules, args.output)
+    cache["artifact"] = inputs
+    args.cache.write_text(json.dumps(cache), encoding="utf-8")
+    count = sum(len(module["functions"]) for module in modules)
+    print(f"Parsed {len(parsed)} source files, wrote {count} functions of {len(modules)} modules to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
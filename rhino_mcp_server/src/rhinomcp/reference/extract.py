@@ -0,0 +1,366 @@
+"""
+Extraction of the rhinoscriptsyntax reference from the rhinoscript sources.
+
+Every public top level function of a source module becomes a record with its
+signature, the sections of its docstring, its parameters with their defaults,
+the functions named in "See Also", the Rhino / RhinoCommon calls it makes and
+the places where it writes to the document and the parameters it only does so with.
+"""
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import ast
+import re
+
+# Version of the extraction rules, cached extractions of another version are discarded
+EXTRACTOR_VERSION = 2
+
+# Section of the store holding the extracted fields that are not part of the fixed records
+DETAILS_SECTION = "details"
+DETAIL_FIELDS = ("Parameters", "SeeAlso", "Calls", "Uses", "Writes", "WriteGuards")
+
+# Roots of the calls that reach into Rhino, RhinoCommon or .NET
+HOST_ROOTS = ("Rhino", "scriptcontext", "System", "Eto")
+
+# Calls into the document or the application with one of these names change them
+_DOCUMENT_ROOTS = ("scriptcontext.doc.", "Rhino.RhinoApp.", "Rhino.RhinoDoc.")
+_WRITE_CALL = re.compile(
+    r"^(Add|Delete|Replace|Modify|Transform|Purge|Select|Unselect|Hide|Show|Lock|Unlock|Set|Adjust|Reset|Change|"
+    r"Enable|ForceLayerVisible|GripUpdate|RunScript|SendKeystrokes|Exit|Open|Save|Write|Import|Export|Clear)"
+)
+# Methods that change a document object or the document, whatever object they are called on
+_WRITE_METHODS = {
+    "CommitChanges", "SetUserString", "DeleteUserString", "SetPersistentVisibility", "SetPersistentLocking",
+    "Select", "Highlight", "ModifyAttributes", "AddToGroup", "RemoveFromGroup", "RemoveAllGroups",
+}
+# Calls returning objects of the document, assigning their attributes changes the document
+_DOCUMENT_OBJECT = re.compile(r"coercerhinoobject|getlayer|^scriptcontext\.doc\.", re.IGNORECASE)
+
+_SECTION = re.compile(r"^\s*(Parameters|Returns|Example|See Also):\s*$")
+
+
+def _dedent(lines: List[str]) -> List[str]:
+    """Remove the indentation common to all non blank lines"""
+    indents = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
+    indent = min(indents) if indents else 0
+    return [line[indent:] for line in lines]
+
+
+def split_docstring(lines: List[str]) -> Dict[str, List[str]]:
+    """Split the lines inside the quotes of a docstring into its description and sections"""
+    sections: Dict[str, List[str]] = {"Description": []}
+    current = "Description"
+    for line in lines:
+        match = _SECTION.match(line)
+        if match:
+            current = match.group(1)
+            sections[current] = []
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _section_text(lines: List[str]) -> str:
+    return "\r\n".join(_dedent(lines)).strip()
+
+
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _imports(tree: ast.Module) -> Dict[str, str]:
+    """Local names bound by the imports of a module, mapped to what they import"""
+    names: Dict[str, str] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    names[alias.asname] = alias.name
+                else:
+                    root = alias.name.split(".")[0]
+                    names[root] = root
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            for alias in node.names:
+                names[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    return names
+
+
+def _calls(node: ast.AST, imports: Dict[str, str]) -> Set[str]:
+    """Fully qualified names of the calls inside a node that go through an imported module"""
+    calls: Set[str] = set()
+    for child in ast.walk(node):
+        if not isinstance(child, ast.Call):
+            continue
+        name = _dotted_name(child.func)
+        if not name:
+            continue
+        root, _, rest = name.partition(".")
+        if root in imports:
+            calls.add(imports[root] + ("." + rest if rest else ""))
+    return calls
+
+
+def _uses(function: ast.FunctionDef, local: Dict[str, ast.FunctionDef], imports: Dict[str, str]) -> List[str]:
+    """Other rhinoscriptsyntax functions a function calls, from its own module or imported from another one"""
+    uses: Set[str] = set()
+    for child in ast.walk(function):
+        if not isinstance(child, ast.Call):
+            continue
+        name = _dotted_name(child.func)
+        if not name:
+            continue
+        if name in local:
+            uses.add(name)
+            continue
+        root, _, rest = name.partition(".")
+        target = imports.get(root, "") + ("." + rest if rest else "")
+        if target.startswith("rhinoscript"):
+            uses.add(target.rsplit(".", 1)[-1])
+    return sorted(name for name in uses if name[0].isupper() and name != function.name)
+
+
+def _document_variables(function: ast.FunctionDef) -> Set[str]:
+    """Local names holding objects of the document, or lists of them"""
+    variables: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign):
+                targets, value = node.targets, node.value
+            elif isinstance(node, (ast.For, ast.comprehension)):
+                targets, value = [node.target], node.iter
+            else:
+                continue
+            sources = any(
+                isinstance(child, ast.Call) and _DOCUMENT_OBJECT.search(_dotted_name(child.func) or "")
+                for child in ast.walk(value)
+            ) or any(isinstance(child, ast.Name) and child.id in variables for child in ast.walk(value))
+            if not sources:
+                continue
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name) and name.id not in variables:
+                        variables.add(name.id)
+                        changed = True
+    return variables
+
+
+def _writes(node: ast.AST, imports: Dict[str, str], variables: Set[str], helpers: Dict[str, Set[str]]) -> Set[str]:
+    """Where code changes the document: the document calls, methods and attribute assignments doing it"""
+    writes: Set[str] = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            if isinstance(child.func, ast.Attribute) and child.func.attr in _WRITE_METHODS:
+                writes.add(child.func.attr + "()")
+            name = _dotted_name(child.func) or ""
+            root, _, rest = name.partition(".")
+            if root in imports:
+                call = imports[root] + ("." + rest if rest else "")
+                if call.startswith(_DOCUMENT_ROOTS) and _WRITE_CALL.match(call.rsplit(".", 1)[-1]):
+                    writes.add(call)
+            writes |= helpers.get(name, set())
+        elif isinstance(child, (ast.Assign, ast.AugAssign)):
+            for target in child.targets if isinstance(child, ast.Assign) else [child.target]:
+                name = _dotted_name(target) if isinstance(target, ast.Attribute) else None
+                if name and (name.split(".")[0] in variables or ".Attributes." in name):
+                    writes.add(name + " =")
+    return writes
+
+
+# Defaults of optional parameters that are false, "if select:" only passes when the parameter is given
+_FALSY_DEFAULTS = ("None", "False", "0")
+
+
+def _is_none_test(test: ast.AST, optional: Dict[str, str], operators: Tuple[type, ...]) -> Optional[str]:
+    if (isinstance(test, ast.Compare) and isinstance(test.left, ast.Name) and len(test.ops) == 1
+            and isinstance(test.ops[0], operators) and optional.get(test.left.id) == "None"
+            and isinstance(test.comparators[0], ast.Constant) and test.comparators[0].value is None):
+        return test.left.id
+    return None
+
+
+def _given_when(test: ast.AST, optional: Dict[str, str]) -> Set[str]:
+    """Optional parameters of which one is given, not left at its default, whenever the test is true"""
+    if isinstance(test, ast.BoolOp) and isinstance(test.op, ast.And):
+        return set().union(*(_given_when(value, optional) for value in test.values))
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        return _given_unless(test.operand, optional)
+    if isinstance(test, ast.Name) and optional.get(test.id) in _FALSY_DEFAULTS:
+        return {test.id}
+    name = _is_none_test(test, optional, (ast.IsNot, ast.NotEq))
+    return {name} if name else set()
+
+
+def _given_unless(test: ast.AST, optional: Dict[str, str]) -> Set[str]:
+    """Optional parameters of which one is given whenever the test is false"""
+    if isinstance(test, ast.BoolOp) and isinstance(test.op, ast.Or):
+        return set().union(*(_given_unless(value, optional) for value in test.values))
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        return _given_when(test.operand, optional)
+    name = _is_none_test(test, optional, (ast.Is, ast.Eq))
+    return {name} if name else set()
+
+
+def _exits(statements: List[ast.stmt]) -> bool:
+    return bool(statements) and isinstance(statements[-1], (ast.Return, ast.Raise))
+
+
+def _write_guards(function: ast.FunctionDef, writes_in: Callable[[ast.AST], Set[str]]) -> List[str]:
+    """
+    Optional parameters of which one has to be given for the function to change the document, like color in
+    ObjectColor(object_ids, color=None). Empty when it can change the document with its defaults.
+    """
+    positional = function.args.posonlyargs + function.args.args
+    defaults = [arg.arg for arg in positional[len(positional) - len(function.args.defaults):]]
+    optional = {name: ast.unparse(default) for name, default in zip(defaults, function.args.defaults)}
+    guards: Set[str] = set()
+    unguarded = False
+
+    def check(node: ast.AST, guard: Set[str]):
+        nonlocal unguarded
+        if writes_in(node):
+            if guard:
+                guards.update(guard)
+            else:
+                unguarded = True
+
+    def visit(statements: List[ast.stmt], guard: Set[str]):
+        for statement in statements:
+            if isinstance(statement, ast.If):
+                check(statement.test, guard)
+                when, unless = _given_when(statement.test, optional), _given_unless(statement.test, optional)
+                visit(statement.body, guard | when)
+                visit(statement.orelse, guard | unless)
+                # "if color is None: return current" leaves the rest for when color is given
+                if _exits(statement.body):
+                    guard = guard | unless
+                elif _exits(statement.orelse):
+                    guard = guard | when
+            elif isinstance(statement, (ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try)):
+                for child in ast.iter_child_nodes(statement):
+                    if isinstance(child, ast.stmt):
+                        visit([child], guard)
+                    elif isinstance(child, ast.excepthandler):
+                        visit(child.body, guard)
+                    else:
+                        check(child, guard)
+            else:
+                check(statement, guard)
+
+    visit(function.body, set())
+    return [] if unguarded else sorted(guards)
+
+
+def _segment(lines: List[str], node: ast.AST) -> str:
+    """Source text of a node, ast.get_source_segment splits the whole source on every call"""
+    if node.lineno == node.end_lineno:
+        return lines[node.lineno - 1][node.col_offset:node.end_col_offset]
+    text = [lines[node.lineno - 1][node.col_offset:]]
+    text.extend(lines[node.lineno:node.end_lineno - 1])
+    text.append(lines[node.end_lineno - 1][:node.end_col_offset])
+    return "\n".join(text)
+
+
+def _parameters(arguments: ast.arguments, lines: List[str]) -> List[Dict[str, Any]]:
+    parameters: List[Dict[str, Any]] = []
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+    for argument, default in zip(positional, defaults):
+        parameter: Dict[str, Any] = {"name": argument.arg}
+        if default is not None:
+            parameter["default"] = _segment(lines, default)
+        parameters.append(parameter)
+    if arguments.vararg:
+        parameters.append({"name": arguments.vararg.arg, "kind": "varargs"})
+    for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parameter = {"name": argument.arg, "kind": "keyword"}
+        if default is not None:
+            parameter["default"] = _segment(lines, default)
+        parameters.append(parameter)
+    if arguments.kwarg:
+        parameters.append({"name": arguments.kwarg.arg, "kind": "kwargs"})
+    return parameters
+
+
+def _signature(function: ast.FunctionDef, lines: List[str]) -> str:
+    """The def line as written in the source, without "def" and the colon"""
+    header = " ".join(line.strip() for line in lines[function.lineno - 1:function.body[0].lineno - 1])
+    header = header[header.index(function.name):]
+    return header[:header.rindex(")") + 1]
+
+
+def extract_module(source: str, module_name: str) -> List[Dict[str, Any]]:
+    """Records of the public top level functions of a rhinoscript source module, in source order"""
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    imports = _imports(tree)
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef)]
+    local = {function.name: function for function in functions}
+
+    # Private helpers are inlined into the calls and writes of the functions using them
+    helper_calls: Dict[str, Set[str]] = {}
+    helper_writes: Dict[str, Set[str]] = {}
+
+    def calls_of(function: ast.FunctionDef, seen: Set[str]) -> Set[str]:
+        calls = _calls(function, imports)
+        for name in helpers_of(function, seen):
+            if name not in helper_calls:
+                helper_calls[name] = calls_of(local[name], seen | {name})
+            calls |= helper_calls[name]
+        return calls
+
+    def writes_in(function: ast.FunctionDef, seen: Set[str]) -> Callable[[ast.AST], Set[str]]:
+        """Writes of a part of a function, calls of helpers count with the writes of the helper"""
+        for name in helpers_of(function, seen):
+            if name not in helper_writes:
+                helper_writes[name] = writes_in(local[name], seen | {name})(local[name])
+        variables = _document_variables(function)
+        return lambda node: _writes(node, imports, variables, helper_writes)
+
+    def helpers_of(function: ast.FunctionDef, seen: Set[str]) -> Set[str]:
+        return {
+            child.func.id for child in ast.walk(function)
+            if isinstance(child, ast.Call) and isinstance(child.func, ast.Name)
+            and child.func.id.startswith("_") and child.func.id in local and child.func.id not in seen
+        }
+
+    records = []
+    for function in functions:
+        if not function.name[0].isupper() or ast.get_docstring(function) is None:
+            continue
+        # Sections are taken from the source text so escapes in examples stay as written
+        node = function.body[0]
+        raw = lines[node.lineno - 1:node.end_lineno]
+        inner = "\n".join(raw).strip()[3:-3].splitlines()
+        sections = split_docstring(inner)
+
+        description = "\r\n".join(sections["Description"]).strip()
+        examples = _dedent(sections.get("Example", []))
+        while examples and not examples[-1].strip():
+            examples.pop()
+        all_calls = calls_of(function, {function.name})
+        writes = writes_in(function, {function.name})
+
+        records.append({
+            "ModuleName": module_name,
+            "Name": function.name,
+            "Signature": _signature(function, lines),
+            "Description": description,
+            "ArgumentDesc": _section_text(sections.get("Parameters", [])),
+            "Returns": _section_text(sections.get("Returns", [])),
+            "Example": examples,
+            "DocString": "\r\n".join(raw),
+            "Parameters": _parameters(function.args, lines),
+            "SeeAlso": [line.strip() for line in sections.get("See Also", []) if line.strip()],
+            "Calls": sorted(call for call in all_calls if call.split(".")[0] in HOST_ROOTS),
+            "Uses": _uses(function, local, imports),
+            "Writes": sorted(writes(function)),
+            "WriteGuards": _write_guards(function, writes),
+        })
+    return records
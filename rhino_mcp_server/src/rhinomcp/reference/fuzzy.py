@@ -0,0 +1,41 @@
+"""Trigram matching of misspelled function names against the rhinoscriptsyntax reference."""
+from typing import Any, Dict, List, Set
+import heapq
+
+# Section of the reference store holding the trigram index
+TRIGRAM_SECTION = "trigrams"
+
+
+def trigrams(name: str) -> Set[str]:
+    """Trigrams of a lower cased name, padded so the start and end of the name weigh more"""
+    padded = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_trigram_index(modules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Record numbers by trigram, and the trigram count of every record"""
+    postings: Dict[str, List[int]] = {}
+    counts: List[int] = []
+    for module in modules:
+        for function in module["functions"]:
+            grams = trigrams(function["Name"])
+            for gram in grams:
+                postings.setdefault(gram, []).append(len(counts))
+            counts.append(len(grams))
+    return {"counts": counts, "postings": postings}
+
+
+def suggest(index: Dict[str, Any], name: str, limit: int = 5, min_score: float = 0.3) -> List[tuple[int, float]]:
+    """Record numbers of the names most similar to name by Dice coefficient, best first"""
+    grams = trigrams(name)
+    shared: Dict[int, int] = {}
+    for gram in grams:
+        for record in index["postings"].get(gram, ()):
+            shared[record] = shared.get(record, 0) + 1
+    counts = index["counts"]
+    scored = ((record, 2 * common / (len(grams) + counts[record])) for record, common in shared.items())
+    return heapq.nsmallest(
+        limit,
+        (item for item in scored if item[1] >= min_score),
+        key=lambda item: (-item[1], item[0]),
+    )
@@ -0,0 +1,65 @@
+"""Graph of the "See Also" cross references between rhinoscriptsyntax functions."""
+from typing import Any, Dict, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Section of the reference store holding the graph
+GRAPH_SECTION = "seealso"
+
+
+def parse_see_also(docstring: str) -> List[str]:
+    """Function names listed in the "See Also" section of a docstring"""
+    start = docstring.find("See Also:")
+    if start < 0:
+        return []
+    names = []
+    for line in docstring[start + len("See Also:"):].splitlines():
+        line = line.strip().strip('"').strip()
+        if line:
+            names.append(line)
+    return names
+
+
+def build_see_also_graph(modules: List[Dict[str, Any]]) -> Dict[str, List[List[int]]]:
+    """Record numbers each record refers to, and the record numbers referring to it"""
+    functions = [function for module in modules for function in module["functions"]]
+    numbers = {function["Name"]: i for i, function in enumerate(functions)}
+    see_also: List[List[int]] = [[] for _ in functions]
+    cited_by: List[List[int]] = [[] for _ in functions]
+    for i, function in enumerate(functions):
+        names = function.get("SeeAlso")
+        if names is None:
+            names = parse_see_also(function.get("DocString") or "")
+        for name in names:
+            target = numbers.get(name)
+            if target is None:
+                logger.warning(f"{function['Name']} refers to unknown function {name}")
+                continue
+            if target != i and target not in see_also[i]:
+                see_also[i].append(target)
+                cited_by[target].append(i)
+    return {"see_also": see_also, "cited_by": cited_by}
+
+
+def neighborhood(graph: Dict[str, List[List[int]]], record: int, depth: int = 1, limit: int = 30) -> List[tuple[int, int]]:
+    """
+    Record numbers within depth hops of a record, with their distance, nearest first.
+    A function's own "See Also" entries come before the functions that refer to it.
+    """
+    seen = {record}
+    frontier = [record]
+    found: List[tuple[int, int]] = []
+    for distance in range(1, depth + 1):
+        next_frontier = []
+        for current in frontier:
+            for neighbor in graph["see_also"][current] + graph["cited_by"][current]:
+                if neighbor in seen:
+                    continue
+                seen.add(neighbor)
+                next_frontier.append(neighbor)
+                found.append((neighbor, distance))
+                if len(found) >= limit:
+                    return found
+        frontier = next_frontier
+    return found
@@ -0,0 +1,88 @@
+"""BM25 full-text search over the rhinoscriptsyntax reference, with the inverted index built ahead of time."""
+from typing import Any, Dict, List
+import heapq
+import math
+import re
+
+# Section of the reference store holding the inverted index
+SEARCH_SECTION = "search"
+
+# How much a term counts depending on the field it appears in
+FIELD_WEIGHTS = {"Name": 3.0, "Description": 2.0, "ArgumentDesc": 1.0, "Returns": 1.0}
+
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with",
+}
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|$)|[A-Z]?[a-z]+|\d+")
+
+
+def _normalize(word: str) -> str:
+    word = word.lower()
+    # Plurals match their singular, "points" finds AddPoint
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower case terms of a text, camel case words also yield their parts"""
+    tokens: List[str] = []
+    for word in _WORD.findall(text):
+        parts = _CAMEL_PART.findall(word)
+        for term in [word] + (parts if len(parts) > 1 else []):
+            term = _normalize(term)
+            if term not in STOPWORDS:
+                tokens.append(term)
+    return tokens
+
+
+def build_search_index(modules: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the inverted index, documents are numbered like the records of the store.
+    Postings hold weighted term frequencies, the idf of every term and the length normalization of every
+    document are computed here so queries only sum.
+    """
+    postings: Dict[str, Dict[int, float]] = {}
+    lengths: List[float] = []
+    document = 0
+    for module in modules:
+        for function in module["functions"]:
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                for term in tokenize(function.get(field) or ""):
+                    frequencies = postings.setdefault(term, {})
+                    frequencies[document] = frequencies.get(document, 0.0) + weight
+                    length += weight
+            lengths.append(length)
+            document += 1
+
+    count = len(lengths)
+    average_length = (sum(lengths) / count if count else 0.0) or 1.0
+    terms = {}
+    for term, frequencies in postings.items():
+        idf = math.log(1 + (count - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+        terms[term] = [round(idf, 6), [[doc, int(tf) if tf.is_integer() else tf] for doc, tf in sorted(frequencies.items())]]
+    return {
+        "norms": [round(K1 * (1 - B + B * length / average_length), 6) for length in lengths],
+        "terms": terms,
+    }
+
+
+def search(index: Dict[str, Any], query: str, top_k: int = 10) -> List[tuple[int, float]]:
+    """Record numbers and scores of the best matching functions, best first"""
+    norms = index["norms"]
+    scores: Dict[int, float] = {}
+    for term in set(tokenize(query)):
+        entry = index["terms"].get(term)
+        if entry is None:
+            continue
+        idf, postings = entry
+        for document, tf in postings:
+            scores[document] = scores.get(document, 0.0) + idf * tf * (K1 + 1) / (tf + norms[document])
+    return heapq.nsmallest(max(0, top_k), scores.items(), key=lambda item: (-item[1], item[0]))
@@ -0,0 +1,193 @@
+"""
+Compact on-disk storage of the rhinoscriptsyntax reference.
+
+The file is memory-mapped and records are decoded one at a time when they are
+asked for, so a server process only keeps the functions it actually used.
+
+Layout (little endian):
+    header      magic "RSXR", u16 version, u16 section count
+    sections    per section: 8 byte name, u32 offset, u32 length
+    "strings"   u32 count, u32 offsets[count + 1], utf-8 blob, every string stored once
+    "records"   u32 count, per record u32 string indices of RECORD_FIELDS, u32 first example, u32 example count
+    "examples"  u32 count, u32 string indices of the example lines of all records
+    "modules"   u32 count, per module u32 name string index, u32 first record, u32 record count
+    "index"     JSON: record number by name and by lower case name, function names by module
+    other       JSON encoded indexes
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import mmap
+import pathlib
+import struct
+
+MAGIC = b"RSXR"
+VERSION = 2
+
+# String fields of a record, in the order they are stored. The docstring is not stored whole,
+# its sections are and it would double the size of the strings
+RECORD_FIELDS = ("Name", "ModuleName", "Signature", "Description", "ArgumentDesc", "Returns")
+
+_HEADER = struct.Struct("<4sHH")
+_SECTION = struct.Struct("<8sII")
+_U32 = struct.Struct("<I")
+_RECORD = struct.Struct("<%dI" % (len(RECORD_FIELDS) + 2))
+_MODULE = struct.Struct("<3I")
+
+
+class StoreError(Exception):
+    """Raised when a reference file is missing, corrupt or of another version"""
+    pass
+
+
+def _pack_table(item: struct.Struct, rows: List[Tuple[int, ...]]) -> bytes:
+    return _U32.pack(len(rows)) + b"".join(item.pack(*row) for row in rows)
+
+
+def write_store(modules: List[Dict[str, Any]], path: pathlib.Path, indexes: Optional[Dict[str, Any]] = None):
+    """Write the modules and their functions, plus optional JSON indexes keyed by section name"""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    records: List[Tuple[int, ...]] = []
+    examples: List[Tuple[int]] = []
+    module_rows: List[Tuple[int, ...]] = []
+    index: Dict[str, Dict[str, Any]] = {"names": {}, "lower": {}, "modules": {}}
+    for module in modules:
+        module_rows.append((intern(module["ModuleName"]), len(records), len(module["functions"])))
+        # Keyed in lower case, categories are looked up case-insensitively
+        index["modules"][module["ModuleName"].lower()] = [function["Name"] for function in module["functions"]]
+        for function in module["functions"]:
+            index["names"][function["Name"]] = len(records)
+            index["lower"].setdefault(function["Name"].lower(), len(records))
+            example = function.get("Example") or []
+            records.append(
+                tuple(intern(function.get(key) or "") for key in RECORD_FIELDS)
+                + (len(examples), len(example))
+            )
+            examples.extend((intern(line),) for line in example)
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    string_section = _U32.pack(len(encoded)) + struct.pack("<%dI" % len(offsets), *offsets) + b"".join(encoded)
+
+    sections = {
+        "strings": string_section,
+        "records": _pack_table(_RECORD, records),
+        "examples": _pack_table(_U32, examples),
+        "modules": _pack_table(_MODULE, module_rows),
+    }
+    for name, value in {"index": index, **(indexes or {})}.items():
+        if len(name.encode("ascii")) > 8:
+            raise StoreError(f"Section name {name} is longer than 8 characters")
+        sections[name] = json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for name, data in sections.items():
+        table.append(_SECTION.pack(name.encode("ascii"), offset, len(data)))
+        offset += len(data)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(sections)))
+        f.write(b"".join(table))
+        for data in sections.values():
+            f.write(data)
+
+
+class ReferenceStore:
+    """Read access to a reference file written by write_store"""
+
+    def __init__(self, path: pathlib.Path):
+        try:
+            with open(path, "rb") as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise StoreError(f"Cannot open reference {path}: {str(e)}")
+        magic, version, count = _HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise StoreError(f"{path} is not a version {VERSION} reference file")
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self._data, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        self._strings = self._sections["strings"][0]
+        self._string_count = _U32.unpack_from(self._data, self._strings)[0]
+        self._records = self._sections["records"][0]
+        self.record_count = _U32.unpack_from(self._data, self._records)[0]
+        self._examples = self._sections["examples"][0]
+        self._modules = self._sections["modules"][0]
+        self._module_count = _U32.unpack_from(self._data, self._modules)[0]
+        # JSON sections, decoded on their first use
+        self._decoded: Dict[str, Any] = {}
+
+    def string(self, index: int) -> str:
+        table = self._strings + _U32.size
+        start, end = struct.unpack_from("<2I", self._data, table + index * _U32.size)
+        blob = table + (self._string_count + 1) * _U32.size
+        return self._data[blob + start:blob + end].decode("utf-8")
+
+    def _record_row(self, index: int) -> Tuple[int, ...]:
+        if not 0 <= index < self.record_count:
+            raise IndexError(index)
+        return _RECORD.unpack_from(self._data, self._records + _U32.size + index * _RECORD.size)
+
+    def name(self, index: int) -> str:
+        return self.string(self._record_row(index)[0])
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Decode one function record"""
+        row = self._record_row(index)
+        record: Dict[str, Any] = {key: self.string(string_id) for key, string_id in zip(RECORD_FIELDS, row)}
+        first, count = row[len(RECORD_FIELDS):]
+        base = self._examples + _U32.size
+        record["Example"] = [
+            self.string(_U32.unpack_from(self._data, base + (first + i) * _U32.size)[0])
+            for i in range(count)
+        ]
+        return record
+
+    def modules(self) -> Iterator[Tuple[str, range]]:
+        """Module names with the range of their record numbers"""
+        for i in range(self._module_count):
+            name, first, count = _MODULE.unpack_from(self._data, self._modules + _U32.size + i * _MODULE.size)
+            yield self.string(name), range(first, first + count)
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        return self.json_section("index")
+
+    def find(self, name: str) -> Optional[int]:
+        """Record number of the function with this name, falling back to a case-insensitive match"""
+        index = self.index["names"].get(name)
+        if index is None:
+            index = self.index["lower"].get(name.lower())
+        return index
+
+    def function_names(self, module: str) -> List[str]:
+        """Names of the functions of a module, in any case, empty for unknown modules"""
+        return self.index["modules"].get(module.strip().lower(), [])
+
+    def has_section(self, name: str) -> bool:
+        return name in self._sections
+
+    def json_section(self, name: str) -> Any:
+        """Decode a JSON index section, once"""
+        if name not in self._decoded:
+            offset, length = self._sections[name]
+            self._decoded[name] = json.loads(self._data[offset:offset + length].decode("utf-8"))
+        return self._decoded[name]
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        """All modules with all their functions, in the layout of the original reference"""
+        return [
+            {"ModuleName": module, "functions": [self.record(i) for i in records]}
+            for module, records in self.modules()
+        ]
@@ -0,0 +1,63 @@
+from mcp import types
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.subscriptions import DOCUMENT_URI, LAYERS_URI, OBJECT_URI, SELECTION_URI
+from typing import Any, Dict
+import json
+
+
+def _dump(result: Dict[str, Any]) -> str:
+    rhino = get_rhino_connection(None)
+    return json.dumps({**result, "document_version": rhino.document_version})
+
+
+@mcp.resource(DOCUMENT_URI, name="Document", description="Summary of the Rhino document: metadata, object and layer counts and the first objects and layers. Subscribe to be notified when it changes.", mime_type="application/json")
+async def get_document() -> str:
+    """Return the summary of the document, the same as get_document_info"""
+    return _dump(await get_rhino_connection(None).send_read_command("get_document_info"))
+
+
+@mcp.resource(LAYERS_URI, name="Layers", description="All layers of the Rhino document with their color, visibility, lock state and which one is current. Subscribe to be notified when they change.", mime_type="application/json")
+async def get_layers() -> str:
+    """Return all layers of the document"""
+    return _dump(await get_rhino_connection(None).send_read_command("get_layers"))
+
+
+@mcp.resource(SELECTION_URI, name="Selection", description="The selected objects of the Rhino document. Subscribe to be notified when the selection changes.", mime_type="application/json")
+async def get_selection() -> str:
+    """Return the selected objects, the same as get_selected_objects_info"""
+    return _dump(await get_rhino_connection(None).send_read_command("get_selected_objects_info", {"include_attributes": False}))
+
+
+@mcp.resource(OBJECT_URI, name="Object", description="An object of the Rhino document by id. Subscribe to be notified when it is modified or deleted.", mime_type="application/json")
+async def get_object(id: str) -> str:
+    """Return an object of the document, the same as get_object_info"""
+    return _dump(await get_rhino_connection(None).send_read_command("get_object_info", {"id": id, "name": None}))
+
+
+# FastMCP has no decorators for subscriptions, they are registered on the low level server
+server = mcp._mcp_server
+
+
+@server.subscribe_resource()
+async def subscribe(uri) -> None:
+    get_rhino_connection(None).subscriptions.subscribe(str(uri), server.request_context.session)
+    logger.info(f"Subscribed to {uri}")
+
+
+@server.unsubscribe_resource()
+async def unsubscribe(uri) -> None:
+    get_rhino_connection(None).subscriptions.unsubscribe(str(uri), server.request_context.session)
+
+
+_get_capabilities = server.get_capabilities
+
+
+def _get_capabilities_with_subscribe(*args, **kwargs) -> types.ServerCapabilities:
+    # The low level server always announces resources without subscriptions
+    capabilities = _get_capabilities(*args, **kwargs)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+
+server.get_capabilities = _get_capabilities_with_subscribe
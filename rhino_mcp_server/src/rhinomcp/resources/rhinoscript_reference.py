@@ -0,0 +1,63 @@
+from rhinomcp.server import mcp
+from rhinomcp.reference import get_store, reference_version, suggest_functions
+from typing import Any, Dict
+import hashlib
+import json
+
+FUNCTION_URI = "rhinoscript://function/{name}"
+MODULE_URI = "rhinoscript://module/{name}"
+MODULES_URI = "rhinoscript://modules"
+
+
+def etag(value: Any) -> str:
+    """Hash of the content of a resource, the same as long as the content is the same"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _function(index: int) -> Dict[str, Any]:
+    record = get_store().record(index)
+    return {**record, "uri": FUNCTION_URI.format(name=record["Name"]), "etag": etag(record)}
+
+
+@mcp.resource(MODULES_URI, name="RhinoScriptsyntax modules", description="The rhinoscriptsyntax modules with the number of functions and the etag of each", mime_type="application/json")
+def get_rhinoscript_modules() -> str:
+    """Return the modules of the rhinoscriptsyntax reference, with the version of the reference"""
+    store = get_store()
+    modules = []
+    for module, records in store.modules():
+        modules.append({
+            "name": module,
+            "uri": MODULE_URI.format(name=module),
+            "functions": len(records),
+            "etag": etag([_function(index)["etag"] for index in records]),
+        })
+    return json.dumps({"reference_version": reference_version(), "modules": modules})
+
+
+@mcp.resource(MODULE_URI, name="RhinoScriptsyntax module", description="Names, signatures and etags of the functions of a rhinoscriptsyntax module", mime_type="application/json")
+def get_rhinoscript_module(name: str) -> str:
+    """Return the functions of a module, a client only has to read the functions whose etag it has not cached"""
+    store = get_store()
+    records = dict(store.modules()).get(name)
+    if records is None:
+        raise ValueError(f"Unknown module: {name}")
+    functions = []
+    for index in records:
+        function = _function(index)
+        functions.append({key: function[key] for key in ("Name", "Signature", "Description", "uri", "etag")})
+    return json.dumps({
+        "name": name,
+        "reference_version": reference_version(),
+        "etag": etag([function["etag"] for function in functions]),
+        "functions": functions,
+    })
+
+
+@mcp.resource(FUNCTION_URI, name="RhinoScriptsyntax function", description="Signature, description, parameters and examples of a rhinoscriptsyntax function", mime_type="application/json")
+def get_rhinoscript_function(name: str) -> str:
+    """Return the details of a function, the same as get_rhinoscript_python_code_guide with an etag"""
+    index = get_store().find(name)
+    if index is None:
+        suggestions = ", ".join(suggestion["name"] for suggestion in suggest_functions(name))
+        raise ValueError(f"Unknown function: {name}. Similar functions: {suggestions}")
+    return json.dumps({**_function(index), "reference_version": reference_version()})
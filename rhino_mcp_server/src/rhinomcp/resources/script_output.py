@@ -0,0 +1,12 @@
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.output import OUTPUT_URI
+
+
+@mcp.resource(OUTPUT_URI, name="Script output", description="Full print output of a rhinoscript execution that was too long to return")
+def get_script_output(output_id: str) -> str:
+    """Return the full print output of a rhinoscript execution"""
+    rhino = get_rhino_connection(None)
+    text = rhino.script_outputs.get(output_id)
+    if text is None:
+        raise ValueError(f"Output {output_id} is not available anymore")
+    return text
@@ -0,0 +1,11 @@
+from rhinomcp.server import mcp
+from rhinomcp.tool_docs import TOOL_URI, full_description
+
+
+@mcp.resource(TOOL_URI, name="Tool documentation", description="Full documentation of a tool, with all parameters and examples", mime_type="text/plain")
+def get_tool_description(name: str) -> str:
+    """Return the full documentation of a tool"""
+    description = full_description(mcp, name)
+    if description is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return description
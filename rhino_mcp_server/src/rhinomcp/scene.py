@@ -0,0 +1,139 @@
+"""Diffing of a desired scene against the objects a previous apply_scene left in the document."""
+from typing import Any, Dict, List
+import hashlib
+import json
+
+# User strings stored on every object managed by apply_scene
+SCENE_KEY = "rhinomcp_scene"
+HASH_KEY = "rhinomcp_hash"
+SHAPE_HASH_KEY = "rhinomcp_shape_hash"
+TRANSLATION_KEY = "rhinomcp_translation"
+COLOR_KEY = "rhinomcp_color"
+
+# Fields of create_object that define the geometry apart from its position
+SHAPE_FIELDS = ("type", "params", "rotation", "scale")
+SCENE_FIELDS = SHAPE_FIELDS + ("name", "color", "translation")
+
+
+def _canonical(value: Any) -> Any:
+    """Normalize numbers so that 1 and 1.0 hash the same"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return str(value)
+
+
+def content_hash(spec: Dict[str, Any], fields=SCENE_FIELDS) -> str:
+    """Hash of the given fields of an object specification"""
+    content = {key: _canonical(spec.get(key)) for key in fields}
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _create_params(spec: Dict[str, Any], scene: str) -> Dict[str, Any]:
+    """Build create_object parameters that also tag the object with its hashes"""
+    params: Dict[str, Any] = {
+        "type": spec.get("type", "BOX"),
+        "name": spec["name"],
+        "params": spec.get("params") or {},
+    }
+    for key in ("color", "translation", "rotation", "scale"):
+        if spec.get(key) is not None:
+            params[key] = spec[key]
+    params["attributes"] = _scene_attributes(spec, scene)
+    return params
+
+
+def _scene_attributes(spec: Dict[str, Any], scene: str) -> Dict[str, str]:
+    return {
+        SCENE_KEY: scene,
+        HASH_KEY: content_hash(spec),
+        SHAPE_HASH_KEY: content_hash(spec, SHAPE_FIELDS),
+        TRANSLATION_KEY: json.dumps(spec.get("translation") or [0, 0, 0]),
+        COLOR_KEY: json.dumps(spec.get("color")),
+    }
+
+
+def plan_scene(desired: List[Dict[str, Any]], current: List[Dict[str, Any]], scene: str) -> Dict[str, Any]:
+    """
+    Compute the commands that turn the current scene objects into the desired ones.
+
+    desired: object specifications as accepted by create_object, keyed by their unique name
+    current: objects from the get_scene_objects command, with id, name and the stored user strings
+
+    Returns a dictionary with the create_object params to create, the modify_objects entries
+    to apply, the ids to delete and the number of recreated and unchanged objects.
+    """
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for spec in desired:
+        if not spec.get("name"):
+            raise ValueError("Every scene object needs a name")
+        if spec["name"] in by_name:
+            raise ValueError(f"Duplicate scene object name: {spec['name']}")
+        by_name[spec["name"]] = spec
+
+    creates: List[Dict[str, Any]] = []
+    modifies: List[Dict[str, Any]] = []
+    deletes: List[str] = []
+    recreated = 0
+    unchanged = 0
+    seen = set()
+
+    for obj in current:
+        name = obj.get("name")
+        spec = by_name.get(name)
+        attributes = obj.get("attributes") or {}
+
+        # Objects no longer in the scene, and duplicates left behind by hand edits
+        if spec is None or name in seen:
+            deletes.append(obj["id"])
+            continue
+        seen.add(name)
+
+        if attributes.get(HASH_KEY) == content_hash(spec):
+            unchanged += 1
+            continue
+
+        # Objects of scenes applied before the color was stored have an unknown color
+        color = spec.get("color")
+        color_known = COLOR_KEY in attributes
+        old_color = json.loads(attributes[COLOR_KEY]) if color_known else None
+        # A modify can set a color, but cannot give the object the color of its layer back
+        recolorable = color is not None or (color_known and old_color is None)
+
+        # Same shape, so the object can be moved and recolored in place
+        same_shape = attributes.get(SHAPE_HASH_KEY) == content_hash(spec, SHAPE_FIELDS)
+        if same_shape and recolorable:
+            modify: Dict[str, Any] = {
+                "id": obj["id"],
+                "attributes": _scene_attributes(spec, scene),
+            }
+            if color is not None and (not color_known or _canonical(color) != _canonical(old_color)):
+                modify["new_color"] = color
+            old_translation = json.loads(attributes.get(TRANSLATION_KEY) or "[0, 0, 0]")
+            new_translation = spec.get("translation") or [0, 0, 0]
+            delta = [new - old for new, old in zip(new_translation, old_translation)]
+            if any(delta):
+                modify["translation"] = delta
+            modifies.append(modify)
+        else:
+            deletes.append(obj["id"])
+            creates.append(_create_params(spec, scene))
+            recreated += 1
+
+    for name, spec in by_name.items():
+        if name not in seen:
+            creates.append(_create_params(spec, scene))
+
+    return {
+        "creates": creates,
+        "modifies": modifies,
+        "deletes": deletes,
+        "recreated": recreated,
+        "unchanged": unchanged,
+    }
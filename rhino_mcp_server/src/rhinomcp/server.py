@@ -4,14 +4,25 @@ import socket
 import json
 import asyncio
 import uuid
+import codecs
+import copy
 import logging, os, pathlib, tempfile
 from logging import FileHandler, Filter
 from datetime import datetime
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Set
 import time
 
+from rhinomcp.planner import plan_operations
+from rhinomcp.jobs import JobManager
+from rhinomcp.output import OutputStore
+from rhinomcp.templates import TemplateStore
+from rhinomcp.cache import ResultCache
+from rhinomcp.subscriptions import ResourceSubscriptions
+from rhinomcp.journal import ChangeJournal
+from rhinomcp.tool_docs import COMPACT_TOOLS, compact_tool_descriptions
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
@@ -45,6 +56,48 @@ logger.info(f"Wire log file: {log_path}")
 # Global connection instance
 _global_rhino_connection: "RhinoConnection" = None
 
+# Queue creates, modifies and deletes and send them folded before the next read
+WRITE_BEHIND = os.environ.get("RHINOMCP_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+
+# Characters of script print output returned in a tool result, the rest is kept as a resource
+MAX_SCRIPT_OUTPUT = int(os.environ.get("RHINOMCP_MAX_SCRIPT_OUTPUT", "20000"))
+
+
+# Seconds a result of a read tool is reused at most, for changes of the document Rhino sends no event for
+READ_CACHE_TTL = float(os.environ.get("RHINOMCP_READ_CACHE_TTL", "30"))
+
+# Commands that do not change the document, all others advance the document version
+READ_ONLY_COMMANDS = {
+    "get_document_info", "get_object_info", "get_selected_objects_info", "get_scene_objects",
+    "close_script_session", "cancel_request", "get_layers",
+}
+
+
+class RhinoCommandError(Exception):
+    """Raised when Rhino received a command but reported an error executing it"""
+
+    def __init__(self, message: str, cancelled: bool = False):
+        super().__init__(message)
+        # Rhino stopped the command because it was cancelled, rather than because it failed
+        self.cancelled = cancelled
+
+def split_messages(buffer: str) -> tuple[List[Dict[str, Any]], str]:
+    """Split a buffer of concatenated JSON objects into the complete ones and the incomplete rest"""
+    decoder = json.JSONDecoder()
+    messages = []
+    position = 0
+    while True:
+        # Skip whitespace and anything that cannot start a message
+        start = buffer.find("{", position)
+        if start < 0:
+            return messages, ""
+        try:
+            message, position = decoder.raw_decode(buffer, start)
+        except json.JSONDecodeError:
+            return messages, buffer[start:]
+        messages.append(message)
+
+
 @dataclass
 class RhinoConnection:
     host: str
@@ -55,6 +108,33 @@ class RhinoConnection:
     # Command execution context tracking
     active_command_context: Dict[str, Any] = field(default_factory=dict)
     command_timeout: float = 5.0  # seconds to associate events with commands
+    # Write-behind queue of document edits
+    write_behind: bool = False
+    write_queue: List[Dict[str, Any]] = field(default_factory=list)
+    flush_delay: float = 1.0  # seconds of inactivity before queued edits are sent anyway
+    flush_errors: List[str] = field(default_factory=list)
+    _flush_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    _flush_timer: asyncio.TimerHandle | None = None
+    _flush_task: asyncio.Task | None = None
+    # Held while a command is written to the socket
+    _send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Callbacks for intermediate messages (progress, output) Rhino sends while a request runs
+    message_listeners: Dict[str, Callable[[Dict[str, Any]], None]] = field(default_factory=dict)
+    jobs: JobManager = field(default_factory=JobManager)
+    script_outputs: OutputStore = field(default_factory=OutputStore)
+    script_templates: TemplateStore = field(default_factory=TemplateStore)
+    # Ids of the script sessions opened in Rhino, their interpreter state is kept between executions
+    script_sessions: Set[str] = field(default_factory=set)
+    # Advanced on every change of the document Rhino reports and every command that can change it
+    document_version: int = 0
+    # Results of read-only scripts by code hash, params and document version
+    script_results: ResultCache = field(default_factory=ResultCache)
+    # Responses of read commands by command, params and document version
+    read_results: ResultCache = field(default_factory=lambda: ResultCache(max_entries=256, ttl=READ_CACHE_TTL))
+    # Clients subscribed to the document resources
+    subscriptions: ResourceSubscriptions = field(default_factory=ResourceSubscriptions)
+    # Events Rhino sent, read with get_changes
+    changes: ChangeJournal = field(default_factory=ChangeJournal)
     
     async def connect(self) -> bool:
         """Connect to the Rhino addon socket server"""
@@ -101,50 +181,86 @@ class RhinoConnection:
     
     async def _listen(self):
         """Listen for incoming messages from Rhino"""
+        # Messages are concatenated JSON objects, a read can hold several of them or a part of one
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
         while self.sock and not self.sock._closed:
             try:
-                response_data = await asyncio.get_running_loop().sock_recv(self.sock, 8192)
+                response_data = await asyncio.get_running_loop().sock_recv(self.sock, 65536)
                 if not response_data:
                     logger.warning("Connection to Rhino closed")
                     self.disconnect()
                     break
-                
-                response = json.loads(response_data.decode('utf-8'))
-                request_id = response.get("request_id")
-                
-                if request_id and request_id in self.pending_requests:
-                    logger.info(f"[Rhino → Claude] {json.dumps(response)}")
-                    
-                    # Remove the command context as it's complete
-                    if request_id in self.active_command_context:
-                        del self.active_command_context[request_id]
-                    
-                    future = self.pending_requests.pop(request_id)
-                    future.set_result(response.get("result", {}))
-                elif response.get("type") == "event":
-                    # Clean up old contexts first
-                    self._cleanup_old_contexts()
-                    
-                    # Only log user-initiated events
-                    if self._is_user_initiated_event():
-                        logger.info(f"[Rhino -> Server] (user-initiated) {json.dumps(response)}")
-                else:
-                    logger.warning(f"Received unexpected message from Rhino: {response}")
+
+                buffer += decoder.decode(response_data)
+                messages, buffer = split_messages(buffer)
+                for response in messages:
+                    self._handle_message(response)
             except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
                 logger.error(f"Socket connection error: {str(e)}")
                 self.disconnect()
                 break
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON response from Rhino: {str(e)}")
             except Exception as e:
                 logger.error(f"Error in listener: {str(e)}")
                 self.disconnect()
                 break
-    
+
+    def _handle_message(self, response: Dict[str, Any]):
+        """Resolve the pending request a response belongs to, or handle an event"""
+        request_id = response.get("request_id")
+
+        if response.get("type") in ("progress", "output"):
+            listener = self.message_listeners.get(request_id)
+            if listener:
+                listener(response)
+        elif request_id and request_id in self.pending_requests:
+            logger.info(f"[Rhino → Claude] {json.dumps(response)}")
+
+            # Remove the command context as it's complete
+            if request_id in self.active_command_context:
+                del self.active_command_context[request_id]
+
+            future = self.pending_requests.pop(request_id)
+            if future.done():
+                return
+            if response.get("status") == "error":
+                future.set_exception(RhinoCommandError(
+                    response.get("message", "Unknown error"), cancelled=bool(response.get("cancelled"))
+                ))
+            else:
+                future.set_result(response.get("result", {}))
+        elif response.get("type") == "event":
+            self.document_version += 1
+            self.subscriptions.event(response)
+
+            # Clean up old contexts first
+            self._cleanup_old_contexts()
+
+            # Only log user-initiated events
+            user_initiated = self._is_user_initiated_event()
+            if user_initiated:
+                logger.info(f"[Rhino -> Server] (user-initiated) {json.dumps(response)}")
+            self.changes.append(response.get("event", "unknown"), response.get("data"), user_initiated)
+        else:
+            logger.warning(f"Received unexpected message from Rhino: {response}")
+
     def disconnect(self):
         """Disconnect from the Rhino addon"""
         if self.listener_task and not self.listener_task.done():
             self.listener_task.cancel()
+
+        # Nothing will answer the requests still waiting
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Disconnected from Rhino"))
+        self.pending_requests.clear()
+
+        # Rhino closes the script sessions of a client when it disconnects
+        self.script_sessions.clear()
+
+        # The document can change while nobody listens
+        self.document_version += 1
+        self.changes.append("connection_lost", {})
         
         if self.sock:
             try:
@@ -154,12 +270,114 @@ class RhinoConnection:
             finally:
                 self.sock = None
 
-    async def send_command(self, command_type: str, params: Dict[str, Any] = {}) -> Dict[str, Any]:
-        """Send a command to Rhino and return the response"""
+    def queue_command(self, command_type: str, params: Dict[str, Any]):
+        """Queue a document edit, it is sent with the next flush"""
+        self.write_queue.append({"type": command_type, "params": params})
+        # Reads from now on have to see the edit, results cached before it are stale
+        self.document_version += 1
+        logger.info(f"Queued command: {command_type} ({len(self.write_queue)} pending)")
+
+        if self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(self.flush_delay, self._start_flush)
+
+    def _start_flush(self):
+        """Flush the queue from the event loop timer"""
+        self._flush_timer = None
+        self._flush_task = asyncio.create_task(self.flush_queue())
+
+    async def flush_queue(self) -> List[str]:
+        """Send all queued edits to Rhino after folding them, returns the errors of this flush"""
+        async with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if not self.write_queue:
+                return []
+
+            queued, self.write_queue = self.write_queue, []
+            operations = plan_operations(queued)
+            logger.info(f"Flushing {len(queued)} queued edits as {len(operations)} commands")
+
+            errors = []
+            for operation in operations:
+                try:
+                    await self._send_command(operation["type"], operation["params"])
+                except Exception as e:
+                    logger.error(f"Error flushing {operation['type']}: {str(e)}")
+                    errors.append(f"{operation['type']}: {str(e)}")
+
+            # Keep the latest errors around so a read tool can surface them
+            self.flush_errors = (self.flush_errors + errors)[-20:]
+            return errors
+
+    def pop_flush_errors(self) -> List[str]:
+        """Return and clear the errors of earlier flushes"""
+        errors, self.flush_errors = self.flush_errors, []
+        return errors
+
+    def with_flush_errors(self, result: Any) -> Any:
+        """
+        Add the queued edits that failed when they were sent to the result of a tool, under "queued_edit_errors"
+        of a dictionary or as a last line of a text. Every tool that sends commands reports them, so they are
+        reported by whichever tool runs next.
+        """
+        errors = self.pop_flush_errors()
+        if not errors:
+            return result
+        if isinstance(result, dict):
+            result["queued_edit_errors"] = errors
+            return result
+        return f"{result}\nQueued edits that failed: {'; '.join(errors)}"
+
+    async def send_command(
+        self,
+        command_type: str,
+        params: Dict[str, Any] = {},
+        timeout: float | None = 15.0,
+        request_id: str | None = None,
+        mutates: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a command to Rhino and return the response, queued edits are sent first.
+        mutates tells whether the command can change the document, by default all but READ_ONLY_COMMANDS can.
+        """
+        # Also when the queue is empty, a flush from the timer may have taken the edits and still be sending them
+        await self.flush_queue()
+        return await self._send_command(command_type, params, timeout, request_id, mutates)
+
+    async def send_read_command(self, command_type: str, params: Dict[str, Any] = {}) -> Dict[str, Any]:
+        """
+        Send a command that only reads the document, the response is reused for the same command and params
+        until the document changes
+        """
+        await self.flush_queue()
+        key = (command_type, json.dumps(params or {}, sort_keys=True))
+        version = self.document_version
+        result = self.read_results.get(key, version)
+        if result is None:
+            result = await self._send_command(command_type, params, mutates=False)
+            # A change while the command ran may or may not be part of the response
+            if self.document_version == version:
+                self.read_results.put(key, version, result)
+        # Callers add their own keys to the response
+        return copy.deepcopy(result)
+
+    async def _send_command(
+        self,
+        command_type: str,
+        params: Dict[str, Any] = {},
+        timeout: float | None = 15.0,
+        request_id: str | None = None,
+        mutates: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """Send a single command to Rhino and return the response, no timeout if timeout is None"""
         if not self.sock and not await self.connect():
             raise ConnectionError("Not connected to Rhino")
+        if mutates is None:
+            mutates = command_type not in READ_ONLY_COMMANDS
         
-        request_id = str(uuid.uuid4())
+        request_id = request_id or str(uuid.uuid4())
         command = {
             "type": command_type,
             "params": params or {},
@@ -182,18 +400,24 @@ class RhinoConnection:
             if self.sock is None:
                 raise Exception("Socket is not connected")
             
-            # Send the command using async socket operations
-            command_bytes = json.dumps(command).encode('utf-8')
-            await asyncio.get_running_loop().sock_sendall(self.sock, command_bytes)
-            logger.info(f"Command sent, waiting for response...")
-            
-            # Create a future to wait for the response
+            # A read that overlaps with this command sees a new version when it ends, and does not cache its result
+            if mutates:
+                self.document_version += 1
+
+            # Create the future before sending, the response can arrive while the send is awaited
             future = asyncio.get_running_loop().create_future()
             self.pending_requests[request_id] = future
+
+            # Send the command using async socket operations, one at a time: a large command is sent in
+            # several writes, and concurrent commands must not interleave their bytes with it
+            command_bytes = json.dumps(command).encode('utf-8')
+            async with self._send_lock:
+                await asyncio.get_running_loop().sock_sendall(self.sock, command_bytes)
+            logger.info(f"Command sent, waiting for response...")
             
             # Wait for the response with a timeout
             try:
-                return await asyncio.wait_for(future, timeout=15.0)
+                return await asyncio.wait_for(future, timeout=timeout)
             except asyncio.TimeoutError:
                 logger.error("Timeout waiting for response from Rhino")
                 if request_id in self.pending_requests:
@@ -203,11 +427,15 @@ class RhinoConnection:
                     del self.active_command_context[request_id]
                 raise Exception("Timeout waiting for Rhino response - try simplifying your request")
 
+        except RhinoCommandError:
+            # Rhino is still connected, it only rejected this command
+            raise
         except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
             logger.error(f"Socket connection error: {str(e)}")
             # Clean up command context on error
             if request_id in self.active_command_context:
                 del self.active_command_context[request_id]
+            self.pending_requests.pop(request_id, None)
             self.sock = None
             raise Exception(f"Connection to Rhino lost: {str(e)}")
         except Exception as e:
@@ -215,6 +443,7 @@ class RhinoConnection:
             # Clean up command context on error
             if request_id in self.active_command_context:
                 del self.active_command_context[request_id]
+            self.pending_requests.pop(request_id, None)
             # Don't try to reconnect here - let the get_rhino_connection handle reconnection
             self.sock = None
             raise Exception(f"Communication error with Rhino: {str(e)}")
@@ -224,7 +453,7 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
     """Manage server startup and shutdown lifecycle"""
     global _global_rhino_connection
     
-    connection = RhinoConnection(host="127.0.0.1", port=1999)
+    connection = RhinoConnection(host="127.0.0.1", port=1999, write_behind=WRITE_BEHIND)
     try:
         await connection.connect()
         _global_rhino_connection = connection
@@ -232,6 +461,17 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         yield
     finally:
         if _global_rhino_connection:
+            if _global_rhino_connection.write_queue:
+                logger.info("Sending queued edits before shutdown")
+                await _global_rhino_connection.flush_queue()
+            if _global_rhino_connection.script_sessions:
+                logger.info("Closing script sessions before shutdown")
+                try:
+                    await _global_rhino_connection.send_command("close_script_session", {"all": True})
+                except Exception as e:
+                    # Rhino also closes them when the connection goes away
+                    logger.warning(f"Could not close script sessions: {str(e)}")
+                _global_rhino_connection.script_sessions.clear()
             logger.info("Disconnecting from Rhino on shutdown")
             _global_rhino_connection.disconnect()
             _global_rhino_connection = None
@@ -257,6 +497,9 @@ def get_rhino_connection(ctx: Context) -> RhinoConnection:
 # Main execution
 def main():
     """Run the MCP server"""
+    if COMPACT_TOOLS:
+        # All tools are registered by now, importing rhinomcp.server imports the package
+        compact_tool_descriptions(mcp)
     mcp.run()
 
 
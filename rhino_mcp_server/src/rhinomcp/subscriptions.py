@@ -0,0 +1,83 @@
+"""Subscriptions of clients to document resources, notified when the events Rhino sends change them."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Set
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_URI = "rhino://document"
+LAYERS_URI = "rhino://layers"
+SELECTION_URI = "rhino://selection"
+OBJECT_URI = "rhino://object/{id}"
+
+# Events that change an object, with its id in the data
+OBJECT_EVENTS = {"object_created", "object_deleted", "object_undeleted", "object_replaced", "object_modified"}
+
+
+def changed_uris(event: Dict[str, Any]) -> Set[str]:
+    """The document resources an event from Rhino changes"""
+    name = event.get("event")
+    data = event.get("data") or {}
+    if name in OBJECT_EVENTS:
+        uris = {DOCUMENT_URI}
+        if data.get("id"):
+            uris.add(OBJECT_URI.format(id=data["id"]))
+        if name == "object_deleted":
+            # Deleted objects are no longer selected
+            uris.add(SELECTION_URI)
+        return uris
+    if name == "selection_changed":
+        return {SELECTION_URI}
+    if name == "layer_changed":
+        return {DOCUMENT_URI, LAYERS_URI}
+    # Another document, or an event this version does not know: everything may have changed
+    return {"*"}
+
+
+@dataclass
+class ResourceSubscriptions:
+    """
+    Client sessions by the uri they subscribed to.
+    Changes are collected for a short delay and every changed uri is notified once,
+    so creating a thousand objects sends one update of rhino://document.
+    """
+    notify_delay: float = 0.1
+    subscribers: Dict[str, Set[Any]] = field(default_factory=dict)
+    changed: Set[str] = field(default_factory=set)
+    _notify_timer: asyncio.TimerHandle | None = None
+
+    def subscribe(self, uri: str, session: Any):
+        self.subscribers.setdefault(uri, set()).add(session)
+
+    def unsubscribe(self, uri: str, session: Any):
+        sessions = self.subscribers.get(uri)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self.subscribers[uri]
+
+    def event(self, event: Dict[str, Any]):
+        """Note the resources an event changes, subscribers are notified after the delay"""
+        if not self.subscribers:
+            return
+        uris = changed_uris(event)
+        self.changed |= set(self.subscribers) if "*" in uris else uris & set(self.subscribers)
+        if self.changed and self._notify_timer is None:
+            self._notify_timer = asyncio.get_running_loop().call_later(self.notify_delay, self._start_notify)
+
+    def _start_notify(self):
+        self._notify_timer = None
+        asyncio.create_task(self.notify())
+
+    async def notify(self):
+        """Send resources/updated for every changed uri to the sessions subscribed to it"""
+        changed, self.changed = self.changed, set()
+        for uri in changed:
+            for session in list(self.subscribers.get(uri, ())):
+                try:
+                    await session.send_resource_updated(uri)
+                except Exception as e:
+                    # The client went away without unsubscribing
+                    logger.info(f"Dropping subscription to {uri}: {str(e)}")
+                    self.unsubscribe(uri, session)
@@ -0,0 +1,42 @@
+"""Parameter sets of a script sweep and the table of their results."""
+from typing import Any, Dict, List, Optional
+import itertools
+
+# Sets a single sweep may run, a grid grows quickly with every parameter
+MAX_SWEEP_SETS = 10000
+
+
+def expand_param_sets(
+    grid: Optional[Dict[str, List[Any]]] = None,
+    param_sets: Optional[List[Dict[str, Any]]] = None,
+    max_sets: int = MAX_SWEEP_SETS
+) -> List[Dict[str, Any]]:
+    """
+    All parameter sets of a sweep: every combination of the grid values, combined with each of the given sets.
+    {"width": [1, 2], "height": [3]} gives [{"width": 1, "height": 3}, {"width": 2, "height": 3}].
+    """
+    sets = param_sets or [{}]
+    if grid:
+        names = list(grid)
+        for name in names:
+            if not isinstance(grid[name], list) or not grid[name]:
+                raise ValueError(f"Grid values of {name} must be a non-empty list")
+        total = len(sets)
+        for values in grid.values():
+            total *= len(values)
+        if total > max_sets:
+            raise ValueError(f"The sweep has {total} parameter sets, at most {max_sets} are allowed")
+        combinations = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+        sets = [{**base, **combination} for base in sets for combination in combinations]
+    if len(sets) > max_sets:
+        raise ValueError(f"The sweep has {len(sets)} parameter sets, at most {max_sets} are allowed")
+    if sets == [{}]:
+        raise ValueError("Either grid or param_sets is required")
+    return sets
+
+
+def result_table(sets: List[Dict[str, Any]], results: List[Any], result_variable: str) -> Dict[str, Any]:
+    """One row per set with its parameter values and result, the columns are named once"""
+    columns = list(dict.fromkeys(name for parameters in sets for name in parameters))
+    rows = [[parameters.get(name) for name in columns] + [result] for parameters, result in zip(sets, results)]
+    return {"columns": columns + [result_variable], "rows": rows}
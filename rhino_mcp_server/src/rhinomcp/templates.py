@@ -0,0 +1,34 @@
+"""Script templates, registered once and executed again by the hash of their code."""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+import hashlib
+
+
+def script_hash(code: str) -> str:
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TemplateStore:
+    """
+    Code of the most recently used templates by the hash of the code the client sent.
+    Rhino keeps its own cache of compiled templates, the code is sent again when Rhino has dropped one.
+    """
+    max_templates: int = 128
+    templates: "OrderedDict[str, str]" = field(default_factory=OrderedDict)
+
+    def register(self, original: str, code: Optional[str] = None) -> str:
+        """Store the code to send for a template, code defaults to the original code, and return its hash"""
+        key = script_hash(original)
+        self.templates[key] = original if code is None else code
+        self.templates.move_to_end(key)
+        while len(self.templates) > self.max_templates:
+            self.templates.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        code = self.templates.get(key)
+        if code is not None:
+            self.templates.move_to_end(key)
+        return code
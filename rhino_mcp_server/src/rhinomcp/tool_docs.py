@@ -0,0 +1,55 @@
+"""Compact tool descriptions, with the full documentation of every tool served on demand."""
+from typing import Any, Dict, List, Optional
+import inspect
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+# Publish only the first paragraph of every tool description, describe_tool returns the rest
+COMPACT_TOOLS = os.environ.get("RHINOMCP_COMPACT_TOOLS", "").lower() in ("1", "true", "yes")
+
+TOOL_URI = "rhinomcp://tool/{name}"
+
+# Tools whose description is needed to find the others
+ALWAYS_FULL = {"describe_tool"}
+
+# Full descriptions of the tools that were compacted, by tool name
+_full_descriptions: Dict[str, str] = {}
+
+
+def summary(description: str) -> str:
+    """First paragraph of a description, on one line and ending in a period"""
+    first = inspect.cleandoc(description).split("\n\n")[0]
+    text = " ".join(line.strip() for line in first.splitlines()).rstrip()
+    return text if text.endswith((".", "!", "?")) else f"{text}."
+
+
+def _strip_titles(schema: Any) -> Any:
+    """Remove the titles pydantic generates from the parameter names, they repeat what the names say"""
+    if isinstance(schema, dict):
+        return {key: _strip_titles(value) for key, value in schema.items() if key != "title"}
+    if isinstance(schema, list):
+        return [_strip_titles(value) for value in schema]
+    return schema
+
+
+def compact_tool_descriptions(server: FastMCP):
+    """Replace the description of every tool by its summary and a pointer to describe_tool"""
+    for tool in server._tool_manager.list_tools():
+        if tool.name in ALWAYS_FULL or tool.name in _full_descriptions:
+            continue
+        _full_descriptions[tool.name] = tool.description
+        tool.description = f'{summary(tool.description)} Parameters and examples: describe_tool(["{tool.name}"]).'
+        tool.parameters = _strip_titles(tool.parameters)
+
+
+def full_description(server: FastMCP, name: str) -> Optional[str]:
+    """The full description of a tool, whether it was compacted or not"""
+    if name in _full_descriptions:
+        return inspect.cleandoc(_full_descriptions[name])
+    tool = server._tool_manager.get_tool(name)
+    return inspect.cleandoc(tool.description) if tool else None
+
+
+def tool_names(server: FastMCP) -> List[str]:
+    return [tool.name for tool in server._tool_manager.list_tools()]
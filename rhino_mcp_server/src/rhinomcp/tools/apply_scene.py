@@ -0,0 +1,71 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.scene import plan_scene
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def apply_scene(
+    ctx: Context,
+    objects: List[Dict[str, Any]],
+    scene: str = "default"
+) -> Dict[str, Any]:
+    """
+    Make the Rhino document contain exactly the given set of objects, touching only what changed.
+    Use this instead of deleting and recreating everything when re-running a generative design.
+
+    Parameters:
+    - objects: The complete desired list of objects. Each object takes the same values as in create_object()
+      (type, name, color, params, translation, rotation, scale). The name is required and must be unique,
+      it is used to match the object with the one created by a previous apply_scene call.
+    - scene: Optional scene name, objects of other scenes are left untouched. Default is "default".
+
+    Objects of the scene that are not in the list anymore are deleted, new ones are created,
+    moved or recolored objects are modified in place and objects with other changes, or whose color is removed,
+    are recreated.
+    Objects that did not change are not sent to Rhino at all.
+
+    Returns:
+    A dictionary with the number of created, modified, deleted and unchanged objects.
+
+    Example:
+    objects = [
+        {"type": "BOX", "name": "column_1", "params": {"width": 1, "length": 1, "height": 5}, "translation": [0, 0, 0]},
+        {"type": "BOX", "name": "column_2", "params": {"width": 1, "length": 1, "height": 5}, "translation": [4, 0, 0]}
+    ]
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+
+        current = await rhino.send_command("get_scene_objects", {"scene": scene})
+        plan = plan_scene(objects, current.get("objects", []), scene)
+
+        if plan["deletes"]:
+            await rhino.send_command("delete_object", {"ids": plan["deletes"]})
+        if plan["modifies"]:
+            await rhino.send_command("modify_objects", {"objects": plan["modifies"]})
+
+        errors = []
+        if plan["creates"]:
+            result = await rhino.send_command("create_objects", {"objects": plan["creates"]})
+            errors = [value["error"] for value in result.values() if isinstance(value, dict) and "error" in value]
+
+        # Recreated objects are counted once, not as a delete and a create
+        recreated = plan["recreated"]
+        summary = {
+            "created": len(plan["creates"]) - recreated,
+            "recreated": recreated,
+            "modified": len(plan["modifies"]),
+            "deleted": len(plan["deletes"]) - recreated,
+            "unchanged": plan["unchanged"],
+        }
+        if errors:
+            summary["errors"] = errors
+        return rhino.with_flush_errors(summary)
+    except Exception as e:
+        logger.error(f"Error applying scene: {str(e)}")
+        return {
+            "error": str(e)
+        }
@@ -0,0 +1,26 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def cancel_job(ctx: Context, job_id: str) -> Dict[str, Any]:
+    """
+    Cancel a job started with submit_rhinoscript_job.
+    The script stops the next time it prints or reports progress, and its changes to the document are undone.
+
+    Parameters:
+    - job_id: The id of the job
+
+    Returns:
+    The job status, "cancelling" until Rhino has stopped the script.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        job = await rhino.jobs.cancel(rhino, job_id)
+        return job.describe()
+    except Exception as e:
+        logger.error(f"Error cancelling job: {str(e)}")
+        return {"success": False, "message": str(e)}
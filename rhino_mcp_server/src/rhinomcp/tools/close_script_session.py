@@ -0,0 +1,30 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from typing import Any, List, Dict, Optional
+
+
+@mcp.tool()
+async def close_script_session(ctx: Context, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Close a script session opened by execute_rhinoscript_python_code with session_id, and free what its scripts defined.
+
+    Parameters:
+    - session_id: The id of the session, all sessions are closed when it is not given
+
+    Returns:
+    The number of sessions closed.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        params = {"session_id": session_id} if session_id else {"all": True}
+        result = await rhino.send_command("close_script_session", params)
+        if session_id:
+            rhino.script_sessions.discard(session_id)
+        else:
+            rhino.script_sessions.clear()
+        return rhino.with_flush_errors(result)
+    except Exception as e:
+        logger.error(f"Error closing script session: {str(e)}")
+        return {"success": False, "message": str(e)}
@@ -40,7 +40,7 @@ async def create_layer(
         # Create the layer
         result = await rhino.send_command("create_layer", command_params)
         
-        return f"Created layer: {result['name']}"
+        return rhino.with_flush_errors(f"Created layer: {result['name']}")
     except Exception as e:
         logger.error(f"Error creating layer: {str(e)}")
         return f"Error creating layer: {str(e)}"
@@ -113,13 +113,17 @@ async def create_object(
         if name: command_params["name"] = name
         if color: command_params["color"] = color
 
+        if rhino.write_behind:
+            rhino.queue_command("create_object", command_params)
+            return rhino.with_flush_errors(f"Queued {type} object: {name}")
+
         # Create the object
         result = await rhino.send_command("create_object", command_params)
         
         if 'name' in result:
-            return f"Created {type} object: {result['name']}"
+            return rhino.with_flush_errors(f"Created {type} object: {result['name']}")
         else:
-            return f"Created {type} object: {name}"
+            return rhino.with_flush_errors(f"Created {type} object: {name}")
     except Exception as e:
         logger.error(f"Error creating object: {str(e)}")
         return f"Error creating object: {str(e)}"
@@ -73,10 +73,15 @@ async def create_objects(
         # Get the global connection
         rhino = get_rhino_connection(ctx)
         command_params = {"objects": objects}
+
+        if rhino.write_behind:
+            rhino.queue_command("create_objects", command_params)
+            return rhino.with_flush_errors(f"Queued {len(objects)} objects")
+
         result = await rhino.send_command("create_objects", command_params)
   
         
-        return f"Created {len(result)} objects"
+        return rhino.with_flush_errors(f"Created {len(result)} objects")
     except Exception as e:
         logger.error(f"Error creating object: {str(e)}")
         return f"Error creating object: {str(e)}"
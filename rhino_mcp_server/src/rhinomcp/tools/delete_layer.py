@@ -40,7 +40,7 @@ async def delete_layer(
         # Create the layer
         result = await rhino.send_command("delete_layer", command_params)
 
-        return result["message"]
+        return rhino.with_flush_errors(result["message"])
     except Exception as e:
         logger.error(f"Error deleting layer: {str(e)}")
         return f"Error deleting layer: {str(e)}"
@@ -25,10 +25,14 @@ async def delete_object(ctx: Context, id: str = None, name: str = None, all: boo
             commandParams["name"] = name
         if all:
             commandParams["all"] = all
-        
+
+        if rhino.write_behind:
+            rhino.queue_command("delete_object", commandParams)
+            return rhino.with_flush_errors(f"Queued deletion of object: {name or id or 'all'}")
+
         result = await rhino.send_command("delete_object", commandParams)
 
-        return f"Deleted object: {result['name']}"
+        return rhino.with_flush_errors(f"Deleted object: {result['name']}")
     except Exception as e:
         logger.error(f"Error deleting object: {str(e)}")
         return f"Error deleting object: {str(e)}"
\ No newline at end of file
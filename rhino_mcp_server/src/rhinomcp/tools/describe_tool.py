@@ -0,0 +1,35 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.server import mcp, logger
+from rhinomcp.tool_docs import full_description, tool_names
+from typing import Any, Dict, List
+
+
+@mcp.tool()
+async def describe_tool(ctx: Context, names: List[str]) -> Dict[str, Any]:
+    """
+    Return the full documentation of tools: every parameter, the accepted values per object type, and examples.
+    Read it before calling a tool for the first time when its description is only a summary.
+
+    Parameters:
+    - names: The names of the tools, e.g. ["create_object", "execute_rhinoscript_python_code"]
+
+    Returns:
+    The documentation by tool name. Unknown names are listed in "unknown" together with the available tools.
+    The same documentation is available as the rhinomcp://tool/{name} resource.
+    """
+    try:
+        result: Dict[str, Any] = {}
+        unknown = []
+        for name in names:
+            description = full_description(mcp, name)
+            if description is None:
+                unknown.append(name)
+            else:
+                result[name] = description
+        if unknown:
+            result["unknown"] = unknown
+            result["available"] = tool_names(mcp)
+        return result
+    except Exception as e:
+        logger.error(f"Error describing tools: {str(e)}")
+        return {"success": False, "message": str(e)}
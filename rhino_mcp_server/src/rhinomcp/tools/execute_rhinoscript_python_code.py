@@ -1,16 +1,108 @@
 from mcp.server.fastmcp import Context
 import json
-from rhinomcp.server import get_rhino_connection, mcp, logger
-from typing import Any, List, Dict
+import uuid
+import asyncio
+from rhinomcp.server import get_rhino_connection, mcp, logger, MAX_SCRIPT_OUTPUT
+from rhinomcp.output import ScriptOutput
+from rhinomcp.analysis.validate import validate_code
+from rhinomcp.analysis.redraw import plan_redraw
+from rhinomcp.analysis.bulk import rewrite_loops
+from rhinomcp.recording import record_script, replay_recording
+from rhinomcp.analysis.readonly import is_read_only
+from rhinomcp.templates import script_hash as hash_script
+from typing import Any, List, Dict, Optional, Tuple
+
+
+async def _forward_messages(ctx: Context, messages: asyncio.Queue, output: ScriptOutput):
+    """Collect the streamed print output and pass output and progress on to the client as they arrive"""
+    while (message := await messages.get()) is not None:
+        try:
+            if message["type"] == "output":
+                output.append(message.get("text", ""))
+                await ctx.log("info", message.get("text", ""), logger_name="rhinoscript")
+            elif message.get("progress") is not None:
+                await ctx.report_progress(message["progress"], 1.0)
+        except Exception as e:
+            logger.warning(f"Could not forward script output: {str(e)}")
+
+
+async def _send_script(
+    ctx: Context, rhino, command: Dict[str, Any], mutates: bool = True
+) -> Tuple[Dict[str, Any], ScriptOutput]:
+    """Execute a script in Rhino, print output is streamed while it runs and sent on as log notifications"""
+    request_id = str(uuid.uuid4())
+    output = ScriptOutput()
+    messages: asyncio.Queue = asyncio.Queue()
+    rhino.message_listeners[request_id] = messages.put_nowait
+    forwarder = asyncio.create_task(_forward_messages(ctx, messages, output))
+    try:
+        result = await rhino.send_command(
+            "execute_rhinoscript_python_code", command, request_id=request_id, mutates=mutates
+        )
+    finally:
+        rhino.message_listeners.pop(request_id, None)
+        messages.put_nowait(None)
+        await forwarder
+    return result, output
+
+
+def _script_result(
+    rhino, result: Dict[str, Any], output: ScriptOutput, max_output: Optional[int],
+    diagnostics: List[Dict[str, Any]], template: bool, script_hash: Optional[str]
+) -> Dict[str, Any]:
+    """Add the print output, diagnostics and template hash to the result Rhino returned"""
+    text, full_output = output.summarize(max_output or MAX_SCRIPT_OUTPUT, rhino.script_outputs)
+    if result.get("success"):
+        result["result"] = f"Script successfully executed! Print output: {text}"
+    elif text:
+        result["output"] = text
+    if full_output:
+        result["full_output"] = full_output
+    if diagnostics:
+        result["diagnostics"] = diagnostics
+    if template:
+        result["script_hash"] = script_hash
+    return result
 
 
 @mcp.tool()
-async def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str, Any]:
+async def execute_rhinoscript_python_code(
+    ctx: Context,
+    code: Optional[str] = None,
+    max_output: int = None,
+    validate_calls: bool = True,
+    force: bool = False,
+    suppress_redraw: Optional[bool] = None,
+    rewrite_loops_to_bulk: bool = False,
+    record_locally: bool = False,
+    script_hash: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
     """
     Execute arbitrary RhinoScript code in Rhino.
     
     Parameters:
-    - code: The RhinoScript code to execute
+    - code: The RhinoScript code to execute, can be left out when script_hash is given
+    - max_output: Maximum number of characters of print output to return, the full output is then in "full_output"
+    - validate_calls: Check the rhinoscriptsyntax calls against their signatures first, default True.
+      Code with problems is not sent, they are returned in "diagnostics".
+    - force: Send the code even if the validation found problems, default False
+    - suppress_redraw: Redraw only once at the end. By default done when the script calls redrawing functions
+      (AddBox, ObjectColor, ...) in a loop and does not call rs.EnableRedraw itself.
+    - rewrite_loops_to_bulk: Replace loops calling a function per object by one call of its bulk form,
+      e.g. "for p in pts: rs.AddPoint(p)" by "rs.AddPoints(list(pts))", default False
+    - record_locally: Run simple creation scripts on the server and send the objects to Rhino in one batch,
+      default False. Other scripts run in Rhino as usual, "recording" tells why. Recorded scripts run in python 3
+      with the division and round() of IronPython 2, print output can still differ from Rhino.
+    - params: Global variables to run the code as a template with, e.g. {"count": 10}. The result contains
+      its "script_hash", send only script_hash and params to run it again with other values.
+    - script_hash: Hash of a template sent before, instead of the code
+    - session_id: Run in a persistent session with this id, e.g. "main", so variables and imports of earlier
+      scripts stay defined. Close it with close_script_session.
+    - use_cache: Return the earlier result of a script that only reads the document if the document did not change,
+      default True. Such results have "cached": true.
 
     GUIDE: 
     
@@ -26,15 +118,113 @@ async def execute_rhinoscript_python_code(ctx: Context, code: str) -> Dict[str,
     - This will return the syntax of the code that are necessary for creating the code.
 
     Any changes made to the document will be undone if the script returns failure.
+    Scripts that take longer than 15 seconds are reported as failed, run them with submit_rhinoscript_job instead.
 
     DO NOT HALLUCINATE, ONLY USE THE SYNTAX THAT IS SUPPORTED BY RHINO.GEOMETRY OR RHINOSCRIPT.
-    
     """
     try:
         # Get the global connection
         rhino = get_rhino_connection(ctx)
-        
-        return await rhino.send_command("execute_rhinoscript_python_code", {"code": code})
+
+        template = script_hash is not None or params is not None
+        registered = code is None
+        if registered:
+            code = rhino.script_templates.get(script_hash) if script_hash else None
+            if code is None:
+                return {"success": False, "message": "Unknown script_hash, send the code with params to register it again."}
+
+        diagnostics = validate_code(code) if validate_calls and not registered else []
+        errors = [d for d in diagnostics if d["severity"] == "error"]
+        if errors and not force:
+            return {
+                "success": False,
+                "message": f"Script not sent, {len(errors)} problem(s) found. Fix them or call again with force=True.",
+                "diagnostics": diagnostics,
+            }
+
+        # Rewriting comes after the validation so diagnostics refer to the lines the client sent
+        original = code
+        rewrites = []
+        if rewrite_loops_to_bulk and not registered:
+            code, rewrites = rewrite_loops(code)
+        if template and not registered:
+            # The hash is of the code the client sent, Rhino gets the rewritten code
+            script_hash = rhino.script_templates.register(original, code)
+
+        recording = None
+        if record_locally and not template and not session_id:
+            recording = await record_script(code)
+            if recording["supported"]:
+                replayed = await replay_recording(rhino, recording)
+                output = ScriptOutput()
+                output.append(replayed["output"])
+                text, full_output = output.summarize(max_output or MAX_SCRIPT_OUTPUT, rhino.script_outputs)
+                result = {
+                    "success": not replayed["failed"],
+                    "result": f"Script executed locally and recorded! Print output: {text}",
+                    "recording": {
+                        "created": replayed["created"],
+                        "modified": replayed["modified"],
+                    },
+                }
+                if replayed["failed"]:
+                    result["recording"]["failed"] = replayed["failed"]
+                if full_output:
+                    result["full_output"] = full_output
+                if diagnostics:
+                    result["diagnostics"] = diagnostics
+                if rewrites:
+                    result["rewrites"] = rewrites
+                return rhino.with_flush_errors(result)
+
+        # Scripts that only read the document give the same result until it changes
+        cache_key = None
+        if use_cache and not session_id and is_read_only(code):
+            # Queued edits are part of the document the script reads, sending them advances the version
+            await rhino.flush_queue()
+            cache_key = (hash_script(code), json.dumps(params or {}, sort_keys=True))
+            cached = rhino.script_results.get(cache_key, rhino.document_version)
+            if cached is not None:
+                result, output = dict(cached[0]), ScriptOutput()
+                output.append(cached[1])
+                result = _script_result(rhino, result, output, max_output, diagnostics, template, script_hash)
+                result["cached"] = True
+                if rewrites:
+                    result["rewrites"] = rewrites
+                return rhino.with_flush_errors(result)
+        version = rhino.document_version
+
+        redraw = plan_redraw(code, suppress_redraw)
+
+        command = {"stream_output": True, "suppress_redraw": redraw["suppressed"]}
+        if template:
+            command.update({"script_hash": script_hash, "template_params": params or {}})
+        if session_id:
+            command["session_id"] = session_id
+        if not registered:
+            command["code"] = code
+        mutates = cache_key is None
+        result, output = await _send_script(ctx, rhino, command, mutates)
+        if result.get("template_missing"):
+            # Rhino was restarted or dropped the template, register it again
+            result, output = await _send_script(ctx, rhino, {**command, "code": code}, mutates)
+        if cache_key and result.get("success") and rhino.document_version == version:
+            rhino.script_results.put(cache_key, version, (dict(result), output.text))
+
+        result = _script_result(rhino, result, output, max_output, diagnostics, template, script_hash)
+        if redraw["suppressed"]:
+            result["redraw"] = redraw
+        if rewrites:
+            result["rewrites"] = rewrites
+        if recording:
+            result["recording"] = {"reason": recording["reason"]}
+        if session_id:
+            known = session_id in rhino.script_sessions
+            rhino.script_sessions.add(session_id)
+            if known and result.get("session", {}).get("created"):
+                # Rhino dropped the session in between, what earlier scripts defined is gone
+                result["session"]["expired"] = True
+        return rhino.with_flush_errors(result)
 
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
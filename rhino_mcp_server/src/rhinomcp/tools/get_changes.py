@@ -0,0 +1,44 @@
+from mcp.server.fastmcp import Context
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.journal import fold_changes
+from typing import Any, Dict, Optional
+
+
+@mcp.tool()
+async def get_changes(ctx: Context, since: Optional[int] = None, wait_ms: int = 0, user_only: bool = False) -> Dict[str, Any]:
+    """
+    Get what changed in the Rhino document since an earlier call, e.g. to follow the edits of a person
+    modeling in Rhino without reading the whole document again.
+
+    Parameters:
+    - since: The cursor returned by the previous call. Leave it out on the first call to get the current cursor.
+    - wait_ms: Optional time in milliseconds (max 60000) to wait for a change when there is none yet,
+      default is 0 (return right away)
+    - user_only: Only report changes made in Rhino, not those made by the tools, default False
+
+    Returns:
+    A dictionary with the new "cursor" to pass as since next time and the net changes since the given cursor:
+    - created: the created objects with their id, name, type, layer, color and bounding box
+    - deleted: the ids of the deleted objects
+    - modified: the ids of the objects whose geometry or attributes changed
+    - selection_changed, layers_changed: present when the selection or the layers changed
+    - rescan: present when changes may have been missed, e.g. another document was opened or the cursor is
+      too old. Read the document again with get_document_info then.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        journal = rhino.changes
+        if since is None:
+            return {"cursor": journal.last_seq, "created": [], "deleted": [], "modified": []}
+
+        await journal.wait(since, wait_ms)
+        changes = [change for change in journal.since(since) if change.user or not user_only]
+        result = {"cursor": journal.last_seq, **fold_changes(changes)}
+        if journal.missed(since) or since > journal.last_seq:
+            # The cursor is older than the buffer, or from before the server was restarted
+            result["rescan"] = True
+        return result
+    except Exception as e:
+        logger.error(f"Error getting changes: {str(e)}")
+        return {"success": False, "message": str(e)}
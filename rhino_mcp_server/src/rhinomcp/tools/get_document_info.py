@@ -7,10 +7,10 @@ async def get_document_info(ctx: Context) -> str:
     """Get detailed information about the current Rhino document"""
     try:
         rhino = get_rhino_connection(ctx)
-        result = await rhino.send_command("get_document_info")
+        result = await rhino.send_read_command("get_document_info")
         
         # Just return the JSON representation of what Rhino sent us
-        return json.dumps(result, indent=2)
+        return json.dumps(rhino.with_flush_errors(result), indent=2)
     except Exception as e:
         logger.error(f"Error getting document info from Rhino: {str(e)}")
         return f"Error getting document info: {str(e)}"
\ No newline at end of file
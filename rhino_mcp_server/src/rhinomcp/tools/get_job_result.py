@@ -0,0 +1,30 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def get_job_result(ctx: Context, job_id: str, wait_ms: int = 0) -> Dict[str, Any]:
+    """
+    Get the result of a job started with submit_rhinoscript_job.
+
+    Parameters:
+    - job_id: The id of the job
+    - wait_ms: Optional time in milliseconds (max 60000) to wait for the job to finish, default is 0
+
+    Returns:
+    The job status, with the result of the script once the job is finished.
+    The results of the most recently used finished jobs are kept, older ones are dropped.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        job = await rhino.jobs.wait(job_id, wait_ms)
+        status = job.describe()
+        if job.finished and job.result is not None:
+            status["result"] = job.result
+        return status
+    except Exception as e:
+        logger.error(f"Error getting job result: {str(e)}")
+        return {"success": False, "message": str(e)}
@@ -0,0 +1,28 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def get_job_status(ctx: Context, job_id: str, wait_ms: int = 0) -> Dict[str, Any]:
+    """
+    Get the status and progress of a job started with submit_rhinoscript_job.
+
+    Parameters:
+    - job_id: The id of the job
+    - wait_ms: Optional time in milliseconds (max 60000) to wait for the next progress report
+      or for the job to finish before returning, default is 0 (return right away)
+
+    Returns:
+    A dictionary with the job id, status ("running", "cancelling", "succeeded", "failed", "cancelled"),
+    elapsed seconds and the last reported progress and message.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        job = await rhino.jobs.wait(job_id, wait_ms, until_done=False)
+        return job.describe()
+    except Exception as e:
+        logger.error(f"Error getting job status: {str(e)}")
+        return {"success": False, "message": str(e)}
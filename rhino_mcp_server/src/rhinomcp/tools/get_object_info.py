@@ -30,7 +30,8 @@ async def get_object_info(ctx: Context, id: str = None, name: str = None) -> Dic
     """
     try:
         rhino = get_rhino_connection(ctx)
-        return await rhino.send_command("get_object_info", {"id": id, "name": name})
+        result = await rhino.send_read_command("get_object_info", {"id": id, "name": name})
+        return rhino.with_flush_errors(result)
 
     except Exception as e:
         logger.error(f"Error getting object info from Rhino: {str(e)}")
@@ -39,8 +39,7 @@ async def get_or_set_current_layer(
 
         # Create the layer
         result = await rhino.send_command("get_or_set_current_layer", command_params)
-        
-        return f"Current layer: {result['name']}"
+        return rhino.with_flush_errors(f"Current layer: {result['name']}")
     except Exception as e:
         logger.error(f"Error getting or setting current layer: {str(e)}")
         return f"Error getting or setting current layer: {str(e)}"
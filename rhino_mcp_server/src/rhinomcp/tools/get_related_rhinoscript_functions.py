@@ -0,0 +1,53 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp.reference import get_store, suggest_functions
+from rhinomcp.reference.graph import GRAPH_SECTION, neighborhood
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+def get_related_rhinoscript_functions(
+    ctx: Context,
+    function_name: str,
+    depth: int = 1,
+    max_related: int = 30
+) -> Dict[str, Any]:
+    """
+    Return the RhinoScriptsyntax Details for a function together with the signatures of related functions,
+    following the "See Also" references of the documentation in both directions.
+    Use this to discover the functions that are usually needed together, e.g. AddLoftSrf with CurveDirectionsMatch.
+
+    Parameters:
+    - function_name: The name of the function, matched case-insensitively.
+    - depth: How many "See Also" hops to follow, default 1, at most 3.
+    - max_related: The maximum number of related functions to return, default 30.
+
+    Returns:
+    A dictionary with the details of the function and the related functions, nearest first,
+    each with its name, signature, description and distance in hops.
+    """
+    try:
+        store = get_store()
+        index = store.find(function_name)
+        if index is None:
+            return {
+                "success": False,
+                "message": "Function not found",
+                "suggestions": suggest_functions(function_name),
+            }
+
+        related: List[Dict[str, Any]] = []
+        graph = store.json_section(GRAPH_SECTION)
+        for neighbor, distance in neighborhood(graph, index, max(1, min(depth, 3)), max_related):
+            record = store.record(neighbor)
+            related.append({
+                "name": record["Name"],
+                "signature": record["Signature"],
+                "description": record["Description"],
+                "distance": distance,
+            })
+        return {"function": store.record(index), "related": related}
+
+    except Exception as e:
+        logger.error(f"Error getting related functions: {str(e)}")
+        return {"success": False, "message": str(e)}
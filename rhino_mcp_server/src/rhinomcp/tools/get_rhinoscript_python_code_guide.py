@@ -1,5 +1,6 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp.reference import get_store, suggest_functions
 from typing import Any, List, Dict
 
 
@@ -10,17 +11,24 @@ def get_rhinoscript_python_code_guide(ctx: Context, function_name: str) -> Dict[
     Return the RhinoScriptsyntax Details for a specific function.
 
     Parameters:
-    - function_name: The name of the function to get the details for.
+    - function_name: The name of the function to get the details for, matched case-insensitively.
 
     You should get the function names first by using the get_rhinoscript_python_function_names tool.
+    To get the details of several functions, use get_rhinoscript_python_code_guides instead.
+    If the function does not exist, the response suggests the functions with the most similar names.
+    The same details are available as the rhinoscript://function/{name} resource, which clients can cache.
     """
     try:
-        for module in rhinoscriptsyntax_json:
-            for function in module["functions"]:
-                if function["Name"] == function_name:
-                    return function
+        store = get_store()
+        index = store.find(function_name)
+        if index is not None:
+            return store.record(index)
 
-        return {"success": False, "message": "Function not found"}
+        return {
+            "success": False,
+            "message": "Function not found",
+            "suggestions": suggest_functions(function_name),
+        }
 
     except Exception as e:
         logger.error(f"Error executing code: {str(e)}")
@@ -0,0 +1,43 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp.reference import get_store, suggest_functions
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+def get_rhinoscript_python_code_guides(ctx: Context, function_names: List[str]) -> Dict[str, Any]:
+    """
+    Return the RhinoScriptsyntax Details for several functions at once.
+    Use this instead of calling get_rhinoscript_python_code_guide once per function.
+
+    Parameters:
+    - function_names: The names of the functions to get the details for, matched case-insensitively.
+
+    Returns:
+    A dictionary with the details of the found functions keyed by function name,
+    and the names that were not found if any, with the functions with the most similar names.
+
+    Example:
+    - function_names = ["AddLoftSrf", "AddSweep1", "CurveDirectionsMatch"]
+    """
+    try:
+        store = get_store()
+        functions: Dict[str, Any] = {}
+        not_found: List[str] = []
+        for function_name in function_names:
+            index = store.find(function_name)
+            if index is None:
+                not_found.append(function_name)
+                continue
+            record = store.record(index)
+            functions[record["Name"]] = record
+
+        result: Dict[str, Any] = {"functions": functions}
+        if not_found:
+            result["not_found"] = not_found
+            result["suggestions"] = {name: suggest_functions(name) for name in not_found}
+        return result
+
+    except Exception as e:
+        logger.error(f"Error getting code guides: {str(e)}")
+        return {"success": False, "message": str(e)}
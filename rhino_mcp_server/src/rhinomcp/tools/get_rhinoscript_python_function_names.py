@@ -1,5 +1,6 @@
 from mcp.server.fastmcp import Context
-from rhinomcp import get_rhino_connection, mcp, logger, rhinoscriptsyntax_json
+from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp.reference import get_store
 from typing import Any, List, Dict
 
 
@@ -9,7 +10,7 @@ def get_rhinoscript_python_function_names(ctx: Context, categories: List[str]) -
     Return the RhinoScriptsyntax Function Names for specified categories.
 
     Parameters:
-    - categories: A list of categories of the RhinoScriptsyntax to get.
+    - categories: A list of categories of the RhinoScriptsyntax to get, in any case.
 
     Returns:
     - A list of function names that are available in the specified categories.
@@ -45,9 +46,9 @@ def get_rhinoscript_python_function_names(ctx: Context, categories: List[str]) -
     """
     try:
         function_names: List[str] = []
-        for i in rhinoscriptsyntax_json:
-            if i["ModuleName"] in categories:
-                function_names.extend([func["Name"] for func in i["functions"]])
+        store = get_store()
+        for category in dict.fromkeys(category.strip().lower() for category in categories):
+            function_names.extend(store.function_names(category))
                 
         # return the related functions
         return function_names
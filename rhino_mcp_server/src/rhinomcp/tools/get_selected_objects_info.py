@@ -11,8 +11,8 @@ async def get_selected_objects_info(ctx: Context, include_attributes: bool = Fal
     """
     try:
         rhino = get_rhino_connection(ctx)
-        result = await rhino.send_command("get_selected_objects_info", {"include_attributes": include_attributes})
-        return json.dumps(result, indent=2)
+        result = await rhino.send_read_command("get_selected_objects_info", {"include_attributes": include_attributes})
+        return json.dumps(rhino.with_flush_errors(result), indent=2)
     except Exception as e:
         logger.error(f"Error getting selected objects from Rhino: {str(e)}")
         return f"Error getting selected objects: {str(e)}"
@@ -51,9 +51,13 @@ async def modify_object(
             params["scale"] = scale
         if visible is not None:
             params["visible"] = visible
-            
+
+        if rhino.write_behind:
+            rhino.queue_command("modify_object", params)
+            return rhino.with_flush_errors(f"Queued modification of object: {name or id}")
+
         result = await rhino.send_command("modify_object", params)
-        return f"Modified object: {result['name']}"
+        return rhino.with_flush_errors(f"Modified object: {result['name']}")
     except Exception as e:
         logger.error(f"Error modifying object: {str(e)}")
         return f"Error modifying object: {str(e)}"
\ No newline at end of file
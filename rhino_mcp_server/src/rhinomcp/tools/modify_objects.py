@@ -11,7 +11,7 @@ async def modify_objects(
     all: bool = None
 ) -> str:
     """
-    Create multiple objects at once in the Rhino document.
+    Modify multiple objects at once in the Rhino document.
     
     Parameters:
     - objects: A List of objects, each containing the parameters for a single object modification 
@@ -35,10 +35,15 @@ async def modify_objects(
         command_params["objects"] = objects
         if all:
             command_params["all"] = all
+
+        if rhino.write_behind:
+            rhino.queue_command("modify_objects", command_params)
+            return rhino.with_flush_errors(f"Queued modification of {len(objects)} objects")
+
         result = await rhino.send_command("modify_objects", command_params)
   
         
-        return f"Modified {result['modified']} objects"
+        return rhino.with_flush_errors(f"Modified {result['modified']} objects")
     except Exception as e:
         logger.error(f"Error modifying objects: {str(e)}")
         return f"Error modifying objects: {str(e)}"
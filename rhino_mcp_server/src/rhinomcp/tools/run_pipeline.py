@@ -0,0 +1,55 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.pipeline import run_steps
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def run_pipeline(
+    ctx: Context,
+    steps: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Run several dependent tool calls in one go, later steps can use the results of earlier steps.
+    Use this instead of calling tools one by one when you already know the whole sequence of steps.
+
+    Parameters:
+    - steps: A list of steps. Each step is a dictionary with:
+        - id: A unique name for the step
+        - tool: The tool to run, one of "get_document_info", "get_object_info", "get_selected_objects_info",
+          "create_object", "create_objects", "modify_object", "modify_objects", "delete_object", "select_objects",
+          "execute_rhinoscript_python_code", "create_layer", "get_or_set_current_layer", "delete_layer"
+        - params: The parameters of the Rhino command of the same name. They are those of the tool, except that
+          execute_rhinoscript_python_code only takes "code".
+          Steps are sent to Rhino as given, so what the tools do on the server does not apply: the call validation,
+          loop rewrites, redraw suppression, templates, sessions and result cache of execute_rhinoscript_python_code,
+          and the write-behind queue of the edit tools (queued edits are sent before each step).
+          The results of the read steps are cached like those of the read tools.
+        - depends_on: Optional list of step ids that have to finish first, even if their results are not used
+
+    A string parameter value of the form "$<step id>.<key>.<key>..." is replaced by that part of the result
+    of the referenced step, and the step waits for the referenced step to finish.
+    create_object returns the created object (id, name, type, ...), create_objects returns the created objects
+    keyed by their index in the list ("$boxes.0.id").
+    Steps that do not depend on each other run at the same time. If a step fails, the steps depending on it are skipped.
+
+    Returns:
+    A dictionary with the results keyed by step id, and the errors and skipped steps if any.
+
+    Example:
+    steps = [
+        {"id": "box", "tool": "create_object", "params": {"type": "BOX", "name": "Box 1", "params": {"width": 1, "length": 1, "height": 1}}},
+        {"id": "move", "tool": "modify_object", "params": {"id": "$box.id", "translation": [5, 0, 0]}},
+        {"id": "info", "tool": "get_object_info", "params": {"id": "$box.id"}, "depends_on": ["move"]}
+    ]
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        return rhino.with_flush_errors(await run_steps(rhino, steps))
+    except Exception as e:
+        logger.error(f"Error running pipeline: {str(e)}")
+        return {
+            "error": str(e)
+        }
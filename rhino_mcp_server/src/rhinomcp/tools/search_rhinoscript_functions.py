@@ -0,0 +1,37 @@
+from mcp.server.fastmcp import Context
+from rhinomcp import get_rhino_connection, mcp, logger
+from rhinomcp.reference import get_store
+from rhinomcp.reference.search import SEARCH_SECTION, search
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+def search_rhinoscript_functions(ctx: Context, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Search the RhinoScriptsyntax functions by what they do.
+    Use this to find the functions for a task without knowing their category or name.
+
+    Parameters:
+    - query: Words describing what you want to do, e.g. "loft curves into surface" or "object color".
+    - top_k: The maximum number of functions to return, default 10.
+
+    Returns:
+    - A list of the best matching functions, best first, with their name, category, signature and description.
+      Use get_rhinoscript_python_code_guides to get the full details of the functions you want to use.
+    """
+    try:
+        store = get_store()
+        results: List[Dict[str, Any]] = []
+        for index, score in search(store.json_section(SEARCH_SECTION), query, top_k):
+            record = store.record(index)
+            results.append({
+                "name": record["Name"],
+                "category": record["ModuleName"],
+                "signature": record["Signature"],
+                "description": record["Description"],
+                "score": round(score, 3),
+            })
+        return results
+    except Exception as e:
+        logger.error(f"Error searching functions: {str(e)}")
+        return []
@@ -49,7 +49,7 @@ async def select_objects(
 
         result = await rhino.send_command("select_objects", command_params)
           
-        return f"Selected {result['count']} objects"
+        return rhino.with_flush_errors(f"Selected {result['count']} objects")
     except Exception as e:
         logger.error(f"Error selecting objects: {str(e)}")
         return f"Error selecting objects: {str(e)}"
@@ -0,0 +1,40 @@
+from mcp.server.fastmcp import Context
+import json
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.analysis.redraw import plan_redraw
+from typing import Any, List, Dict
+
+
+@mcp.tool()
+async def submit_rhinoscript_job(ctx: Context, code: str) -> Dict[str, Any]:
+    """
+    Start RhinoScript code in Rhino as a background job and return its job id right away.
+    Use this instead of execute_rhinoscript_python_code for heavy scripts (lofts, booleans over many objects, ...)
+    that can take longer than 15 seconds.
+
+    Parameters:
+    - code: The RhinoScript code to execute, the same as for execute_rhinoscript_python_code
+
+    Inside the script, `report_progress(fraction, message)` can be called to report progress,
+    for example report_progress(0.5, "lofted 50 of 100 sections"). The job can only be cancelled
+    while the script prints or reports progress.
+
+    Use get_job_status to follow the job, get_job_result to get the result and cancel_job to stop it.
+
+    Returns:
+    A dictionary with the job id and status.
+    """
+    try:
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+        # Loops of redrawing calls are run with redraws turned off, like in execute_rhinoscript_python_code
+        redraw = plan_redraw(code)
+        job = rhino.jobs.submit(
+            rhino,
+            "execute_rhinoscript_python_code",
+            {"code": code, "suppress_redraw": redraw["suppressed"]}
+        )
+        return rhino.with_flush_errors(job.describe())
+    except Exception as e:
+        logger.error(f"Error submitting job: {str(e)}")
+        return {"success": False, "message": str(e)}
@@ -0,0 +1,91 @@
+from mcp.server.fastmcp import Context
+import json
+import uuid
+import asyncio
+from rhinomcp.server import get_rhino_connection, mcp, logger
+from rhinomcp.sweep import expand_param_sets, result_table
+from rhinomcp.analysis.validate import validate_code
+from typing import Any, List, Dict, Optional
+
+
+async def _report_progress(ctx: Context, progress: float):
+    try:
+        await ctx.report_progress(progress, 1.0)
+    except Exception as e:
+        logger.warning(f"Could not report sweep progress: {str(e)}")
+
+
+@mcp.tool()
+async def sweep_script(
+    ctx: Context,
+    code: str,
+    grid: Optional[Dict[str, List[Any]]] = None,
+    param_sets: Optional[List[Dict[str, Any]]] = None,
+    result_variable: str = "result",
+    keep_objects: bool = False,
+    force: bool = False,
+    timeout: float = 300.0
+) -> Dict[str, Any]:
+    """
+    Run the same RhinoScript code once for each of many parameter sets in one go, and collect a value from each run.
+    Use this for design studies instead of calling execute_rhinoscript_python_code for every combination.
+
+    Parameters:
+    - code: The RhinoScript code, the parameters of a set are defined as global variables.
+      The code has to assign the value to collect (an area, a volume, a list of values...) to the result variable.
+    - grid: Values of each parameter, every combination is run, e.g. {"width": [1, 2, 3], "twist": [0, 45, 90]}
+    - param_sets: A list of parameter sets to run, e.g. [{"width": 1, "twist": 0}, {"width": 2, "twist": 45}].
+      Given together with grid, every set is run with every grid combination.
+    - result_variable: Name of the variable holding the value to collect, default "result"
+    - keep_objects: Keep the objects the runs create, default False. By default the changes of each run are undone
+      after its result is read, so every run starts from the same document.
+    - force: Run the code even if the validation of its rhinoscriptsyntax calls found problems, default False
+    - timeout: Seconds to wait for the whole sweep, default 300
+
+    Returns:
+    A table with a column for each parameter and one for the result, a row per set in the order they were run,
+    and the errors of the sets that failed (their result is null).
+
+    Example:
+    code = "import rhinoscriptsyntax as rs\\nbox = rs.AddBox(...width...)\\nresult = rs.SurfaceVolume(box)[0]"
+    grid = {"width": [1, 2, 3]}
+    -> {"columns": ["width", "result"], "rows": [[1, 1.0], [2, 4.0], [3, 9.0]], "errors": []}
+    """
+    try:
+        sets = expand_param_sets(grid, param_sets)
+        diagnostics = validate_code(code)
+        errors = [d for d in diagnostics if d["severity"] == "error"]
+        if errors and not force:
+            return {
+                "success": False,
+                "message": f"Sweep not sent, {len(errors)} problem(s) found. Fix them or call again with force=True.",
+                "diagnostics": diagnostics,
+            }
+
+        # Get the global connection
+        rhino = get_rhino_connection(ctx)
+
+        request_id = str(uuid.uuid4())
+
+        def on_message(message: Dict[str, Any]):
+            # Rhino reports progress after every set
+            if message.get("progress") is not None:
+                asyncio.create_task(_report_progress(ctx, message["progress"]))
+
+        rhino.message_listeners[request_id] = on_message
+        try:
+            result = await rhino.send_command(
+                "sweep_script",
+                {"code": code, "param_sets": sets, "result_variable": result_variable, "keep_objects": keep_objects},
+                timeout=timeout,
+                request_id=request_id
+            )
+        finally:
+            rhino.message_listeners.pop(request_id, None)
+
+        table = result_table(sets, result.get("results", []), result_variable)
+        table["errors"] = result.get("errors", [])
+        return rhino.with_flush_errors(table)
+    except Exception as e:
+        logger.error(f"Error sweeping script: {str(e)}")
+        return {"success": False, "message": str(e)}
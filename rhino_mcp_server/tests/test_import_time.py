@@ -0,0 +1,41 @@
+"""Starting the server must stay fast, MCP clients spawn it for every session."""
+import os
+import pathlib
+import subprocess
+import sys
+
+SRC = pathlib.Path(__file__).parent.parent / "src"
+
+# Microseconds the modules of the package may take to import themselves, without mcp and the standard library
+IMPORT_BUDGET_US = 300_000
+
+CHECK_REFERENCE = """
+import sys
+import rhinomcp
+import rhinomcp.reference as reference
+print(reference.get_store.cache_info().currsize, reference.reference_version.cache_info().currsize)
+print(" ".join(name for name in sys.modules if name.startswith("rhinomcp.static")))
+"""
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_stays_within_budget():
+    # Lines of -X importtime look like "import time:  self [us] | cumulative | name", nested names are indented
+    own_time = 0
+    for line in _run("-X", "importtime", "-c", "import rhinomcp").stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        if name.strip().split(".")[0] == "rhinomcp" and self_time.strip().isdigit():
+            own_time += int(self_time)
+    assert 0 < own_time < IMPORT_BUDGET_US, f"importing rhinomcp took {own_time} us of its own"
+
+
+def test_import_does_not_load_the_reference():
+    store_opened, static_modules = _run("-c", CHECK_REFERENCE).stdout.split("\n")[-3:-1]
+    assert store_opened == "0 0", "the reference store was opened while importing rhinomcp"
+    assert not static_modules.strip(), f"importing rhinomcp imported {static_modules}"
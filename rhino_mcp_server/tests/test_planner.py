@@ -0,0 +1,79 @@
+"""Folding and merging of queued edits by plan_operations."""
+from rhinomcp.planner import plan_operations
+
+
+def create(name, **params):
+    return {"type": "create_object", "params": {"type": "POINT", "name": name, **params}}
+
+
+def modify(name, **params):
+    return {"type": "modify_object", "params": {"name": name, **params}}
+
+
+def delete(name=None, **params):
+    return {"type": "delete_object", "params": {"name": name, **params} if name else params}
+
+
+def test_modifies_fold_into_the_create():
+    planned = plan_operations([
+        create("A", translation=[1, 0, 0]),
+        modify("A", new_color=[255, 0, 0]),
+        modify("A", translation=[0, 2, 0]),
+        modify("A", new_name="B"),
+    ])
+    assert planned == [create("B", translation=[1, 2, 0], color=[255, 0, 0])]
+
+
+def test_create_then_delete_is_dropped():
+    assert plan_operations([create("A"), modify("A", new_color=[0, 0, 0]), delete("A")]) == []
+
+
+def test_unfoldable_modify_is_sent_after_the_create():
+    rotate = modify("A", rotation=[0, 0, 1.5])
+    planned = plan_operations([create("A"), rotate, modify("A", new_color=[1, 2, 3])])
+    # The later modify cannot move in front of the rotation
+    assert planned == [create("A"), rotate, modify("A", new_color=[1, 2, 3])]
+
+
+def test_delete_after_an_unfoldable_modify_drops_both():
+    assert plan_operations([create("A"), modify("A", rotation=[0, 0, 1.5]), delete("A")]) == []
+
+
+def test_unfoldable_rename_releases_the_old_name():
+    rename = modify("A", new_name="B", rotation=[0, 0, 1.5])
+    planned = plan_operations([create("A"), rename, delete("A")])
+    # Object B exists, the delete addresses some other object named A
+    assert planned == [create("A"), rename, delete("A")]
+
+
+def test_rename_onto_a_pending_name_is_not_folded():
+    rename = modify("A", new_name="B")
+    planned = plan_operations([create("A"), create("B"), rename])
+    assert planned == [{"type": "create_objects", "params": {"objects": [create("A")["params"], create("B")["params"]]}}, rename]
+
+
+def test_everything_before_delete_all_is_dropped():
+    planned = plan_operations([create("A"), modify("B", new_color=[0, 0, 0]), delete(all=True), create("C")])
+    assert planned == [delete(all=True), create("C")]
+
+
+def test_creates_merge_across_unrelated_edits():
+    move = modify("X", translation=[1, 0, 0])
+    planned = plan_operations([create("A"), move, create("B")])
+    assert planned == [
+        {"type": "create_objects", "params": {"objects": [create("A")["params"], create("B")["params"]]}},
+        move,
+    ]
+
+
+def test_create_does_not_move_before_an_edit_of_its_name():
+    move = modify("B", translation=[1, 0, 0])
+    planned = plan_operations([create("A"), move, create("B")])
+    assert planned == [create("A"), move, create("B")]
+
+
+def test_modifies_by_id_are_batched():
+    first = {"type": "modify_object", "params": {"id": "1", "new_color": [0, 0, 0]}}
+    second = {"type": "modify_object", "params": {"id": "2", "translation": [1, 0, 0]}}
+    planned = plan_operations([first, second])
+    assert planned == [{"type": "modify_objects", "params": {"objects": [first["params"], second["params"]]}}]
@@ -0,0 +1,47 @@
+"""Diffing of scenes by plan_scene."""
+from rhinomcp.scene import plan_scene, _scene_attributes
+
+BOX = {"type": "BOX", "name": "column", "params": {"width": 1, "length": 1, "height": 5}}
+
+
+def applied(spec, object_id="1"):
+    """The object a previous apply_scene left for a specification"""
+    return {"id": object_id, "name": spec["name"], "attributes": _scene_attributes(spec, "default")}
+
+
+def test_unchanged_object_is_left_alone():
+    plan = plan_scene([BOX], [applied(BOX)], "default")
+    assert plan["unchanged"] == 1 and not plan["creates"] and not plan["modifies"] and not plan["deletes"]
+
+
+def test_uncolored_object_is_moved_in_place():
+    moved = {**BOX, "translation": [2, 0, 1]}
+    plan = plan_scene([moved], [applied(BOX)], "default")
+    assert not plan["creates"] and not plan["deletes"]
+    assert plan["modifies"] == [{"id": "1", "attributes": _scene_attributes(moved, "default"), "translation": [2, 0, 1]}]
+
+
+def test_color_is_only_sent_when_it_changes():
+    red = {**BOX, "color": [255, 0, 0]}
+    moved = {**red, "translation": [1, 0, 0]}
+    assert "new_color" not in plan_scene([moved], [applied(red)], "default")["modifies"][0]
+    blue = {**red, "color": [0, 0, 255]}
+    assert plan_scene([blue], [applied(red)], "default")["modifies"][0]["new_color"] == [0, 0, 255]
+
+
+def test_removed_color_recreates_the_object():
+    plan = plan_scene([BOX], [applied({**BOX, "color": [255, 0, 0]})], "default")
+    assert plan["recreated"] == 1 and plan["deletes"] == ["1"] and not plan["modifies"]
+
+
+def test_other_shape_recreates_the_object():
+    taller = {**BOX, "params": {**BOX["params"], "height": 6}}
+    plan = plan_scene([taller], [applied(BOX)], "default")
+    assert plan["recreated"] == 1 and plan["deletes"] == ["1"] and len(plan["creates"]) == 1
+
+
+def test_objects_left_out_are_deleted_and_new_ones_created():
+    other = {**BOX, "name": "beam"}
+    plan = plan_scene([other], [applied(BOX)], "default")
+    assert plan["deletes"] == ["1"] and [create["name"] for create in plan["creates"]] == ["beam"]
+    assert plan["recreated"] == 0
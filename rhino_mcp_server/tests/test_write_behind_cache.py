@@ -0,0 +1,81 @@
+"""Results of read-only scripts must include the edits still waiting in the write-behind queue."""
+import asyncio
+
+import rhinomcp.server as server
+from rhinomcp.server import READ_ONLY_COMMANDS, RhinoConnection
+from rhinomcp.tools.execute_rhinoscript_python_code import execute_rhinoscript_python_code
+
+READ_SCRIPT = "import rhinoscriptsyntax as rs\nprint(len(rs.AllObjects()))"
+
+
+def _connection(sent):
+    """A connection that records the commands sent to Rhino instead of sending them"""
+    rhino = RhinoConnection(host="127.0.0.1", port=1999, write_behind=True)
+
+    async def send(command_type, params={}, timeout=15.0, request_id=None, mutates=None):
+        if command_type not in READ_ONLY_COMMANDS if mutates is None else mutates:
+            rhino.document_version += 1
+        sent.append(command_type)
+        return {"success": True, "result": "Script successfully executed!"}
+
+    rhino._send_command = send
+    return rhino
+
+
+def test_queued_edit_is_flushed_before_a_cached_read(monkeypatch):
+    sent = []
+    monkeypatch.setattr(server, "_global_rhino_connection", _connection(sent))
+
+    async def run():
+        first = await execute_rhinoscript_python_code(None, READ_SCRIPT)
+        again = await execute_rhinoscript_python_code(None, READ_SCRIPT)
+        server._global_rhino_connection.queue_command("create_object", {"type": "POINT", "name": "A"})
+        after_edit = await execute_rhinoscript_python_code(None, READ_SCRIPT)
+        return first, again, after_edit
+
+    first, again, after_edit = asyncio.run(run())
+    assert "cached" not in first
+    assert again["cached"] is True
+    assert "cached" not in after_edit
+    assert sent == ["execute_rhinoscript_python_code", "create_object", "execute_rhinoscript_python_code"]
+
+
+def test_queueing_an_edit_makes_cached_reads_stale():
+    rhino = RhinoConnection(host="127.0.0.1", port=1999, write_behind=True)
+
+    async def queue():
+        version = rhino.document_version
+        rhino.queue_command("delete_object", {"name": "A"})
+        rhino._flush_timer.cancel()
+        return version
+
+    version = asyncio.run(queue())
+    assert rhino.document_version > version
+
+
+def test_failed_queued_edit_is_reported_by_the_next_tool(monkeypatch):
+    from rhinomcp.tools.select_objects import select_objects
+
+    rhino = _connection([])
+    sent = rhino._send_command
+
+    async def send(command_type, params={}, *args, **kwargs):
+        if command_type == "create_object":
+            raise RuntimeError("invalid params")
+        if command_type == "select_objects":
+            return {"count": 0}
+        return await sent(command_type, params, *args, **kwargs)
+
+    rhino._send_command = send
+    monkeypatch.setattr(server, "_global_rhino_connection", rhino)
+
+    async def run():
+        rhino.queue_command("create_object", {"type": "POINT", "name": "A"})
+        selected = await select_objects(None, {"name": ["B"]})
+        again = await select_objects(None, {"name": ["B"]})
+        return selected, again
+
+    selected, again = asyncio.run(run())
+    assert selected == "Selected 0 objects\nQueued edits that failed: create_object: invalid params"
+    # Every failure is reported once
+    assert again == "Selected 0 objects"